@@ -0,0 +1,96 @@
+"""README作者提取基准测试：逐模式 re.findall 与预编译合并模式单次扫描对比
+
+用法:
+    python -m benchmarks.bench_readme_authors [--size-kb 150] [--repeat 50]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from src.authors import readme_authors
+
+WORDS = (
+    "alignment reads genome assembly variant calling pipeline reference index "
+    "sequencing coverage quality filter sample output input format annotation "
+    "the of and to with for by from a is are this tool can be used"
+).split()
+
+MENTIONS = (
+    "Authors: Jane Doe <jane.doe@example.org>",
+    "Maintainer: John Smith (john@example.org)",
+    "Developed by the Genome Lab team",
+    "Contributors: **Alice Zhang**",
+    "Created by [Bob Lee](https://example.org/bob)",
+)
+
+
+def generate_readme(size: int, seed: int = 0) -> str:
+    """生成指定字节数的README，正文中穿插作者声明"""
+    rng = random.Random(seed)
+    lines = ["# tool", ""]
+    length = 0
+    while length < size:
+        if rng.random() < 0.02:
+            line = rng.choice(MENTIONS)
+        else:
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16)))
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def extract_with_findall(readme: str) -> list:
+    """原实现：五个带内联(?i)的模式分别 re.findall，每个匹配再做三次正则处理"""
+    patterns = [
+        r"(?i)author[s]?[:\-\s]*([^\n]+)",
+        r"(?i)contributor[s]?[:\-\s]*([^\n]+)",
+        r"(?i)developed?\s+by[:\-\s]*([^\n]+)",
+        r"(?i)created?\s+by[:\-\s]*([^\n]+)",
+        r"(?i)maintainer[s]?[:\-\s]*([^\n]+)",
+    ]
+    authors = []
+    for pattern in patterns:
+        for match in re.findall(pattern, readme):
+            text = match.strip()
+            if not text or len(text) >= 100:
+                continue
+            cleaned = re.sub(r"[*\[\](){}]", "", text).strip()
+            email = re.search(
+                r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", cleaned
+            )
+            name = re.sub(
+                r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "", cleaned
+            ).strip()
+            name = re.sub(r"[<>]", "", name).strip()
+            if len(name) > 1:
+                authors.append((name, email.group(1) if email else None))
+    return authors
+
+
+def timed(label: str, func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<24} {elapsed * 1000:8.2f}ms/次  ({len(result)} 条)")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    readme = generate_readme(args.size_kb * 1024)
+    print(f"📄 README {len(readme) / 1024:.0f} KB，重复 {args.repeat} 次")
+
+    baseline = timed("re.findall ×5", lambda: extract_with_findall(readme), args.repeat)
+    combined = timed("合并模式单次扫描", lambda: readme_authors(readme), args.repeat)
+    print(f"📊 加速比 {baseline / combined:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
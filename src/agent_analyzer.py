@@ -26,6 +26,7 @@ from .models import (
     SecurityAnalysis,
 )
 from .agent_definitions import PROJECT_AGENTS, ANALYSIS_TASKS
+from .repo_workspace import get_workspace
 
 
 class AgentAIAnalyzer:
@@ -45,13 +46,20 @@ class AgentAIAnalyzer:
         # 正确访问嵌套配置
         claude_config = getattr(self.config, 'claude_sdk', self.config)
 
+        # 原地分析的本地仓库和共享工作区为只读，代理不得修改文件
+        workspace = get_workspace(repo_path) if repo_path else None
+        read_only = workspace is not None and workspace.read_only
+        allowed_tools = [
+            "Read", "Write", "Edit", "Glob", "Grep",
+            "Bash", "WebSearch", "WebFetch"
+        ]
+        if read_only:
+            allowed_tools = [t for t in allowed_tools if t not in ("Write", "Edit")]
+
         # 基础配置
         options = ClaudeAgentOptions(
             # 允许使用的工具
-            allowed_tools=[
-                "Read", "Write", "Edit", "Glob", "Grep",
-                "Bash", "WebSearch", "WebFetch"
-            ],
+            allowed_tools=allowed_tools,
 
             # 优先使用程序化定义（现在PROJECT_AGENTS已经是AgentDef实例）
             agents=PROJECT_AGENTS if self.fallback_to_programmatic else None,
@@ -61,7 +69,10 @@ class AgentAIAnalyzer:
             max_turns=getattr(claude_config, 'max_turns', 10),
 
             # 权限配置
-            permission_mode=getattr(claude_config, 'permission_mode', 'acceptEdits'),
+            permission_mode=(
+                "default" if read_only
+                else getattr(claude_config, 'permission_mode', 'acceptEdits')
+            ),
 
             # 工作目录设置（如果提供）
             cwd=str(repo_path) if repo_path else None,
@@ -2,32 +2,98 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
+from .citations import extract_publications
 from .config import config_manager
+from .deployment_detector import detect_deployment, merge_deployment
+from .language_stats import LANGUAGE_EXTENSIONS, dominant_language, is_vendored_dir
 from .llm_client import LLMClient
+from .manifests import get_dependency_graph
 from .models import (
     BioToolAnalysis,
     DataRequirements,
     DeploymentInfo,
     FunctionalityInfo,
     PerformanceInfo,
-    Publication,
     TestingInfo,
     UsageInfo,
 )
+from .repo_fs import RepoFS, open_repo_fs
+from .repo_index import PatternClassifier, get_repo_index
+
+# 核心文件模式 - 算法文件 + 部署配置文件
+CORE_CODE_PATTERNS = [
+    # 主程序文件
+    "main.py",
+    "main.cpp",
+    "main.c",
+    "main.java",
+    # 算法核心
+    "*algorithm*",
+    "*core*",
+    "*engine*",
+    "*align*",
+    "*search*",
+    "*index*",
+    "*parse*",
+    # 部署和配置文件
+    "Dockerfile",
+    "docker-compose.yml",
+    "*.dockerfile",
+    "environment.yml",
+    "conda.yml",
+    "requirements.txt",
+    "setup.py",
+    "setup.cfg",
+    "pyproject.toml",
+    "Makefile",
+    "CMakeLists.txt",
+    "test_*.py",
+    "*_test.py",
+    "test*.sh",
+    "*.py",
+    "*.cpp",
+    "*.c",
+    "*.java",
+    "*.R",
+]
+# 按上面的优先级一次性匹配全部模式
+CORE_CODE_CLASSIFIER = PatternClassifier(CORE_CODE_PATTERNS)
+# 代码样本收集时跳过的目录(按目录名整体匹配，不区分大小写，而非路径子串)
+SKIP_SAMPLE_DIRS = {
+    ".git",
+    "__pycache__",
+    "doc",
+    "docs",
+    "documentation",
+    "example",
+    "examples",
+}
+# 提示词中部署信息的字段说明；静态检测已确定的值作为已知信息列出
+DEPLOYMENT_PROMPT_FIELDS = {
+    "installation_methods": ('["conda", "pip", "docker"]', "明确提到的安装方式"),
+    "system_requirements": ('["Linux", "Python 3.8+"]', "系统要求"),
+    "container_support": ('["Docker", "Singularity"]', "容器支持"),
+    "cloud_deployment": ('["AWS", "Google Cloud"]', "云部署选项"),
+    "configuration_files": ('["config.yaml", ".env"]', "配置文件"),
+}
 
 
 class AIAnalyzer:
     """AI分析器"""
 
+    # 稀疏检出时代码样本收集需要的文件，每个模式只取最浅的若干匹配
+    CHECKOUT_PATTERNS = CORE_CODE_PATTERNS
+    CHECKOUT_MAX_MATCHES = 8
+
     def __init__(self, config_override: dict = None):
         # 初始化LLM客户端
         self.llm_client = LLMClient(config_manager)
         print("✅ AI分析器初始化完成")
 
     def analyze_repository_content(
-        self, repo_path: Path, repo_info, authors
+        self, repo_path: Union[Path, RepoFS], repo_info, authors
     ) -> BioToolAnalysis:
         """使用AI分析仓库内容"""
 
@@ -40,7 +106,9 @@ class AIAnalyzer:
 
         if not readme_content:
             print("⚠️ 未找到README文档，使用默认信息")
-            return self._create_default_analysis(repo_info, authors)
+            return self._create_default_analysis(
+                repo_info, authors, extract_publications(repo_path)
+            )
 
         print(f"✅ README内容长度: {len(readme_content)} 字符")
 
@@ -74,7 +142,7 @@ class AIAnalyzer:
 
         return analysis
 
-    def _collect_readme_content(self, repo_path: Path) -> str:
+    def _collect_readme_content(self, repo_path: Union[Path, RepoFS]) -> str:
         """收集README文档内容"""
 
         # README文件的可能命名
@@ -93,120 +161,92 @@ class AIAnalyzer:
             "Readme",
         ]
 
+        repo_fs = open_repo_fs(repo_path)
         for readme_file in readme_files:
-            file_path = repo_path / readme_file
-            if file_path.exists() and file_path.is_file():
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                        print(f"📄 找到README文件: {readme_file}")
-                        # 限制内容长度，避免过长
-                        return content[:150000] if len(content) > 150000 else content
-                except Exception:
-                    try:
-                        with open(file_path, "r", encoding="latin-1") as f:
-                            content = f.read()
-                            print(f"📄 找到README文件: {readme_file} (latin-1编码)")
-                            return (
-                                content[:150000] if len(content) > 150000 else content
-                            )
-                    except Exception:
-                        continue
+            # 不存在或为二进制文件时返回None
+            # 只读取需要的开头部分，避免过长
+            content = repo_fs.read_text(readme_file, limit=150000)
+            if content is None:
+                continue
+            encoding = repo_fs.encoding(readme_file)
+            if encoding in ("utf-8", "utf-8-sig"):
+                print(f"📄 找到README文件: {readme_file}")
+            else:
+                print(f"📄 找到README文件: {readme_file} ({encoding}编码)")
+            return content
 
         print("⚠️ 未找到README文件")
         return ""
 
-    def _collect_core_code_samples(self, repo_path: Path) -> str:
+    def _collect_core_code_samples(self, repo_path: Union[Path, RepoFS]) -> str:
         """收集核心代码样本 - Linus风格：找到算法核心和部署文件"""
         print("🔍 收集核心代码样本...")
 
-        # 核心文件模式 - 算法文件 + 部署配置文件
-        core_patterns = [
-            # 主程序文件
-            "main.py",
-            "main.cpp",
-            "main.c",
-            "main.java",
-            # 算法核心
-            "*algorithm*",
-            "*core*",
-            "*engine*",
-            "*align*",
-            "*search*",
-            "*index*",
-            "*parse*",
-            # 部署和配置文件
-            "Dockerfile",
-            "docker-compose.yml",
-            "*.dockerfile",
-            "environment.yml",
-            "conda.yml",
-            "requirements.txt",
-            "setup.py",
-            "setup.cfg",
-            "pyproject.toml",
-            "Makefile",
-            "CMakeLists.txt",
-            "test_*.py",
-            "*_test.py",
-            "test*.sh",
-            "*.py",
-            "*.cpp",
-            "*.c",
-            "*.java",
-            "*.R",
-        ]
-
         code_samples = []
         file_count = 0
-        max_files = 8  # 增加文件数量以包含更多部署信息
+        max_files = self.CHECKOUT_MAX_MATCHES  # 增加文件数量以包含更多部署信息
         max_content = 1500  # 减少每个文件内容以腾出空间
+        max_size = 50000  # 小于50KB
+
+        # 延迟获取的文件同样可见，其大小为下限值，超出阈值的不会触发下载
+        repo_fs = open_repo_fs(repo_path)
+        index = get_repo_index(repo_fs)
+        # 一次遍历清单完成全部模式的分类，跳过不相关目录和第三方代码，
+        # 但保留test目录（用于分析测试信息）
+        candidates = index.classify(
+            CORE_CODE_CLASSIFIER,
+            lambda name: name.lower() in SKIP_SAMPLE_DIRS or is_vendored_dir(name),
+        )
+        dominant = dominant_language(index)
 
-        for pattern in core_patterns:
+        for entries in candidates.values():
             if file_count >= max_files:
                 break
-
-            # 查找匹配的文件
-            try:
-                for file_path in repo_path.rglob(pattern):
-                    if file_count >= max_files:
-                        break
-
-                    # 跳过不相关目录，但保留test目录（用于分析测试信息）
-                    if any(
-                        skip in str(file_path)
-                        for skip in [".git", "__pycache__", "doc", "example"]
-                    ):
-                        continue
-
-                    if (
-                        file_path.is_file() and file_path.stat().st_size < 50000
-                    ):  # 小于50KB
-                        try:
-                            with open(
-                                file_path, "r", encoding="utf-8", errors="ignore"
-                            ) as f:
-                                content = f.read()[:max_content]
-                                if content.strip():
-                                    relative_path = file_path.relative_to(repo_path)
-                                    code_samples.append(
-                                        f"=== {relative_path} ===\n{content}\n"
-                                    )
-                                    file_count += 1
-                                    print(f"📄 收集代码文件: {relative_path}")
-                        except Exception:
-                            continue
-            except Exception:
-                continue
+            # 同一模式内主要语言(按字节数)的文件优先，其余保持由浅到深
+            entries = sorted(
+                entries, key=lambda f: LANGUAGE_EXTENSIONS.get(f.extension) != dominant
+            )
+            for entry in entries:
+                if file_count >= max_files:
+                    break
+                if entry.size >= max_size:
+                    continue
+                # 只读取样本所需的开头；二进制文件只读取开头用于判定
+                content = repo_fs.read_text(entry.path, limit=max_content)
+                if content is None:
+                    continue
+                if content.strip():
+                    code_samples.append(f"=== {entry.path} ===\n{content}\n")
+                    file_count += 1
+                    print(f"📄 收集代码文件: {entry.path}")
 
         result = "\n".join(code_samples)
         print(f"✅ 收集了 {file_count} 个核心代码文件，总长度: {len(result)} 字符")
         return result
 
     def _build_analysis_prompt(
-        self, readme_content: str, code_content: str = ""
+        self,
+        readme_content: str,
+        code_content: str = "",
+        dependency_summary: str = "",
+        prefilled_deployment: Optional[DeploymentInfo] = None,
     ) -> str:
-        """构建分析用的prompt - Linus风格：消除特殊情况"""
+        """构建分析用的prompt - Linus风格：消除特殊情况
+
+        Args:
+            dependency_summary: 清单文件解析出的依赖摘要，提供时LLM无需再从文本推断依赖
+            prefilled_deployment: 静态检测的部署信息，已检测到的值只要求LLM补充其他值
+        """
+        asked = []
+        for field, (example, comment) in DEPLOYMENT_PROMPT_FIELDS.items():
+            known = getattr(prefilled_deployment, field) if prefilled_deployment else []
+            if known:
+                comment = f"{comment}；已检测到 {', '.join(known)}，只需补充其他值"
+            asked.append((field, example, comment))
+        deployment_fields = "\n".join(
+            f'        "{field}": {example}{"," if i < len(asked) - 1 else ""}  // {comment}'
+            for i, (field, example, comment) in enumerate(asked)
+        )
         # 截取README内容，避免过长
         content_preview = (
             readme_content[:6000] if len(readme_content) > 6000 else readme_content
@@ -229,15 +269,18 @@ README内容：
 核心代码片段：
 {code_preview}"""
 
-        prompt += """
+        if dependency_summary:
+            prompt += f"""
+
+已从清单文件解析的依赖(确定信息，functionality.dependencies 只需补充其中没有、README明确提到的外部工具)：
+{dependency_summary}"""
+
+        prompt += (
+            """
 
 返回JSON格式，仅包含明确提到或可以从代码中分析出的信息：
 
 {
-    "publications": [
-        // 仅当README明确提到论文标题时才包含
-        {"title": "README中的确切标题", "journal": "如果提到期刊名", "year": 年份数字, "doi": "如果有DOI"}
-    ],
     "functionality": {
         "main_purpose": "用一句中文描述此工具的用途",
         "key_features": ["功能特点1", "功能特点2"],  // 仅README明确提到的功能
@@ -256,11 +299,9 @@ README内容：
         "optimization_features": "发现的优化特性"
     },
     "deployment": {
-        "installation_methods": ["conda", "pip", "docker"],  // 明确提到的安装方式
-        "system_requirements": ["Linux", "Python 3.8+"],    // 系统要求
-        "container_support": ["Docker", "Singularity"],      // 容器支持
-        "cloud_deployment": ["AWS", "Google Cloud"],         // 云部署选项
-        "configuration_files": ["config.yaml", ".env"]       // 配置文件
+"""
+            + deployment_fields
+            + """
     },
     "testing": {
         "test_commands": ["python -m pytest", "make test"],  // 测试命令
@@ -287,6 +328,7 @@ README内容：
 6. 对于部署信息，重点查找Docker、conda、pip等关键词
 7. 对于测试信息，查找test、example、demo等相关内容
 8. 返回简洁、实用的中文JSON"""
+        )
 
         return prompt
 
@@ -316,19 +358,6 @@ README内容：
             print("⚠️ 未能获取有效的分析结果，使用最小默认值")
             return self._get_minimal_defaults()
 
-        # 简单直接的解析 - 不要过度处理
-        publications = [
-            Publication(
-                title=pub.get("title", ""),
-                authors=pub.get("authors", []),
-                journal=pub.get("journal"),
-                year=pub.get("year"),
-                doi=pub.get("doi"),
-            )
-            for pub in data.get("publications", [])
-            if pub.get("title")  # 只有title存在才创建
-        ]
-
         # 功能信息 - 简单获取，没有复杂的默认值处理
         func_data = data.get("functionality", {})
         functionality = FunctionalityInfo(
@@ -412,7 +441,8 @@ README内容：
             )
 
         return {
-            "publications": publications,
+            # 文章由引用文件和README确定性提取，不再询问LLM
+            "publications": [],
             "functionality": functionality,
             "usage": usage,
             "performance": performance,
@@ -450,14 +480,16 @@ README内容：
             "usability": None,
         }
 
-    def _create_default_analysis(self, repo_info, authors) -> BioToolAnalysis:
-        """创建默认分析结果"""
+    def _create_default_analysis(
+        self, repo_info, authors, publications=None
+    ) -> BioToolAnalysis:
+        """创建默认分析结果，可附带从引用文件提取的文章"""
         defaults = self._get_minimal_defaults()
 
         return BioToolAnalysis(
             repository=repo_info,
             authors=authors,
-            publications=defaults["publications"],
+            publications=publications or defaults["publications"],
             functionality=defaults["functionality"],
             usage=defaults["usage"],
             deployment=defaults["deployment"],
@@ -466,18 +498,34 @@ README内容：
             analysis_timestamp=datetime.now().isoformat(),
         )
 
-    def _analyze_all_in_one(self, readme_content: str, repo_path: Path) -> dict:
+    def _analyze_all_in_one(
+        self, readme_content: str, repo_path: Union[Path, RepoFS]
+    ) -> dict:
         """一次性分析 - Linus风格：简单高效"""
         # 1. 收集代码样本用于深度分析
         code_content = self._collect_core_code_samples(repo_path)
 
-        # 2. 构建包含代码的prompt
-        prompt = self._build_analysis_prompt(readme_content, code_content)
+        # 2. 构建包含代码和已解析依赖的prompt，静态检测到的部署字段不再询问
+        graph = get_dependency_graph(repo_path)
+        deployment = detect_deployment(repo_path)
+        prompt = self._build_analysis_prompt(
+            readme_content, code_content, graph.summary(), deployment
+        )
 
-        # 3. 调用LLM
+        # 3. 调用LLM并解析结果
         llm_response = self._call_llm_for_analysis(prompt)
-        if not llm_response:
-            return self._get_minimal_defaults()
+        if llm_response:
+            result = self._parse_analysis_result(llm_response)
+        else:
+            result = self._get_minimal_defaults()
+
+        # 4. 清单文件声明的运行时依赖是确定信息，LLM结果只作补充
+        functionality = result["functionality"]
+        functionality.dependencies = list(
+            dict.fromkeys(graph.names(scopes=["runtime"]) + functionality.dependencies)
+        )
+        result["deployment"] = merge_deployment(deployment, result["deployment"])
 
-        # 4. 解析结果
-        return self._parse_analysis_result(llm_response)
+        # 5. 文章从CITATION.cff、BibTeX和README引用章节确定性提取
+        result["publications"] = extract_publications(repo_path)
+        return result
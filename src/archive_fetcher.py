@@ -0,0 +1,145 @@
+"""归档获取 - 流式下载GitHub tarball并边下载边解压，跳过git"""
+
+import os
+import re
+import shutil
+import tarfile
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from .repo_workspace import compile_path_pattern
+
+
+class ArchiveResult:
+    """归档解压结果"""
+
+    def __init__(
+        self,
+        commit_sha: Optional[str],
+        skipped_paths: List[str],
+        skipped_sizes: Optional[Dict[str, int]] = None,
+    ):
+        self.commit_sha = commit_sha
+        # 因路径模式或大小限制未解压的文件
+        self.skipped_paths = skipped_paths
+        # 未解压文件的大小(来自tar成员头)，工作区据此列出真实大小
+        self.skipped_sizes = skipped_sizes or {}
+
+
+class ArchiveFetcher:
+    """通过codeload流式获取仓库归档，传输与解压一次完成"""
+
+    def __init__(
+        self,
+        codeload_url: str = "https://codeload.github.com",
+        raw_url: str = "https://raw.githubusercontent.com",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: int = 60,
+    ):
+        self.codeload_url = codeload_url.rstrip("/")
+        self.raw_url = raw_url.rstrip("/")
+        self.headers = headers or {}
+        self.timeout = timeout
+
+    def fetch(
+        self,
+        owner: str,
+        repo: str,
+        dest: Path,
+        ref: str = "HEAD",
+        include_patterns: Optional[Iterable[str]] = None,
+        max_file_bytes: Optional[int] = None,
+    ) -> ArchiveResult:
+        """下载并解压 ref 对应的归档到 dest
+
+        Args:
+            include_patterns: 路径通配符，为空时解压全部文件；根目录文件始终解压
+            max_file_bytes: 单文件大小上限，超出的文件跳过
+        """
+        url = f"{self.codeload_url}/{owner}/{repo}/tar.gz/{ref}"
+        matchers = [compile_path_pattern(p) for p in include_patterns or []]
+
+        if dest.exists():
+            shutil.rmtree(dest)
+        dest.mkdir(parents=True)
+
+        print(f"📦 流式下载归档: {owner}/{repo}@{ref}")
+        skipped: Dict[str, int] = {}
+        top_dir = None
+        with requests.get(
+            url, headers=self.headers, stream=True, timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            # "r|*" 为流模式：按顺序读取成员，不需要随机访问整个归档
+            with tarfile.open(fileobj=response.raw, mode="r|*") as archive:
+                for member in archive:
+                    parts = PurePosixPath(member.name).parts
+                    if not parts:
+                        continue
+                    # GitHub归档所有文件都位于 <repo>-<sha>/ 之下
+                    top_dir = top_dir or parts[0]
+                    rel_parts = parts[1:]
+                    if not rel_parts or ".." in rel_parts:
+                        continue
+                    rel_path = "/".join(rel_parts)
+
+                    if member.isdir():
+                        (dest / rel_path).mkdir(parents=True, exist_ok=True)
+                        continue
+                    # 链接和特殊文件可能指向解压目录之外，一律跳过
+                    if not member.isfile():
+                        continue
+
+                    if (
+                        max_file_bytes is not None and member.size > max_file_bytes
+                    ) or (
+                        matchers
+                        and "/" in rel_path
+                        and not any(m.match(rel_path) for m in matchers)
+                    ):
+                        skipped[rel_path] = member.size
+                        continue
+
+                    self._extract_member(archive, member, dest / rel_path)
+
+                # git archive在pax全局头中记录提交ID
+                commit_sha = archive.pax_headers.get("comment") or self._sha_from_dir(
+                    top_dir
+                )
+
+        print(f"✅ 归档解压完成，跳过 {len(skipped)} 个文件")
+        return ArchiveResult(commit_sha, list(skipped), skipped)
+
+    def fetch_file(
+        self, owner: str, repo: str, ref: str, rel_path: str, dest: Path
+    ) -> None:
+        """单独下载归档中跳过的文件"""
+        url = f"{self.raw_url}/{owner}/{repo}/{ref}/{rel_path}"
+        target = dest / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with requests.get(
+            url, headers=self.headers, stream=True, timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+            with open(target, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    f.write(chunk)
+
+    def _extract_member(
+        self, archive: tarfile.TarFile, member: tarfile.TarInfo, target: Path
+    ) -> None:
+        """写出单个成员并保留可执行权限"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source = archive.extractfile(member)
+        with open(target, "wb") as f:
+            shutil.copyfileobj(source, f, length=1 << 16)
+        os.chmod(target, 0o755 if member.mode & 0o111 else 0o644)
+
+    def _sha_from_dir(self, top_dir: Optional[str]) -> Optional[str]:
+        """从顶层目录名 <repo>-<sha> 中解析提交ID"""
+        match = re.search(r"-([0-9a-f]{40})$", top_dir or "")
+        return match.group(1) if match else None
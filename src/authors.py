@@ -0,0 +1,112 @@
+"""作者信息提取 - README中的作者声明和打包元数据中的作者表
+
+README只扫描一次：作者、维护者、贡献者的关键词合并为一个预编译的纯文本模式，
+在小写副本上定位候选位置，只在候选位置用完整模式解析，每个匹配带有身份类型。
+"""
+
+import re
+import tomllib
+from typing import Iterator, List, Optional, Tuple
+
+from .models import AuthorInfo
+
+# README中的作者声明：关键词按身份分组，匹配关键词之后直到行尾的文本
+# (冒号、连字符和空白可跨行，以支持"## Authors"标题下的列表)；
+# 关键词后必须是冒号、连字符、空白或换行，authors.py、author_name 之类的文件名和标识符不算
+AUTHOR_MENTION_PATTERN = re.compile(
+    r"\b(?:"
+    r"(?P<author>authors?|(?:developed|created)\s+by)"
+    r"|(?P<maintainer>maintainers?)"
+    r"|(?P<contributor>contributors?)"
+    r")(?=[:\-\s])[:\-\s]*(?P<text>[^\n]+)",
+    re.IGNORECASE,
+)
+AUTHOR_ROLES = ("author", "maintainer", "contributor")
+# 完整模式的分支在每个位置逐一尝试，较慢；纯文本分支可快速扫描，用于定位候选位置
+AUTHOR_KEYWORD_PATTERN = re.compile(r"author|maintainer|contributor|developed|created")
+
+# 过长的匹配通常是正文句子而非作者名单
+MAX_AUTHOR_TEXT = 100
+
+EMAIL_PATTERN = re.compile(r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})")
+# 作者文本中去除的Markdown和括号标记
+AUTHOR_MARKUP = str.maketrans("", "", "*[](){}<>")
+
+
+def iter_author_mentions(text: str) -> Iterator[Tuple[str, str]]:
+    """单次扫描文本，依次产出 (身份, 作者文本)，结果与完整模式的 finditer 相同"""
+    for match in _iter_mention_matches(text):
+        mention = match.group("text").strip()
+        if mention and len(mention) < MAX_AUTHOR_TEXT:
+            role = next(r for r in AUTHOR_ROLES if match.group(r) is not None)
+            yield role, mention
+
+
+def _iter_mention_matches(text: str) -> Iterator[re.Match]:
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # 个别Unicode字符小写后长度改变，候选位置无法对应回原文
+        yield from AUTHOR_MENTION_PATTERN.finditer(text)
+        return
+    pos = 0
+    while True:
+        hit = AUTHOR_KEYWORD_PATTERN.search(lowered, pos)
+        if hit is None:
+            return
+        match = AUTHOR_MENTION_PATTERN.match(text, hit.start())
+        if match is None:
+            # 关键词只是单词的一部分，如 coauthored
+            pos = hit.end()
+            continue
+        yield match
+        pos = match.end()
+
+
+def parse_author_text(text: str, role: Optional[str] = None) -> Optional[AuthorInfo]:
+    """将 "Jane Doe <jane@example.org>" 形式的文本解析为作者信息"""
+    # 按邮箱切分：偶数位为名称片段，奇数位为邮箱
+    parts = EMAIL_PATTERN.split(text.translate(AUTHOR_MARKUP))
+    name = "".join(parts[::2]).strip()
+    if len(name) <= 1:
+        return None
+    return AuthorInfo(name=name, email=parts[1] if len(parts) > 1 else None, role=role)
+
+
+def readme_authors(text: str) -> List[AuthorInfo]:
+    """从README文本提取作者、维护者和贡献者"""
+    authors = []
+    for role, mention in iter_author_mentions(text):
+        author = parse_author_text(mention, role)
+        if author is not None:
+            authors.append(author)
+    return authors
+
+
+def pyproject_authors(content: str) -> List[AuthorInfo]:
+    """解析pyproject.toml的 [project].authors/maintainers 表
+
+    兼容Poetry的 [tool.poetry].authors/maintainers 字符串列表。
+
+    Raises:
+        tomllib.TOMLDecodeError: 文件不是合法的TOML
+    """
+    data = tomllib.loads(content)
+    project = data.get("project", {})
+    poetry = data.get("tool", {}).get("poetry", {})
+    authors = []
+    for key, role in (("authors", "author"), ("maintainers", "maintainer")):
+        for entry in project.get(key, []):
+            if not isinstance(entry, dict):
+                continue
+            # PEP 621 允许只写name或只写email
+            name = (entry.get("name") or entry.get("email") or "").strip()
+            if name:
+                authors.append(
+                    AuthorInfo(name=name, email=entry.get("email"), role=role)
+                )
+        for entry in poetry.get(key, []):
+            if isinstance(entry, str):
+                author = parse_author_text(entry, role)
+                if author is not None:
+                    authors.append(author)
+    return authors
@@ -0,0 +1,478 @@
+"""引用与发表文章提取 - 从引用文件和README全文中确定性地解析论文信息
+
+只收集声明为本工具引用方式的来源，依次为：
+    CITATION.cff                preferred-citation (需PyYAML)
+    citation(s).bib             任意位置的引用文件
+    README                      "Citation"、"How to cite"、"引用"等章节中的
+                                BibTeX代码块和参考文献条目
+README其他位置带DOI、PMID、PMCID的参考文献行标记为低可信度(confidence="low")，
+其中多为工具引用的其他工作；CFF的 references、其他 .bib 文件和 "References" 章节
+都是被引用的文献，不作为本工具的文章。
+
+同一篇文章按DOI、PMID、PMCID或标题合并，先出现的来源优先，后续来源补全缺失的字段。
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .language_stats import is_vendored_dir
+from .models import Publication
+from .repo_fs import RepoFS, open_repo_fs
+from .repo_index import get_repo_index
+
+# 最多返回的文章数
+MAX_PUBLICATIONS = 20
+
+README_NAMES = ("README.md", "README.rst", "README.txt", "README")
+
+# DOI允许括号等字符，末尾的标点和不成对的右括号在 _clean_doi 中去掉
+DOI_PATTERN = re.compile(r"\b(10\.\d{4,9}/[^\s\"'<>\[\]{}]+)")
+PMID_PATTERN = re.compile(
+    r"(?:\bPMID\s*:?\s*|pubmed\.ncbi\.nlm\.nih\.gov/|ncbi\.nlm\.nih\.gov/pubmed/)"
+    r"(\d{4,9})\b",
+    re.IGNORECASE,
+)
+PMCID_PATTERN = re.compile(r"\b(PMC\d{5,9})\b")
+# 数据和软件仓储(Zenodo、figshare)的DOI指向代码或数据而非论文
+NON_ARTICLE_DOI_PREFIXES = ("10.5281/", "10.6084/")
+
+YEAR_IN_PARENS = re.compile(r"\((\d{4})[a-z]?\)")
+YEAR_PATTERN = re.compile(r"\b((?:19|20)\d{2})\b")
+# 句末的点：前面至少两个小写字母或数字，避免在 "Li H." 这类姓名缩写处断开
+SENTENCE_END = re.compile(r"(?<=[a-z0-9)\]?]{2})[.?]\s+")
+QUOTED_TITLE = re.compile(r"[\"“]([^\"”]{10,})[\"”]")
+INITIALS = re.compile(r"^(?:[A-Z]\.?[\s-]?){1,3}$")
+# Vancouver格式的作者列表 "Li H, Durbin R. "，姓后跟不带点的缩写
+_VANCOUVER_NAME = r"[A-Z][\w'’-]+(?:\s[A-Z][\w'’-]+)*\s[A-Z]{1,3}"
+VANCOUVER_AUTHORS = re.compile(
+    rf"^((?:{_VANCOUVER_NAME},\s)*{_VANCOUVER_NAME}(?:,?\set\sal)?)\.\s+"
+)
+
+MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+# reStructuredText 标题的下划线
+RST_UNDERLINE = re.compile(r"^([=\-~^\"'#*+])\1{2,}\s*$")
+CODE_FENCE = re.compile(r"^\s*(?:```|~~~)")
+CITATION_HEADING = re.compile(r"\bcit(?:e|ations?|ing)\b|引用", re.IGNORECASE)
+LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)]|\[\d+\])\s+")
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\(([^)\s]*)\)")
+URL_PATTERN = re.compile(r"(?:https?://|doi:\s*)\S+", re.IGNORECASE)
+
+BIBTEX_ENTRY = re.compile(r"@(\w+)\s*[{(]")
+BIBTEX_FIELD = re.compile(r"\s*,?\s*([\w-]+)\s*=\s*")
+# 不是文献条目的BibTeX块和软件条目
+BIBTEX_SKIPPED_TYPES = {"comment", "string", "preamble", "software", "manual"}
+BIBTEX_BARE_VALUE = re.compile(r"[^,}\s]*")
+LATEX_COMMAND = re.compile(r"\\[a-zA-Z]+\*?|\\.")
+
+
+def _clean_doi(doi: str) -> Optional[str]:
+    doi = re.sub(
+        r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", "", doi.strip(), flags=re.I
+    )
+    doi = doi.rstrip(".,;:")
+    # 去掉Markdown链接等带来的不成对右括号
+    while doi.endswith(")") and doi.count(")") > doi.count("("):
+        doi = doi[:-1].rstrip(".,;:")
+    return doi if DOI_PATTERN.fullmatch(doi) else None
+
+
+def _clean_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip(" .,;:")
+
+
+def _year(value) -> Optional[int]:
+    match = YEAR_PATTERN.search(str(value or ""))
+    return int(match.group(1)) if match else None
+
+
+def _split_authors(text: str) -> List[str]:
+    """拆分作者列表，"Li, H., Durbin, R." 形式的姓与缩写重新配对"""
+    text = re.sub(r"\bet\s+al\.?", "", text, flags=re.IGNORECASE)
+    separator = r";" if ";" in text else r",|\band\b|&"
+    parts = [_clean_text(p) for p in re.split(separator, text)]
+    parts = [p for p in parts if p]
+    authors = []
+    for part in parts:
+        if authors and INITIALS.match(part) and not INITIALS.match(authors[-1]):
+            authors[-1] = f"{authors[-1]}, {part}"
+        else:
+            authors.append(part)
+    return authors[:20]
+
+
+def parse_citation_text(text: str) -> Optional[Publication]:
+    """解析一条参考文献文本，如 "Li H. (2018) Minimap2: ... Bioinformatics, 34:3094."
+
+    标题无法识别时返回None。
+    """
+    doi_match = DOI_PATTERN.search(text)
+    doi = _clean_doi(doi_match.group(1)) if doi_match else None
+    pmid_match = PMID_PATTERN.search(text)
+    pmcid_match = PMCID_PATTERN.search(text)
+
+    plain = MARKDOWN_LINK.sub(r"\1", text)
+    plain = URL_PATTERN.sub("", plain)
+    plain = PMID_PATTERN.sub("", PMCID_PATTERN.sub("", plain))
+    plain = _clean_text(re.sub(r"[*_`>]", "", LIST_ITEM.sub("", plain)))
+
+    authors: List[str] = []
+    journal = None
+    year_match = YEAR_IN_PARENS.search(plain)
+    quoted = QUOTED_TITLE.search(plain)
+    if quoted:
+        # 带引号的标题(APA/IEEE格式)
+        title = quoted.group(1)
+        authors = _split_authors(YEAR_IN_PARENS.sub("", plain[: quoted.start()]))
+        rest = SENTENCE_END.split(plain[quoted.end() :].strip(" .,"))
+        journal = rest[0] if rest and rest[0] else None
+    elif year_match:
+        # 作者 (年份). 标题. 期刊, 卷, 页码
+        authors = _split_authors(plain[: year_match.start()])
+        segments = SENTENCE_END.split(plain[year_match.end() :].strip(" .,"))
+        title = segments[0]
+        journal = segments[1] if len(segments) > 1 else None
+    elif VANCOUVER_AUTHORS.match(plain):
+        # 作者. 标题. 期刊. 年份;卷:页码
+        match = VANCOUVER_AUTHORS.match(plain)
+        authors = _split_authors(match.group(1))
+        segments = SENTENCE_END.split(plain[match.end() :])
+        title = segments[0]
+        journal = segments[1] if len(segments) > 1 else None
+    else:
+        segments = [s for s in SENTENCE_END.split(plain) if s.strip()]
+        if len(segments) >= 3:
+            authors = _split_authors(segments[0])
+            title, journal = segments[1], segments[2]
+        else:
+            title = max(segments, key=len) if segments else ""
+
+    title = _clean_text(title)
+    if journal:
+        # 期刊名后的卷号、页码和年份
+        journal = _clean_text(re.split(r"[,;(]|\s\d", journal, maxsplit=1)[0]) or None
+    if len(title) < 10 or len(title.split()) < 2:
+        return None
+    return Publication(
+        title=title,
+        authors=authors,
+        journal=journal,
+        year=int(year_match.group(1)) if year_match else _year(plain),
+        doi=doi,
+        pmid=pmid_match.group(1) if pmid_match else None,
+        pmcid=pmcid_match.group(1) if pmcid_match else None,
+    )
+
+
+def _latex_to_text(value: str) -> str:
+    """去掉LaTeX命令和花括号，保留文字"""
+    return _clean_text(LATEX_COMMAND.sub("", value).replace("{", "").replace("}", ""))
+
+
+def _read_bibtex_value(content: str, pos: int) -> Tuple[str, int]:
+    """读取从pos开始的字段值：{...}、"..." 或数字/宏名，返回 (值, 结束位置)"""
+    if pos < len(content) and content[pos] in '{"':
+        closing = "}" if content[pos] == "{" else '"'
+        depth = 0
+        for end in range(pos + 1, len(content)):
+            char = content[end]
+            if char == "{":
+                depth += 1
+            elif char == "}" and depth > 0:
+                depth -= 1
+            elif char == closing and depth == 0:
+                return content[pos + 1 : end], end + 1
+        return content[pos + 1 :], len(content)
+    match = BIBTEX_BARE_VALUE.match(content, pos)
+    return match.group(0), match.end()
+
+
+def iter_bibtex_entries(content: str) -> Iterator[Tuple[int, int, str, Dict[str, str]]]:
+    """依次产出 (开始位置, 结束位置, 条目类型, 字段)"""
+    pos = 0
+    while True:
+        match = BIBTEX_ENTRY.search(content, pos)
+        if match is None:
+            return
+        entry_type = match.group(1).lower()
+        if entry_type in ("comment", "string", "preamble"):
+            # 整体跳过括号内的内容，其中可能没有逗号
+            _, end = _read_bibtex_value(content, match.end() - 1)
+            yield match.start(), end, entry_type, {}
+            pos = end
+            continue
+        # 跳过引用键；没有字段的条目在右括号处结束
+        pos = content.find(",", match.end())
+        closing = content.find("}", match.end())
+        if pos < 0 or 0 <= closing < pos:
+            if closing < 0:
+                return
+            yield match.start(), closing + 1, entry_type, {}
+            pos = closing + 1
+            continue
+        fields: Dict[str, str] = {}
+        while True:
+            field = BIBTEX_FIELD.match(content, pos)
+            if field is None:
+                break
+            value, pos = _read_bibtex_value(content, field.end())
+            fields[field.group(1).lower()] = value
+        end = content.find("}", pos)
+        end = len(content) if end < 0 else end + 1
+        yield match.start(), end, entry_type, fields
+        pos = end
+
+
+def parse_bibtex(content: str) -> List[Publication]:
+    """解析BibTeX文本中的文献条目"""
+    publications = []
+    for _, _, entry_type, fields in iter_bibtex_entries(content):
+        title = _latex_to_text(fields.get("title", ""))
+        if entry_type in BIBTEX_SKIPPED_TYPES or not title:
+            continue
+        authors = []
+        for name in re.split(r"\s+and\s+", fields.get("author", "")):
+            name = _latex_to_text(name)
+            if "," in name:
+                # "姓, 名" 转为 "名 姓"
+                last, first = name.split(",", 1)
+                name = f"{first.strip()} {last.strip()}"
+            if name:
+                authors.append(name)
+        journal = fields.get("journal") or fields.get("journaltitle")
+        journal = journal or fields.get("booktitle")
+        publications.append(
+            Publication(
+                title=title,
+                authors=authors,
+                journal=_latex_to_text(journal) if journal else None,
+                year=_year(fields.get("year") or fields.get("date")),
+                doi=_clean_doi(fields.get("doi", "")),
+                pmid=_clean_text(fields.get("pmid", "")) or None,
+                pmcid=_clean_text(fields.get("pmcid", "")) or None,
+            )
+        )
+    return publications
+
+
+def _cff_person(person) -> Optional[str]:
+    if not isinstance(person, dict):
+        return None
+    name = " ".join(
+        str(person[key])
+        for key in ("given-names", "name-particle", "family-names")
+        if person.get(key)
+    )
+    return name or person.get("name")
+
+
+def parse_citation_cff(content: str, source: str = "CITATION.cff") -> List[Publication]:
+    """解析CITATION.cff中的 preferred-citation
+
+    references 列出的是软件引用的其他工作，不属于本工具的文章。
+    """
+    try:
+        import yaml
+    except ImportError:
+        print(f"⚠️ 未安装PyYAML，跳过引用文件: {source}")
+        return []
+
+    data = yaml.safe_load(content) or {}
+    publications = []
+    for entry in [data.get("preferred-citation")]:
+        if not isinstance(entry, dict) or entry.get("type") == "software":
+            continue
+        title = _clean_text(str(entry.get("title") or ""))
+        if not title:
+            continue
+        doi = entry.get("doi") or next(
+            (
+                i.get("value")
+                for i in entry.get("identifiers") or []
+                if isinstance(i, dict) and i.get("type") == "doi"
+            ),
+            None,
+        )
+        journal = entry.get("journal") or entry.get("collection-title")
+        if not journal and isinstance(entry.get("conference"), dict):
+            journal = entry["conference"].get("name")
+        publications.append(
+            Publication(
+                title=title,
+                authors=[
+                    name
+                    for name in map(_cff_person, entry.get("authors") or [])
+                    if name
+                ],
+                journal=journal,
+                year=_year(entry.get("year") or entry.get("date-published")),
+                doi=_clean_doi(str(doi)) if doi else None,
+                pmid=str(entry["pmid"]) if entry.get("pmid") else None,
+                pmcid=entry.get("pmcid"),
+            )
+        )
+    return publications
+
+
+def _citation_sections(text: str) -> List[Tuple[int, int]]:
+    """README中引用方式章节(Citation、How to cite、引用等)的范围 (开始, 结束) 字符位置"""
+    lines = text.splitlines(keepends=True)
+    # (行号, 级别, 标题)；reStructuredText 标题不区分级别
+    headings = []
+    in_fence = False
+    for number, line in enumerate(lines):
+        # 代码块中的 # 注释和 ``` 不是标题
+        if CODE_FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        match = MARKDOWN_HEADING.match(line)
+        if match:
+            headings.append((number, len(match.group(1)), match.group(2)))
+        elif (
+            number > 0
+            and RST_UNDERLINE.match(line)
+            and lines[number - 1].strip()
+            and not RST_UNDERLINE.match(lines[number - 1])
+            and not CODE_FENCE.match(lines[number - 1])
+        ):
+            headings.append((number - 1, 1, lines[number - 1].strip()))
+
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+    sections = []
+    for i, (number, level, title) in enumerate(headings):
+        if not CITATION_HEADING.search(title):
+            continue
+        end_line = len(lines)
+        for next_number, next_level, _ in headings[i + 1 :]:
+            if next_level <= level:
+                end_line = next_number
+                break
+        sections.append((offsets[number + 1], offsets[end_line]))
+    return sections
+
+
+def _citation_blocks(section: str) -> Iterator[str]:
+    """章节中的段落和列表项，每项为一条可能的参考文献"""
+    block: List[str] = []
+    for line in section.splitlines():
+        stripped = line.strip()
+        fence = CODE_FENCE.match(line)
+        if not stripped or fence or LIST_ITEM.match(line):
+            if block:
+                yield " ".join(block)
+            block = [stripped] if stripped and not fence else []
+        elif not MARKDOWN_HEADING.match(line) and not RST_UNDERLINE.match(line):
+            block.append(stripped)
+    if block:
+        yield " ".join(block)
+
+
+def readme_publications(text: str) -> List[Publication]:
+    """从README引用章节提取文章，其他位置带标识符的参考文献行标记为低可信度"""
+    publications = []
+    covered = []
+    for start, end in _citation_sections(text):
+        section = text[start:end]
+        # 章节中的BibTeX代码块，解析后从文本中移除
+        for entry_start, entry_end, _, _ in iter_bibtex_entries(section):
+            publications += parse_bibtex(section[entry_start:entry_end])
+            section = (
+                section[:entry_start]
+                + " " * (entry_end - entry_start)
+                + section[entry_end:]
+            )
+        for block in _citation_blocks(section):
+            if _year(block) or DOI_PATTERN.search(block) or PMID_PATTERN.search(block):
+                publication = parse_citation_text(block)
+                if publication is not None:
+                    publications.append(publication)
+        covered.append((start, end))
+
+    # 章节之外带标识符的参考文献行(跳过徽章和数据仓储DOI)，多为工具引用的其他工作；
+    # 只接受能解析出年份和作者或期刊、且标题不短的行，正文中顺带提到的DOI不算
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        start, offset = offset, offset + len(line)
+        if any(s <= start < e for s, e in covered) or "![" in line:
+            continue
+        doi = DOI_PATTERN.search(line)
+        if doi and doi.group(1).startswith(NON_ARTICLE_DOI_PREFIXES):
+            continue
+        if doi or PMID_PATTERN.search(line) or PMCID_PATTERN.search(line):
+            publication = parse_citation_text(line)
+            if (
+                publication is not None
+                and publication.year
+                and (publication.authors or publication.journal)
+                and len(publication.title.split()) >= 4
+            ):
+                publication.confidence = "low"
+                publications.append(publication)
+    return publications
+
+
+def _merge(publications: List[Publication]) -> List[Publication]:
+    """按DOI、PMID、PMCID或标题合并同一篇文章，先出现的优先并补全缺失字段"""
+    merged: List[Publication] = []
+    keys: Dict[str, Publication] = {}
+    for publication in publications:
+        if publication.doi and publication.doi.startswith(NON_ARTICLE_DOI_PREFIXES):
+            continue
+        identities = [
+            f"doi:{publication.doi.lower()}" if publication.doi else None,
+            f"pmid:{publication.pmid}" if publication.pmid else None,
+            f"pmcid:{publication.pmcid}" if publication.pmcid else None,
+            "title:" + re.sub(r"\W+", " ", publication.title).strip().casefold(),
+        ]
+        identities = [i for i in identities if i]
+        existing = next((keys[i] for i in identities if i in keys), None)
+        if existing is None:
+            existing = publication
+            merged.append(publication)
+        else:
+            for field, value in publication:
+                if not getattr(existing, field) and value:
+                    setattr(existing, field, value)
+        for identity in identities:
+            keys.setdefault(identity, existing)
+    return merged
+
+
+def extract_publications(repo: Union[Path, str, RepoFS]) -> List[Publication]:
+    """从引用文件和README提取本工具的发表文章，低可信度的条目排在后面"""
+    repo_fs = open_repo_fs(repo)
+    index = get_repo_index(repo_fs)
+    publications: List[Publication] = []
+
+    cff = index.find("CITATION.cff")
+    if cff is not None:
+        content = repo_fs.read_text(cff.path)
+        if content:
+            try:
+                publications += parse_citation_cff(content, cff.path)
+            except Exception as e:
+                print(f"⚠️ 引用文件解析失败 {cff.path}: {e}")
+
+    # 其他 .bib 多为论文手稿的参考文献库，不读取
+    for item in index.iter_files(is_vendored_dir):
+        if item.name.lower() in ("citation.bib", "citations.bib"):
+            publications += parse_bibtex(repo_fs.read_text(item.path) or "")
+
+    for name in README_NAMES:
+        readme = index.find(name)
+        if readme is not None:
+            publications += readme_publications(repo_fs.read_text(readme.path) or "")
+            break
+
+    publications = _merge(publications)[:MAX_PUBLICATIONS]
+    if publications:
+        low = sum(1 for p in publications if p.confidence == "low")
+        print(
+            f"📚 从引用文件和README解析到 {len(publications)} 篇文章"
+            + (f"(其中 {low} 篇为低可信度)" if low else "")
+        )
+    return publications
@@ -62,6 +62,79 @@ class AppConfig(BaseModel):
     max_file_size: int = Field(default=10000, description="最大文件大小(字节)")
     max_content_length: int = Field(default=10000, description="最大内容长度(字符)")
 
+    # 仓库获取配置
+    mirror_cache_dir: Optional[str] = Field(
+        default=None, description="裸仓库镜像缓存目录(默认位于tmp_dir/mirrors)"
+    )
+    mirror_cache_max_mb: int = Field(default=10240, description="镜像缓存磁盘配额(MB)")
+    mirror_share_objects: bool = Field(
+        default=True, description="派生仓库(fork)通过alternates共享上游镜像的对象库"
+    )
+    clone_strategy: str = Field(
+        default="auto",
+        description="克隆策略: auto, full, shallow, partial, shallow-partial, archive",
+    )
+    clone_depth: int = Field(default=100, description="浅克隆的提交深度")
+    clone_blob_limit: str = Field(
+        default="1m", description="部分克隆的blob大小阈值，超出的文件按需获取"
+    )
+    auto_full_max_mb: int = Field(
+        default=200, description="自动策略下完整克隆的仓库大小上限(MB)"
+    )
+    auto_partial_max_mb: int = Field(
+        default=1024,
+        description="自动策略下部分克隆的仓库大小上限(MB)，超出则shallow-partial",
+    )
+    repo_hard_limit_mb: int = Field(
+        default=4096, description="仓库大小硬上限(MB)，超出时仅分析元数据和README"
+    )
+    clone_time_budget: int = Field(default=120, description="完整克隆的时间预算(秒)")
+    clone_bandwidth_mb_s: float = Field(
+        default=10.0, description="估算下载耗时使用的带宽(MB/s)"
+    )
+    hydrate_lfs: bool = Field(
+        default=False, description="允许分析器按需获取LFS文件内容(默认只保留指针)"
+    )
+    hydrate_submodules: bool = Field(
+        default=False, description="允许分析器按需检出子模块(默认不递归)"
+    )
+    clone_sparse: bool = Field(
+        default=False, description="按分析器声明的路径进行稀疏检出"
+    )
+    local_ingest_mode: str = Field(
+        default="inplace", description="本地仓库接入方式: inplace, snapshot, copy"
+    )
+    workspace_keep: int = Field(
+        default=20, description="保留的未使用工作区数量，超出后在后台回收"
+    )
+    index_max_files: int = Field(
+        default=200000, description="文件清单的文件数预算，超出后停止遍历"
+    )
+    index_max_mb: int = Field(
+        default=4096, description="文件清单的字节数预算(MB)，超出后停止遍历"
+    )
+    index_workers: int = Field(
+        default=0, description="并行遍历顶层子树的线程数，0按CPU核数自动选择，1为串行"
+    )
+    content_cache_mb: int = Field(
+        default=64, description="各分析器共享的文件内容缓存内存预算(MB)，超出后按LRU淘汰"
+    )
+    index_cache: bool = Field(
+        default=True, description="按Git树ID持久缓存文件清单的目录记录，跨运行复用"
+    )
+    index_cache_dir: Optional[str] = Field(
+        default=None, description="文件清单缓存目录(默认位于tmp_dir/index-cache)"
+    )
+    index_cache_max_entries: int = Field(
+        default=500000, description="文件清单缓存保留的目录记录数，超出后按LRU淘汰"
+    )
+    github_codeload_url: str = Field(
+        default="https://codeload.github.com", description="归档下载服务地址"
+    )
+    github_raw_url: str = Field(
+        default="https://raw.githubusercontent.com", description="单文件下载服务地址"
+    )
+
     class Config:
         env_prefix = ""  # 不使用前缀，直接使用环境变量名
 
@@ -120,6 +193,39 @@ class ConfigManager:
             "output_dir": os.getenv("OUTPUT_DIR", "docs"),
             "max_file_size": int(os.getenv("MAX_FILE_SIZE", "10000")),
             "max_content_length": int(os.getenv("MAX_CONTENT_LENGTH", "10000")),
+            "mirror_cache_dir": os.getenv("MIRROR_CACHE_DIR"),
+            "mirror_cache_max_mb": int(os.getenv("MIRROR_CACHE_MAX_MB", "10240")),
+            "mirror_share_objects": os.getenv("MIRROR_SHARE_OBJECTS", "true").lower()
+            == "true",
+            "clone_strategy": os.getenv("CLONE_STRATEGY", "auto"),
+            "clone_depth": int(os.getenv("CLONE_DEPTH", "100")),
+            "clone_blob_limit": os.getenv("CLONE_BLOB_LIMIT", "1m"),
+            "auto_full_max_mb": int(os.getenv("AUTO_FULL_MAX_MB", "200")),
+            "auto_partial_max_mb": int(os.getenv("AUTO_PARTIAL_MAX_MB", "1024")),
+            "repo_hard_limit_mb": int(os.getenv("REPO_HARD_LIMIT_MB", "4096")),
+            "clone_time_budget": int(os.getenv("CLONE_TIME_BUDGET", "120")),
+            "clone_bandwidth_mb_s": float(os.getenv("CLONE_BANDWIDTH_MB_S", "10")),
+            "hydrate_lfs": os.getenv("HYDRATE_LFS", "false").lower() == "true",
+            "hydrate_submodules": os.getenv("HYDRATE_SUBMODULES", "false").lower()
+            == "true",
+            "clone_sparse": os.getenv("CLONE_SPARSE", "false").lower() == "true",
+            "local_ingest_mode": os.getenv("LOCAL_INGEST_MODE", "inplace"),
+            "workspace_keep": int(os.getenv("WORKSPACE_KEEP", "20")),
+            "index_max_files": int(os.getenv("INDEX_MAX_FILES", "200000")),
+            "index_max_mb": int(os.getenv("INDEX_MAX_MB", "4096")),
+            "index_workers": int(os.getenv("INDEX_WORKERS", "0")),
+            "content_cache_mb": int(os.getenv("CONTENT_CACHE_MB", "64")),
+            "index_cache": os.getenv("INDEX_CACHE", "true").lower() == "true",
+            "index_cache_dir": os.getenv("INDEX_CACHE_DIR"),
+            "index_cache_max_entries": int(
+                os.getenv("INDEX_CACHE_MAX_ENTRIES", "500000")
+            ),
+            "github_codeload_url": os.getenv(
+                "GITHUB_CODELOAD_URL", "https://codeload.github.com"
+            ),
+            "github_raw_url": os.getenv(
+                "GITHUB_RAW_URL", "https://raw.githubusercontent.com"
+            ),
         }
 
         return AppConfig(**config_data)
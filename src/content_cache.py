@@ -0,0 +1,64 @@
+"""文件内容缓存 - 同一次分析中各分析器共享已解码的文本，按内存预算LRU淘汰
+
+README、setup.py、pyproject.toml 等文件会被作者提取、框架检测、入口识别、
+AI分析和安全分析分别读取，缓存后只需读取和解码一次。
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ContentCache:
+    """按字节预算淘汰最久未使用条目的文本缓存，线程安全"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 命中时免去的读取量(按缓存文本的内存大小计)
+        self.saved_bytes = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_bytes += sys.getsizeof(text)
+            return text
+
+    def put(self, key: Hashable, text: str) -> None:
+        """加入缓存；超过总预算的单个文本不缓存"""
+        cost = sys.getsizeof(text)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= sys.getsizeof(previous)
+            self._entries[key] = text
+            self.size += cost
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= sys.getsizeof(evicted)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def summary(self) -> str:
+        """命中统计的单行摘要"""
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (
+            f"命中 {self.hits}/{total} 次 ({rate:.0%})，"
+            f"节省读取约 {self.saved_bytes / 1024:.1f} KB，淘汰 {self.evictions} 项"
+        )
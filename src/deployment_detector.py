@@ -0,0 +1,383 @@
+"""部署信息静态检测 - 调用LLM前从工作流和打包文件确定部署字段
+
+识别的文件：
+    Snakefile / *.smk                     Snakemake 工作流
+    main.nf / *.nf / nextflow.config      Nextflow 工作流
+    *.wdl / *.cwl                         WDL / CWL 工作流
+    Galaxy 工具XML / .shed.yml            Galaxy 工具
+    meta.yaml                             (bio)conda 配方
+    Dockerfile / Containerfile            Docker 镜像
+    Singularity / *.def                   Singularity 定义文件
+    pyproject.toml / setup.py 等          pip / npm / cargo 安装(仅可发布的包)
+    environment.yml                       conda 环境
+
+检测到的容器支持、安装方式、系统要求和配置文件是确定信息，
+提示词中作为已知值提供，LLM只补充README中明确提到的其他值。
+"""
+
+import json
+import re
+import tomllib
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .language_stats import is_vendored_dir
+from .manifests import get_dependency_graph
+from .models import DeploymentInfo
+from .repo_fs import RepoFS, open_repo_fs
+from .repo_index import IndexedFile, get_repo_index
+
+# 静态检测可确定的部署字段，与LLM结果合并
+PREFILLED_FIELDS = (
+    "installation_methods",
+    "system_requirements",
+    "container_support",
+    "configuration_files",
+)
+
+# 每类文件最多检查的数量和每个文件读取的字符数，避免大型仓库中的扫描开销
+MAX_FILES_PER_KIND = 32
+MAX_FILE_CHARS = 200000
+
+# Galaxy工具XML的根元素，只读取开头判断
+GALAXY_TOOL_PATTERN = re.compile(r"<tool\s[^>]*\bid=")
+GALAXY_PROBE_CHARS = 4096
+
+SNAKEMAKE_MIN_VERSION = re.compile(r"min_version\(\s*['\"]([^'\"]+)['\"]")
+SNAKEMAKE_CONFIGFILE = re.compile(r"^\s*configfile\s*:\s*['\"]([^'\"]+)['\"]", re.M)
+SNAKEMAKE_CONDA = re.compile(r"^\s+conda\s*:", re.M)
+SNAKEMAKE_CONTAINER = re.compile(r"^\s*(?:container|singularity)\s*:", re.M)
+
+NEXTFLOW_VERSION = re.compile(r"nextflowVersion\s*=\s*['\"]!?\s*([^'\"]+)['\"]")
+NEXTFLOW_INCLUDE = re.compile(r"includeConfig\s+['\"]([^'\"]+)['\"]")
+NEXTFLOW_ENGINE = re.compile(
+    r"\b(docker|podman|singularity|apptainer|charliecloud|conda)\.enabled\s*=\s*true"
+)
+NEXTFLOW_CONTAINER = re.compile(r"^\s*container\s+['\"]", re.M)
+NEXTFLOW_CONDA = re.compile(r"^\s*conda\s+['\"]", re.M)
+NEXTFLOW_ENGINES = {
+    "docker": "Docker",
+    "podman": "Podman",
+    "singularity": "Singularity",
+    "apptainer": "Apptainer",
+    "charliecloud": "Charliecloud",
+}
+
+WDL_VERSION = re.compile(r"^\s*version\s+([\w.-]+)", re.M)
+WDL_CONTAINER = re.compile(r"^\s*(?:docker|container)\s*:", re.M)
+CWL_VERSION = re.compile(r"cwlVersion\s*:\s*['\"]?([\w.-]+)")
+
+CONDA_RECIPE_PYTHON = re.compile(r"^\s*-\s*python\s*([<>=!~][^\s#'\"]*)?", re.M)
+CONDA_RECIPE_R = re.compile(r"^\s*-\s*r-base\s*([<>=!~][^\s#'\"]*)?", re.M)
+CONDA_RECIPE_SKIP_OSX = re.compile(
+    r"^\s*skip\s*:\s*true\s*#\s*\[.*\bosx\b", re.M | re.I
+)
+
+PYTHON_REQUIRES = re.compile(
+    r"\b(?:requires-python|python_requires)\s*=\s*['\"]([^'\"]+)['\"]"
+)
+
+SINGULARITY_BOOTSTRAP = re.compile(r"^\s*Bootstrap\s*:", re.M | re.I)
+
+COMPOSE_FILES = (
+    "docker-compose.yml",
+    "docker-compose.yaml",
+    "compose.yml",
+    "compose.yaml",
+)
+
+# 包元数据文件 -> 安装方式；只有声明了可发布包的文件才计入
+PACKAGE_INSTALLERS = {
+    "pyproject.toml": "pip",
+    "setup.py": "pip",
+    "setup.cfg": "pip",
+    "package.json": "npm",
+    "Cargo.toml": "cargo",
+}
+
+
+class DeploymentDetector:
+    """按文件名一次遍历仓库文件清单，从识别出的文件中收集部署字段"""
+
+    def __init__(self, repo_fs: RepoFS):
+        self.repo_fs = repo_fs
+        self.index = get_repo_index(repo_fs)
+        # 字段 -> 有序去重的值
+        self.found: Dict[str, Dict[str, None]] = {f: {} for f in PREFILLED_FIELDS}
+
+    def add(self, field: str, *values: str) -> None:
+        for value in values:
+            if value:
+                self.found[field].setdefault(value.strip())
+
+    def read(self, item: IndexedFile) -> str:
+        return self.repo_fs.read_text(item.path, limit=MAX_FILE_CHARS) or ""
+
+    def detect(self) -> DeploymentInfo:
+        kinds: Dict[str, List[IndexedFile]] = {}
+        for item in self.index.iter_files(is_vendored_dir):
+            kind = self._kind(item)
+            if kind is None:
+                continue
+            candidates = kinds.setdefault(kind, [])
+            if len(candidates) >= MAX_FILES_PER_KIND:
+                continue
+            # 先确认是Galaxy工具再计入数量上限，避免测试数据等XML挤占名额
+            if kind == "galaxy" and not self._is_galaxy_tool(item):
+                continue
+            candidates.append(item)
+
+        for kind, items in kinds.items():
+            getattr(self, f"_{kind}")(items)
+        self._packaging()
+
+        return DeploymentInfo(
+            cloud_deployment=[],
+            **{field: list(values) for field, values in self.found.items()},
+        )
+
+    @staticmethod
+    def _kind(item: IndexedFile) -> Optional[str]:
+        """按文件名判断文件类别，无关文件返回None"""
+        name = item.name.lower()
+        extension = item.extension.lower()
+        if name == "snakefile" or extension == ".smk":
+            return "snakemake"
+        if extension == ".nf" or name == "nextflow.config":
+            return "nextflow"
+        if extension == ".wdl":
+            return "wdl"
+        if extension == ".cwl":
+            return "cwl"
+        if (extension == ".xml" and name != "pom.xml") or name == ".shed.yml":
+            return "galaxy"
+        if name == "meta.yaml":
+            return "conda_recipe"
+        if (
+            name in ("dockerfile", "containerfile")
+            or name.startswith("dockerfile.")
+            or extension == ".dockerfile"
+        ):
+            return "dockerfile"
+        if (
+            name == "singularity"
+            or name.startswith("singularity.")
+            or extension == ".def"
+        ):
+            return "singularity"
+        if name in COMPOSE_FILES:
+            return "compose"
+        return None
+
+    def _snakemake(self, items: List[IndexedFile]) -> None:
+        versions = []
+        for item in items:
+            content = self.read(item)
+            versions += SNAKEMAKE_MIN_VERSION.findall(content)
+            self.add("configuration_files", *SNAKEMAKE_CONFIGFILE.findall(content))
+            if SNAKEMAKE_CONDA.search(content):
+                self.add("installation_methods", "conda")
+            # Snakemake 通过 Singularity/Apptainer 运行规则的容器镜像
+            if SNAKEMAKE_CONTAINER.search(content):
+                self.add("container_support", "Singularity")
+        self.add(
+            "system_requirements",
+            f"Snakemake >= {versions[0]}" if versions else "Snakemake",
+        )
+
+    def _nextflow(self, items: List[IndexedFile]) -> None:
+        versions = []
+        engines = []
+        has_container = False
+        for item in items:
+            content = self.read(item)
+            versions += NEXTFLOW_VERSION.findall(content)
+            engines += NEXTFLOW_ENGINE.findall(content)
+            has_container = has_container or bool(NEXTFLOW_CONTAINER.search(content))
+            if item.name == "nextflow.config":
+                self.add("configuration_files", item.path)
+                self.add(
+                    "configuration_files",
+                    *(
+                        _strip_project_dir(path)
+                        for path in NEXTFLOW_INCLUDE.findall(content)
+                    ),
+                )
+            if NEXTFLOW_CONDA.search(content):
+                self.add("installation_methods", "conda")
+
+        if "conda" in engines:
+            self.add("installation_methods", "conda")
+        self.add(
+            "container_support",
+            *(NEXTFLOW_ENGINES[e] for e in engines if e in NEXTFLOW_ENGINES),
+        )
+        # 进程声明了容器镜像但配置中未指定引擎时，镜像按Docker格式使用
+        if has_container and not any(e in NEXTFLOW_ENGINES for e in engines):
+            self.add("container_support", "Docker")
+        self.add(
+            "system_requirements",
+            f"Nextflow {versions[0].strip()}" if versions else "Nextflow",
+        )
+
+    def _wdl(self, items: List[IndexedFile]) -> None:
+        versions = []
+        for item in items:
+            content = self.read(item)
+            versions += WDL_VERSION.findall(content)
+            if WDL_CONTAINER.search(content):
+                self.add("container_support", "Docker")
+        version = f" {versions[0]}" if versions else ""
+        self.add("system_requirements", f"WDL{version} 执行引擎(Cromwell/miniwdl)")
+
+    def _cwl(self, items: List[IndexedFile]) -> None:
+        versions = []
+        for item in items:
+            content = self.read(item)
+            found = CWL_VERSION.findall(content)
+            if not found:
+                continue
+            versions += found
+            if "DockerRequirement" in content:
+                self.add("container_support", "Docker")
+        if versions:
+            self.add("system_requirements", f"CWL {versions[0]} 执行引擎(cwltool/Toil)")
+
+    def _is_galaxy_tool(self, item: IndexedFile) -> bool:
+        """只读取XML开头，判断根元素是否为Galaxy的<tool id=...>"""
+        if item.name == ".shed.yml":
+            return True
+        probe = self.repo_fs.read_text(item.path, limit=GALAXY_PROBE_CHARS) or ""
+        return GALAXY_TOOL_PATTERN.search(probe) is not None
+
+    def _galaxy(self, items: List[IndexedFile]) -> None:
+        for item in items:
+            if item.name == ".shed.yml":
+                self.add("installation_methods", "Galaxy Tool Shed")
+                continue
+            try:
+                root = ET.fromstring(self.read(item))
+            except ET.ParseError:
+                continue
+            if root.tag != "tool":
+                continue
+            self.add("installation_methods", "Galaxy")
+            for container in root.iter("container"):
+                kind = (container.get("type") or "").lower()
+                if kind == "docker":
+                    self.add("container_support", "Docker")
+                elif kind == "singularity":
+                    self.add("container_support", "Singularity")
+
+    def _conda_recipe(self, items: List[IndexedFile]) -> None:
+        for item in items:
+            content = self.read(item)
+            # 配方中含Jinja模板，不按YAML解析
+            if "requirements:" not in content:
+                continue
+            self.add("installation_methods", "conda")
+            for pattern, name in (
+                (CONDA_RECIPE_PYTHON, "Python"),
+                (CONDA_RECIPE_R, "R"),
+            ):
+                match = pattern.search(content)
+                if match:
+                    self.add("system_requirements", f"{name} {match.group(1) or ''}")
+            if CONDA_RECIPE_SKIP_OSX.search(content):
+                self.add("system_requirements", "Linux")
+
+    def _dockerfile(self, items: List[IndexedFile]) -> None:
+        self.add("installation_methods", "docker")
+        self.add("container_support", "Docker")
+
+    def _singularity(self, items: List[IndexedFile]) -> None:
+        for item in items:
+            if SINGULARITY_BOOTSTRAP.search(self.read(item)):
+                self.add("container_support", "Singularity")
+                return
+
+    def _compose(self, items: List[IndexedFile]) -> None:
+        self.add("container_support", "Docker Compose")
+        self.add("configuration_files", *(item.path for item in items))
+
+    def _packaging(self) -> None:
+        """根目录包元数据对应的安装方式和Python版本要求
+
+        只有依赖声明(如仅含 devDependencies 的 package.json、只有工具配置的
+        pyproject.toml)不代表可以通过对应的包管理器安装。
+        """
+        graph = get_dependency_graph(self.repo_fs)
+        for manifest in graph.manifests:
+            if manifest.rsplit("/", 1)[-1].lower() in (
+                "environment.yml",
+                "environment.yaml",
+            ):
+                self.add("installation_methods", "conda")
+        for name, installer in PACKAGE_INSTALLERS.items():
+            item = self.index.find(name)
+            if item is not None and _is_package(name, self.read(item)):
+                self.add("installation_methods", installer)
+        for name in ("pyproject.toml", "setup.py", "setup.cfg"):
+            item = self.index.find(name)
+            if item is None:
+                continue
+            match = PYTHON_REQUIRES.search(self.read(item))
+            if match:
+                self.add("system_requirements", f"Python {match.group(1)}")
+                break
+
+
+def _is_package(name: str, content: str) -> bool:
+    """包元数据文件是否声明了可发布的包"""
+    try:
+        if name == "package.json":
+            data = json.loads(content)
+            return (
+                isinstance(data, dict)
+                and bool(data.get("name"))
+                and data.get("private") is not True
+            )
+        if name == "pyproject.toml":
+            data = tomllib.loads(content)
+            poetry = data.get("tool", {}).get("poetry", {})
+            return "project" in data or bool(poetry.get("name"))
+        if name == "Cargo.toml":
+            return "package" in tomllib.loads(content)
+    except ValueError:
+        # JSONDecodeError 和 TOMLDecodeError 均为 ValueError 子类
+        return False
+    if name == "setup.cfg":
+        return re.search(r"^\[metadata\]", content, re.M) is not None
+    return True
+
+
+def _strip_project_dir(path: str) -> str:
+    """去掉 Nextflow 配置路径中的 ${projectDir}/ 等前缀"""
+    return re.sub(r"^\$\{?(?:projectDir|baseDir)\}?/", "", path)
+
+
+def detect_deployment(repo: Union[Path, str, RepoFS]) -> DeploymentInfo:
+    """静态检测仓库的部署信息，cloud_deployment 需由LLM补充"""
+    return DeploymentDetector(open_repo_fs(repo)).detect()
+
+
+def merge_deployment(
+    detected: DeploymentInfo, analyzed: Optional[DeploymentInfo]
+) -> Optional[DeploymentInfo]:
+    """合并静态检测和LLM分析的部署信息
+
+    静态检测到的值在前，LLM从README中补充的值(如bioconda、云部署)去重后追加。
+    """
+    fields = {}
+    for field in DeploymentInfo.model_fields:
+        values = list(getattr(detected, field))
+        seen = {value.lower() for value in values}
+        for value in getattr(analyzed, field) if analyzed is not None else []:
+            if value.lower() not in seen:
+                seen.add(value.lower())
+                values.append(value)
+        fields[field] = values
+    if not any(fields.values()):
+        return analyzed
+    return DeploymentInfo(**fields)
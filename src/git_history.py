@@ -0,0 +1,204 @@
+"""Git提交历史统计 - 流式读取 git log，单次遍历全部历史得到作者和活跃度
+
+只请求作者名、邮箱和时间三个字段(%aN/%aE 已按 .mailmap 合并同一作者的多个身份)，
+逐行解析而不构造提交对象，历史再长也只占用与作者数和提交数成正比的内存。
+"""
+
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional, Tuple, Union
+
+from .models import AuthorInfo, CommitActivity
+from .repo_cache import ISOLATED_GIT_CONFIG, run_git
+from .repo_fs import GitObjectFS, LocalRepoFS, RepoFS, open_repo_fs
+from .repo_workspace import get_workspace
+
+# 作者名、邮箱、作者时间(Unix秒)，以NUL分隔
+LOG_FORMAT = "%aN%x00%aE%x00%at"
+
+# 统计近期活跃度的时间窗口
+RECENT_DAYS = 365
+
+SECONDS_PER_DAY = 86400
+
+
+class AuthorStats:
+    """单个作者的提交统计"""
+
+    __slots__ = ("name", "email", "commits", "first", "last")
+
+    def __init__(self, name: str, email: str, timestamp: int):
+        self.name = name
+        self.email = email
+        self.commits = 0
+        self.first = timestamp
+        self.last = timestamp
+
+    def add(self, timestamp: int) -> None:
+        self.commits += 1
+        self.first = min(self.first, timestamp)
+        self.last = max(self.last, timestamp)
+
+
+class GitHistory:
+    """一次 git log 遍历的统计结果"""
+
+    def __init__(
+        self, authors: List[AuthorStats], timestamps: List[int], shallow: bool
+    ):
+        # 按提交数从多到少排列
+        self.authors = sorted(authors, key=lambda a: (-a.commits, a.first))
+        # 全部提交的作者时间，升序
+        self.timestamps = sorted(timestamps)
+        self.shallow = shallow
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def read(
+        cls, git_dir: Path, rev: Optional[str] = None, shallow: bool = False
+    ) -> "GitHistory":
+        """流式读取 rev(默认HEAD) 的全部历史
+
+        Raises:
+            RuntimeError: git log 执行失败，如仓库尚无提交
+        """
+        args = ["git", *ISOLATED_GIT_CONFIG]
+        if rev is not None:
+            # 裸仓库默认读取HEAD的 .mailmap，分析指定提交时改用该提交中的版本
+            args += ["-c", f"mailmap.blob={rev}:.mailmap"]
+        args += ["log", f"--format={LOG_FORMAT}", rev or "HEAD", "--"]
+
+        authors: Dict[str, AuthorStats] = {}
+        timestamps: List[int] = []
+        process = subprocess.Popen(
+            args,
+            cwd=str(git_dir),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            errors="replace",
+        )
+        with process:
+            for line in process.stdout:
+                fields = line.rstrip("\n").split("\0")
+                if len(fields) != 3 or not fields[2].isdigit():
+                    continue
+                name, email, timestamp = fields[0], fields[1], int(fields[2])
+                # 与作者去重一致，按名称(不区分大小写)合并
+                key = name.casefold()
+                stats = authors.get(key)
+                if stats is None:
+                    # 日志从新到旧，保留最近使用的邮箱
+                    stats = authors[key] = AuthorStats(name, email, timestamp)
+                stats.add(timestamp)
+                timestamps.append(timestamp)
+            error = process.stderr.read()
+        if process.returncode != 0:
+            raise RuntimeError(f"git log 失败: {error.strip()}")
+        return cls(list(authors.values()), timestamps, shallow)
+
+    def author_infos(self) -> List[AuthorInfo]:
+        """按提交数排列的作者信息，附带提交数和首末提交日期"""
+        return [
+            AuthorInfo(
+                name=author.name,
+                email=author.email if "@" in author.email else None,
+                commit_count=author.commits,
+                first_commit=_date(author.first),
+                last_commit=_date(author.last),
+            )
+            for author in self.authors
+            if author.name
+        ]
+
+    def activity(self, now: Optional[float] = None) -> Optional[CommitActivity]:
+        """汇总提交活跃度，无提交时返回None
+
+        Args:
+            now: 计算近期提交数的参考时间(Unix秒)，默认当前时间
+        """
+        if not self.timestamps:
+            return None
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        first, last = self.timestamps[0], self.timestamps[-1]
+        months = {_date(ts)[:7] for ts in self.timestamps}
+        first_day = datetime.fromtimestamp(first, timezone.utc)
+        last_day = datetime.fromtimestamp(last, timezone.utc)
+        span_months = (
+            (last_day.year - first_day.year) * 12 + last_day.month - first_day.month + 1
+        )
+        intervals = [b - a for a, b in zip(self.timestamps, self.timestamps[1:])]
+        return CommitActivity(
+            total_commits=len(self.timestamps),
+            contributors=len(self.authors),
+            first_commit=_date(first),
+            last_commit=_date(last),
+            active_months=len(months),
+            commits_per_month=round(len(self.timestamps) / span_months, 2),
+            median_days_between_commits=(
+                round(median(intervals) / SECONDS_PER_DAY, 2) if intervals else None
+            ),
+            commits_last_year=sum(
+                1 for ts in self.timestamps if now - ts <= RECENT_DAYS * SECONDS_PER_DAY
+            ),
+            days_since_last_commit=max(0, int((now - last) // SECONDS_PER_DAY)),
+            shallow=self.shallow,
+        )
+
+
+def _date(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).date().isoformat()
+
+
+def git_source(repo_fs: RepoFS) -> Optional[Tuple[Path, Optional[str]]]:
+    """文件系统对应的 (Git目录, 提交)；不含Git历史(归档或本地目录)时返回None"""
+    if isinstance(repo_fs, GitObjectFS):
+        return repo_fs.git_dir, repo_fs.commit
+    if isinstance(repo_fs, LocalRepoFS) and repo_fs.exists(".git"):
+        return repo_fs.root, None
+    return None
+
+
+def get_git_history(repo: Union[Path, str, RepoFS]) -> Optional[GitHistory]:
+    """获取仓库提交历史统计，同一文件系统对象和登记过的工作区只读取一次
+
+    不含Git历史或读取失败时返回None。
+    """
+    repo_fs = open_repo_fs(repo)
+    if repo_fs.git_history is not None:
+        return repo_fs.git_history
+
+    workspace = (
+        get_workspace(repo_fs.root) if isinstance(repo_fs, LocalRepoFS) else None
+    )
+    if workspace is not None and workspace.git_history is not None:
+        repo_fs.git_history = workspace.git_history
+        return repo_fs.git_history
+
+    source = git_source(repo_fs)
+    if source is None:
+        print("ℹ️ 工作区不含Git历史(归档或本地目录)，跳过提交记录统计")
+        return None
+    git_dir, rev = source
+    try:
+        shallow = (
+            run_git(["rev-parse", "--is-shallow-repository"], cwd=git_dir).strip()
+            == "true"
+        )
+        history = GitHistory.read(git_dir, rev, shallow)
+    except (OSError, RuntimeError) as e:
+        print(f"⚠️ 读取Git提交历史失败: {e}")
+        return None
+
+    print(
+        f"📜 读取 {len(history)} 次提交，{len(history.authors)} 位作者"
+        + ("(浅克隆，历史不完整)" if shallow else "")
+    )
+    repo_fs.git_history = history
+    if workspace is not None:
+        workspace.git_history = history
+    return history
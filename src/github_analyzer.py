@@ -1,53 +1,566 @@
 """GitHub仓库分析器"""
 
+import base64
 import os
 import re
+import shutil
+import tomllib
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 import requests
-from git import Repo
 
+from .archive_fetcher import ArchiveFetcher
+from .authors import pyproject_authors, readme_authors
 from .config import config_manager
-from .models import AuthorInfo, ProjectArchitecture, RepositoryInfo, SecurityAnalysis
+from .content_cache import ContentCache
+from .git_history import get_git_history
+from .index_cache import IndexCache
+from .language_stats import compute_language_stats
+from .manifests import get_dependency_graph
+from .models import (
+    AuthorInfo,
+    CommitActivity,
+    LanguageStat,
+    LFSFile,
+    ProjectArchitecture,
+    RepositoryInfo,
+    SecurityAnalysis,
+    Submodule,
+)
+from .repo_cache import MirrorCache, run_git
+from .repo_fs import GitObjectFS, RepoFS, open_repo_fs
+from .repo_index import get_repo_index
+from .repo_workspace import (
+    SPARSE_FILES_ONLY,
+    RepoWorkspace,
+    compile_path_pattern,
+    parent_dir,
+    parse_size,
+    register_workspace,
+    snapshot_directory,
+    sparse_directories,
+)
+from .workspace_store import WorkspaceLease, WorkspaceStore
+
+# 依赖包名(规范化后) -> 框架名称
+PYTHON_FRAMEWORKS = {
+    "django": "Django",
+    "flask": "Flask",
+    "fastapi": "FastAPI",
+    "pyramid": "Pyramid",
+    "tornado": "Tornado",
+    "dash": "Dash",
+    "streamlit": "Streamlit",
+    "numpy": "NumPy",
+    "pandas": "Pandas",
+    "scikit-learn": "Scikit-learn",
+    "tensorflow": "TensorFlow",
+    "torch": "PyTorch",
+    "pytorch": "PyTorch",
+    "keras": "Keras",
+}
+JS_FRAMEWORKS = {
+    "react": "React",
+    "vue": "Vue.js",
+    "@angular/core": "Angular",
+    "express": "Express",
+    "next": "Next.js",
+    "nuxt": "Nuxt.js",
+    "svelte": "Svelte",
+    "ember-source": "Ember.js",
+}
+# Maven groupId前缀 -> 框架名称
+JAVA_FRAMEWORK_GROUPS = {
+    "org.springframework": "Spring",
+    "org.hibernate": "Hibernate",
+    "org.apache.struts": "Struts",
+    "com.typesafe.play": "Play Framework",
+}
+
+# Git LFS指针文件格式，指针文件不超过1024字节
+LFS_POINTER_PATTERN = re.compile(
+    r"version https://git-lfs\.github\.com/spec/v1\noid sha256:([0-9a-f]{64})\n"
+    r"size (\d+)\n"
+)
+LFS_POINTER_MAX_SIZE = 1024
 
 
 class GitHubAnalyzer:
     """GitHub仓库分析器"""
 
+    # 稀疏检出时架构分析需要的文件(根目录文件始终检出)：
+    # 入口脚本、配置目录和测试目录的直接文件
+    CHECKOUT_PATTERNS = [
+        "scripts/*",
+        "config/*",
+        "conf/*",
+        "cfg/*",
+        "test/*",
+        "tests/*",
+        "spec/*",
+        "specs/*",
+    ]
+
     def __init__(self, tmp_dir: str = None):
         self.tmp_dir = Path(tmp_dir or config_manager.config.tmp_dir)
         self.tmp_dir.mkdir(exist_ok=True)
         self.headers = config_manager.get_github_headers()
+        self.archive_fetcher = ArchiveFetcher(
+            codeload_url=config_manager.config.github_codeload_url,
+            raw_url=config_manager.config.github_raw_url,
+            headers={
+                key: value
+                for key, value in self.headers.items()
+                if key in ("Authorization", "User-Agent")
+            },
+        )
+        # 各分析器共享的文件内容缓存，随工作区登记传递给AIAnalyzer和SecurityAnalyzer
+        self.content_cache = ContentCache(
+            config_manager.config.content_cache_mb * 1024 * 1024
+        )
+        # 最近一次 clone_repository 实际使用的获取策略
+        self.acquisition_strategy: Optional[str] = None
+        # 本次分析持有的工作区租约和本地快照，分析结束后释放
+        self._leases: List[WorkspaceLease] = []
+        self._local_copies: List[Path] = []
+
+    # 镜像缓存、工作区存储和索引缓存在首次使用时才创建目录和数据库文件，
+    # 只做URL解析等操作的分析器不会在tmp_dir中留下任何内容
+
+    @cached_property
+    def mirror_cache(self) -> MirrorCache:
+        return MirrorCache(
+            Path(config_manager.config.mirror_cache_dir or self.tmp_dir / "mirrors"),
+            config_manager.config.mirror_cache_max_mb * 1024 * 1024,
+            share_objects=config_manager.config.mirror_share_objects,
+            in_use=self.workspace_store.in_use,
+        )
 
-    def clone_repository(self, repo_url: str) -> Path:
-        """克隆GitHub仓库到临时目录"""
-        repo_name = self._extract_repo_name(repo_url)
-        clone_path = self.tmp_dir / repo_name
+    @cached_property
+    def workspace_store(self) -> WorkspaceStore:
+        return WorkspaceStore(
+            self.tmp_dir / "workspaces",
+            keep_unused=config_manager.config.workspace_keep,
+        )
 
-        # 如果目录已存在，先删除
-        if clone_path.exists():
-            import shutil
+    @cached_property
+    def index_cache(self) -> Optional[IndexCache]:
+        if not config_manager.config.index_cache:
+            return None
+        return IndexCache(
+            Path(config_manager.config.index_cache_dir or self.tmp_dir / "index-cache")
+            / "index.sqlite",
+            config_manager.config.index_cache_max_entries,
+        )
 
-            shutil.rmtree(clone_path)
+    def clone_repository(
+        self, repo_url: str, repo_info: Optional[RepositoryInfo] = None
+    ) -> Path:
+        """获取仓库到按 (owner, repo, commit) 寻址的共享工作区
+
+        Args:
+            repo_info: analyze_repository_info 的结果，用于按仓库大小自动选择获取策略
+        """
+        repo_name = self._extract_repo_name(repo_url)
 
         # 检查是否是本地文件路径
         if repo_url.startswith("file://"):
             local_path = Path(repo_url[7:])  # 移除 "file://" 前缀
-            if local_path.exists():
-                # 复制本地目录到临时目录
-                shutil.copytree(local_path, clone_path)
-                print(f"✅ 成功复制本地仓库到: {clone_path}")
-                return clone_path
-            else:
+            if not local_path.is_dir():
                 raise RuntimeError(f"本地路径不存在: {local_path}")
+            self.acquisition_strategy = "local"
+            # 快照/复制按进程区分，并发分析同一本地仓库时互不覆盖
+            return self._ingest_local(
+                local_path, self.tmp_dir / "local" / f"{repo_name}-{os.getpid()}"
+            )
+
+        try:
+            owner, repo_name = self._parse_github_url(repo_url)
+        except ValueError:
+            owner = "_"
+
+        strategy = self.plan_acquisition(repo_info)
+        self.acquisition_strategy = strategy
+        if strategy == "metadata":
+            return self._fetch_readme_only(owner, repo_name)
+        elif strategy == "archive":
+            try:
+                lease = self._acquire_archive_workspace(
+                    repo_url,
+                    owner,
+                    repo_name,
+                    default_branch=repo_info.default_branch if repo_info else None,
+                )
+            except Exception as e:
+                raise Exception(f"下载仓库归档失败: {e}")
         else:
             try:
-                repo = Repo.clone_from(repo_url, clone_path)
-                return clone_path
+                lease = self._acquire_git_workspace(
+                    repo_url,
+                    owner,
+                    repo_name,
+                    strategy,
+                    network=repo_info.fork_network if repo_info else None,
+                )
             except Exception as e:
                 raise Exception(f"克隆仓库失败: {e}")
 
+        self._leases.append(lease)
+        metadata = lease.metadata
+        hydrator = None
+        if metadata.get("archive_ref"):
+            # 归档工作区没有对象库，跳过的文件从raw服务单独下载
+            def hydrator(rel_path: str) -> None:
+                self.archive_fetcher.fetch_file(
+                    owner, repo_name, metadata["archive_ref"], rel_path, lease.path
+                )
+
+        register_workspace(
+            RepoWorkspace(
+                lease.path,
+                missing_paths=metadata.get("missing_paths", []),
+                missing_size_floor=metadata.get("missing_size_floor", 0),
+                missing_sizes=metadata.get("missing_sizes", {}),
+                sparse=metadata.get("sparse", False),
+                hydrator=hydrator,
+                lock_path=self.workspace_store.lock_path(lease.path),
+                # 工作区跨运行复用，分析过程中的修改会带入后续分析
+                read_only=True,
+                allow_lfs=config_manager.config.hydrate_lfs,
+                allow_submodules=config_manager.config.hydrate_submodules,
+                tracked_only=True,
+                index_cache=self.index_cache,
+                content_cache=self.content_cache,
+            )
+        )
+        return lease.path
+
+    def plan_acquisition(self, repo_info: Optional[RepositoryInfo] = None) -> str:
+        """按仓库大小和时间预算选择获取策略:
+        full, partial, shallow-partial, shallow, archive, metadata
+
+        仅在 CLONE_STRATEGY=auto 时生效，大小来自GitHub API(已打包的全部历史)。
+        超出部分克隆上限的仓库使用 --depth 1 加 blob 过滤，只下载最新提交中的小文件。
+        auto 只在没有git时才选择归档：归档同样要下载最新提交的全部文件内容，
+        且没有提交历史，不比 shallow-partial 更省流量，因此有意不按大小选择归档。
+        """
+        settings = config_manager.config
+        if settings.clone_strategy != "auto":
+            return settings.clone_strategy
+        if shutil.which("git") is None:
+            print("ℹ️ 未安装git，使用归档下载")
+            return "archive"
+        if repo_info is None or repo_info.size_kb is None:
+            return "full"
+
+        size_mb = repo_info.size_kb / 1024
+        # 按带宽估算完整克隆耗时，超出时间预算时不做完整克隆
+        estimated_seconds = size_mb / settings.clone_bandwidth_mb_s
+        if size_mb > settings.repo_hard_limit_mb:
+            strategy = "metadata"
+        elif (
+            size_mb <= settings.auto_full_max_mb
+            and estimated_seconds <= settings.clone_time_budget
+        ):
+            strategy = "full"
+        elif size_mb <= settings.auto_partial_max_mb:
+            strategy = "partial"
+        else:
+            strategy = "shallow-partial"
+        print(
+            f"📏 仓库约 {size_mb:.0f} MB，完整克隆预计 {estimated_seconds:.0f} 秒，"
+            f"获取策略: {strategy}"
+        )
+        return strategy
+
+    def _clone_options(self, strategy: str) -> Tuple[Optional[int], Optional[str]]:
+        """获取策略对应的 (浅克隆深度, blob大小阈值)"""
+        settings = config_manager.config
+        depth = {"shallow": settings.clone_depth, "shallow-partial": 1}.get(strategy)
+        blob_limit = (
+            settings.clone_blob_limit
+            if strategy in ("partial", "shallow-partial")
+            else None
+        )
+        return depth, blob_limit
+
+    def release_workspaces(self) -> None:
+        """释放本次分析持有的工作区租约，并清理本地仓库快照"""
+        if self.content_cache.hits or self.content_cache.misses:
+            print(f"📦 文件内容缓存: {self.content_cache.summary()}")
+        for lease in self._leases:
+            self.workspace_store.release(lease)
+        self._leases.clear()
+        for local_copy in self._local_copies:
+            shutil.rmtree(local_copy, ignore_errors=True)
+        self._local_copies.clear()
+
+    def open_revision(self, repo_url: str, ref: str = "HEAD") -> GitObjectFS:
+        """不检出工作区，直接从镜像对象库读取指定版本，可同时打开多个版本"""
+        mirror = self.mirror_cache.mirror_path(repo_url)
+        depth, blob_limit = self._clone_options(config_manager.config.clone_strategy)
+        with self.mirror_cache.lock(mirror):
+            self.mirror_cache.ensure_mirror(
+                repo_url, depth=depth, blob_limit=blob_limit
+            )
+            repo_fs = GitObjectFS(mirror, ref)
+        repo_fs.index_cache = self.index_cache
+        repo_fs.content_cache = self.content_cache
+        return repo_fs
+
+    def _ingest_local(self, local_path: Path, clone_path: Path) -> Path:
+        """接入本地仓库：默认原地只读分析，可选硬链接/reflink快照"""
+        mode = config_manager.config.local_ingest_mode
+        if mode == "inplace":
+            print(f"✅ 原地只读分析本地仓库: {local_path}")
+            register_workspace(
+                RepoWorkspace(
+                    local_path, read_only=True, content_cache=self.content_cache
+                )
+            )
+            return local_path
+
+        if clone_path.exists():
+            shutil.rmtree(clone_path)
+        clone_path.parent.mkdir(parents=True, exist_ok=True)
+        if mode == "snapshot":
+            method = snapshot_directory(local_path, clone_path)
+            print(f"✅ 已创建本地仓库快照({method}): {clone_path}")
+        else:
+            shutil.copytree(local_path, clone_path, symlinks=True)
+            print(f"✅ 成功复制本地仓库到: {clone_path}")
+        self._local_copies.append(clone_path)
+        register_workspace(
+            RepoWorkspace(
+                clone_path,
+                allow_lfs=config_manager.config.hydrate_lfs,
+                allow_submodules=config_manager.config.hydrate_submodules,
+                content_cache=self.content_cache,
+            )
+        )
+        return clone_path
+
+    def _fetch_readme_only(self, owner: str, repo_name: str) -> Path:
+        """超大仓库降级分析：只下载README，其余信息来自API元数据"""
+        print("⚠️ 仓库超过大小上限，降级为仅元数据 + README 分析")
+        dest = self.tmp_dir / "local" / f"{repo_name}-readme-{os.getpid()}"
+        if dest.exists():
+            shutil.rmtree(dest)
+        dest.mkdir(parents=True)
+        self._local_copies.append(dest)
+
+        api_url = f"https://api.github.com/repos/{owner}/{repo_name}/readme"
+        try:
+            response = requests.get(api_url, headers=self.headers, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                (dest / data["name"]).write_bytes(base64.b64decode(data["content"]))
+                print(f"📄 已下载README: {data['name']}")
+            else:
+                print(f"⚠️ 获取README失败，状态码: {response.status_code}")
+        except Exception as e:
+            print(f"⚠️ 获取README失败: {e}")
+
+        register_workspace(
+            RepoWorkspace(dest, read_only=True, content_cache=self.content_cache)
+        )
+        return dest
+
+    def _acquire_git_workspace(
+        self,
+        repo_url: str,
+        owner: str,
+        repo_name: str,
+        strategy: str = "full",
+        network: Optional[str] = None,
+    ) -> WorkspaceLease:
+        """镜像增量更新后按提交获取工作区，同一提交的并发分析共享检出"""
+        settings = config_manager.config
+        mirror = self.mirror_cache.mirror_path(repo_url)
+
+        depth, blob_limit = self._clone_options(strategy)
+
+        # 镜像锁覆盖fetch和检出，避免其他进程同时更新或淘汰该镜像
+        with self.mirror_cache.lock(mirror):
+            self.mirror_cache.ensure_mirror(
+                repo_url, depth=depth, blob_limit=blob_limit, network=network
+            )
+            commit_sha = self.mirror_cache.resolve(mirror)
+            partial = self.mirror_cache.is_partial(mirror)
+
+            def populate(dest: Path) -> dict:
+                missing_sizes = {}
+                if settings.clone_sparse:
+                    missing_paths, missing_sizes = self._sparse_checkout(
+                        mirror, dest, commit_sha
+                    )
+                elif partial:
+                    missing_paths = self.mirror_cache.partial_checkout(
+                        mirror, dest, commit_sha
+                    )
+                    print(f"📦 部分克隆: {len(missing_paths)} 个大文件将按需获取")
+                else:
+                    self.mirror_cache.checkout(mirror, dest, commit_sha)
+                    missing_paths = []
+                return {
+                    "missing_paths": missing_paths,
+                    "missing_sizes": missing_sizes,
+                    # 只有部分克隆中尚未获取的blob大小未知，至少为blob大小阈值
+                    "missing_size_floor": (
+                        parse_size(settings.clone_blob_limit) if partial else 0
+                    ),
+                    "sparse": settings.clone_sparse,
+                }
+
+            variant = "-".join(
+                name
+                for name, enabled in (
+                    ("partial", partial),
+                    ("sparse", settings.clone_sparse),
+                )
+                if enabled
+            )
+            return self.workspace_store.acquire(
+                owner,
+                repo_name,
+                commit_sha,
+                populate,
+                variant=variant,
+                validate=self.mirror_cache.checkout_valid,
+            )
+
+    def _acquire_archive_workspace(
+        self,
+        repo_url: str,
+        owner: str,
+        repo_name: str,
+        default_branch: Optional[str] = None,
+    ) -> WorkspaceLease:
+        """流式下载默认分支归档，不包含.git目录和提交历史"""
+        settings = config_manager.config
+        # 先解析默认分支的提交，确定工作区地址后再决定是否需要下载
+        commit_sha = self._resolve_remote_commit(
+            repo_url, owner, repo_name, default_branch
+        )
+        include_patterns = None
+        if settings.clone_sparse:
+            include_patterns = [
+                pattern
+                for patterns, _ in self._checkout_specs()
+                for pattern in patterns
+            ]
+
+        def populate(dest: Path) -> dict:
+            result = self.archive_fetcher.fetch(
+                owner,
+                repo_name,
+                dest,
+                ref=commit_sha,
+                include_patterns=include_patterns,
+                max_file_bytes=parse_size(settings.clone_blob_limit),
+            )
+            return {
+                "missing_paths": result.skipped_paths,
+                "missing_sizes": result.skipped_sizes,
+                "archive_ref": result.commit_sha or commit_sha,
+            }
+
+        return self.workspace_store.acquire(
+            owner,
+            repo_name,
+            commit_sha,
+            populate,
+            variant="archive-sparse" if settings.clone_sparse else "archive",
+        )
+
+    def _resolve_remote_commit(
+        self,
+        repo_url: str,
+        owner: str,
+        repo_name: str,
+        branch: Optional[str] = None,
+    ) -> str:
+        """解析远端分支(默认为HEAD)的提交ID，未安装git时改用GitHub API"""
+        if shutil.which("git") is not None:
+            ref = f"refs/heads/{branch}" if branch else "HEAD"
+            return run_git(["ls-remote", repo_url, ref]).split()[0]
+
+        api_url = f"https://api.github.com/repos/{owner}/{repo_name}/commits/"
+        response = requests.get(
+            api_url + (branch or "HEAD"),
+            headers={**self.headers, "Accept": "application/vnd.github.sha"},
+            timeout=10,
+        )
+        response.raise_for_status()
+        return response.text.strip()
+
+    def _checkout_specs(self) -> List[tuple]:
+        """收集各分析器声明的稀疏检出路径模式 (patterns, max_matches)"""
+        from .security_analyzer import SecurityAnalyzer
+
+        specs = [
+            (self.CHECKOUT_PATTERNS, None),
+            (SecurityAnalyzer.CHECKOUT_PATTERNS, None),
+        ]
+        try:
+            from .ai_analyzer import AIAnalyzer
+
+            specs.append(
+                (AIAnalyzer.CHECKOUT_PATTERNS, AIAnalyzer.CHECKOUT_MAX_MATCHES)
+            )
+        except ImportError:
+            # 传统LLM依赖未安装时不会使用该分析器
+            pass
+        return specs
+
+    def _sparse_checkout(
+        self, mirror: Path, clone_path: Path, ref: str = "HEAD"
+    ) -> Tuple[List[str], Dict[str, int]]:
+        """按分析器声明的路径模式进行cone模式稀疏检出
+
+        Returns:
+            (未检出的文件, 其中本地已有blob的文件大小)；部分克隆中尚未获取的blob
+            不查询大小，由工作区的大小下限表示
+        """
+        tree = self.mirror_cache.list_tree(mirror, ref)
+        tree_paths = [rel for _, rel in tree]
+
+        directories = set()
+        for patterns, max_matches in self._checkout_specs():
+            directories |= sparse_directories(tree_paths, patterns, max_matches)
+
+        self.mirror_cache.sparse_checkout(
+            mirror,
+            clone_path,
+            [f"{d}/{SPARSE_FILES_ONLY}" for d in directories],
+            ref,
+        )
+
+        # 补齐前三层目录骨架，目录结构分析与完整检出保持一致
+        for rel_path in tree_paths:
+            parts = rel_path.split("/")[:-1][:3]
+            if parts:
+                (clone_path.joinpath(*parts)).mkdir(parents=True, exist_ok=True)
+
+        missing = [
+            (oid, rel)
+            for oid, rel in tree
+            if "/" in rel and parent_dir(rel) not in directories
+        ]
+        unfetched = (
+            self.mirror_cache.missing_objects(mirror, ref)
+            if self.mirror_cache.is_partial(mirror)
+            else set()
+        )
+        local = [(oid, rel) for oid, rel in missing if oid not in unfetched]
+        sizes = self.mirror_cache.blob_sizes(mirror, [oid for oid, _ in local])
+        print(f"🌿 稀疏检出: {len(directories)} 个目录，{len(missing)} 个文件按需获取")
+        return [rel for _, rel in missing], {
+            rel: size for (_, rel), size in zip(local, sizes)
+        }
+
     def analyze_repository_info(self, repo_url: str) -> RepositoryInfo:
         """分析仓库基础信息"""
         owner, repo_name = self._parse_github_url(repo_url)
@@ -81,6 +594,10 @@ class GitHubAnalyzer:
                         if data.get("license")
                         else None
                     ),
+                    size_kb=data.get("size"),
+                    default_branch=data.get("default_branch"),
+                    # fork的 source 为网络根仓库，非fork仓库自身即为根
+                    fork_network=(data.get("source") or data).get("full_name"),
                 )
             else:
                 print(f"⚠️ GitHub API调用失败，状态码: {response.status_code}")
@@ -92,8 +609,11 @@ class GitHubAnalyzer:
             return RepositoryInfo(name=repo_name, url=repo_url)
             return RepositoryInfo(name=repo_name, url=repo_url)
 
-    def extract_authors_from_repo(self, repo_path: Path) -> List[AuthorInfo]:
+    def extract_authors_from_repo(
+        self, repo_path: Union[Path, RepoFS]
+    ) -> List[AuthorInfo]:
         """从仓库中提取作者信息"""
+        repo_path = open_repo_fs(repo_path)
         authors = []
 
         # 1. 从README文件中提取作者信息
@@ -113,10 +633,17 @@ class GitHubAnalyzer:
 
         return unique_authors
 
-    def analyze_project_architecture(self, repo_path: Path) -> ProjectArchitecture:
-        """分析项目架构"""
-        # 1. 识别主要编程语言
-        programming_languages = self._detect_programming_languages(repo_path)
+    def analyze_project_architecture(
+        self, repo_path: Union[Path, RepoFS]
+    ) -> ProjectArchitecture:
+        """分析项目架构，repo_path可为工作区目录或不检出的Git对象文件系统"""
+        repo_path = open_repo_fs(repo_path)
+
+        # 1. 按字节统计语言占比，识别主要编程语言
+        language_stats = compute_language_stats(repo_path)
+        programming_languages = self._detect_programming_languages(
+            repo_path, language_stats
+        )
 
         # 2. 识别框架和库
         frameworks = self._detect_frameworks(repo_path)
@@ -136,6 +663,10 @@ class GitHubAnalyzer:
         # 7. 识别测试结构
         test_structure = self._analyze_test_structure(repo_path)
 
+        # 8. 记录未获取内容的LFS文件和未检出的子模块
+        lfs_files = self._detect_lfs_files(repo_path)
+        submodules = self._detect_submodules(repo_path)
+
         return ProjectArchitecture(
             programming_languages=programming_languages,
             frameworks=frameworks,
@@ -144,34 +675,25 @@ class GitHubAnalyzer:
             entry_points=entry_points,
             config_files=config_files,
             test_structure=test_structure,
+            lfs_files=lfs_files,
+            submodules=submodules,
+            language_stats=language_stats,
+            dependencies=list(get_dependency_graph(repo_path).dependencies),
         )
 
-    def read_file_content(self, repo_path: Path, filename: str) -> Optional[str]:
-        """读取指定文件内容"""
-        file_patterns = [
-            filename,
-            filename.upper(),
-            filename.lower(),
-            f"{filename}.md",
-            f"{filename.upper()}.md",
-            f"{filename.lower()}.md",
-            f"{filename}.txt",
-            f"{filename.upper()}.txt",
-            f"{filename.lower()}.txt",
-        ]
-
-        for pattern in file_patterns:
-            file_path = repo_path / pattern
-            if file_path.exists() and file_path.is_file():
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        return f.read()
-                except UnicodeDecodeError:
-                    try:
-                        with open(file_path, "r", encoding="latin-1") as f:
-                            return f.read()
-                    except Exception:
-                        continue
+    def read_file_content(
+        self, repo_path: Union[Path, RepoFS], filename: str
+    ) -> Optional[str]:
+        """读取指定文件内容，文件名不区分大小写，可省略 .md/.txt/.rst 扩展名"""
+        repo_fs = open_repo_fs(repo_path)
+        # 按目录建立的casefold文件名表查找，无需逐个探测大小写变体
+        index = get_repo_index(repo_fs)
+        for suffix in ("", ".md", ".txt", ".rst"):
+            item = index.find(filename + suffix)
+            if item is not None:
+                content = repo_fs.read_text(item.path)
+                if content is not None:
+                    return content
 
         return None
 
@@ -194,284 +716,128 @@ class GitHubAnalyzer:
 
         raise ValueError(f"无效的GitHub URL: {repo_url}")
 
-    def _extract_authors_from_readme(self, repo_path: Path) -> List[AuthorInfo]:
+    def _extract_authors_from_readme(self, repo_path: RepoFS) -> List[AuthorInfo]:
         """从README文件中提取作者信息"""
-        authors = []
         readme_content = self.read_file_content(repo_path, "README")
 
         if not readme_content:
-            return authors
-
-        # 查找作者相关的模式
-        author_patterns = [
-            r"(?i)author[s]?[:\-\s]*([^\n]+)",
-            r"(?i)contributor[s]?[:\-\s]*([^\n]+)",
-            r"(?i)developed?\s+by[:\-\s]*([^\n]+)",
-            r"(?i)created?\s+by[:\-\s]*([^\n]+)",
-            r"(?i)maintainer[s]?[:\-\s]*([^\n]+)",
-        ]
-
-        for pattern in author_patterns:
-            matches = re.findall(pattern, readme_content)
-            for match in matches:
-                # 清理和解析作者信息
-                author_text = match.strip()
-                if author_text and len(author_text) < 100:  # 避免提取过长的文本
-                    author_info = self._parse_author_text(author_text)
-                    if author_info:
-                        authors.append(author_info)
+            return []
 
-        return authors
+        # 预编译的合并模式单次扫描，按作者/维护者/贡献者分类
+        return readme_authors(readme_content)
 
-    def _extract_authors_from_setup_files(self, repo_path: Path) -> List[AuthorInfo]:
+    def _extract_authors_from_setup_files(self, repo_path: RepoFS) -> List[AuthorInfo]:
         """从setup文件中提取作者信息"""
         authors = []
+        index = get_repo_index(repo_path)
 
         # 检查setup.py
-        setup_py_path = repo_path / "setup.py"
-        if setup_py_path.exists():
+        if index.exists("setup.py"):
             setup_content = self.read_file_content(repo_path, "setup.py")
             if setup_content:
                 author_matches = re.findall(
                     r'author\s*=\s*["\']([^"\']+)["\']', setup_content
                 )
                 for author in author_matches:
-                    authors.append(AuthorInfo(name=author.strip()))
+                    authors.append(AuthorInfo(name=author.strip(), role="author"))
 
         # 检查pyproject.toml
-        pyproject_path = repo_path / "pyproject.toml"
-        if pyproject_path.exists():
+        if index.exists("pyproject.toml"):
             pyproject_content = self.read_file_content(repo_path, "pyproject.toml")
             if pyproject_content:
-                author_matches = re.findall(
-                    r'name\s*=\s*["\']([^"\']+)["\']', pyproject_content
-                )
-                for author in author_matches:
-                    authors.append(AuthorInfo(name=author.strip()))
-
-        return authors
-
-    def _extract_authors_from_git(self, repo_path: Path) -> List[AuthorInfo]:
-        """从Git提交记录中提取作者信息"""
-        authors = []
-
-        try:
-            repo = Repo(repo_path)
-            commits = list(repo.iter_commits(max_count=100))  # 只检查最近100次提交
-
-            author_set = set()
-            for commit in commits:
-                author_name = commit.author.name
-                author_email = commit.author.email
-
-                if author_name and author_name not in author_set:
-                    author_set.add(author_name)
-                    authors.append(
-                        AuthorInfo(
-                            name=author_name,
-                            email=author_email if "@" in author_email else None,
-                        )
-                    )
-
-        except Exception as e:
-            print(f"⚠️ 从Git记录提取作者信息失败: {e}")
+                # 只取 [project].authors/maintainers，而非文件中所有的 name 键
+                try:
+                    authors.extend(pyproject_authors(pyproject_content))
+                except tomllib.TOMLDecodeError as e:
+                    print(f"⚠️ pyproject.toml 解析失败: {e}")
 
         return authors
 
-    def _parse_author_text(self, text: str) -> Optional[AuthorInfo]:
-        """解析作者文本信息"""
-        # 移除常见的标记符号
-        cleaned_text = re.sub(r"[*\[\](){}]", "", text).strip()
-
-        # 提取邮箱
-        email_match = re.search(
-            r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", cleaned_text
-        )
-        email = email_match.group(1) if email_match else None
-
-        # 移除邮箱后的名称
-        name = re.sub(
-            r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "", cleaned_text
-        ).strip()
-        name = re.sub(r"[<>]", "", name).strip()
+    def _extract_authors_from_git(self, repo_path: RepoFS) -> List[AuthorInfo]:
+        """从Git提交记录中提取作者信息，按提交数排列并附带首末提交日期"""
+        history = get_git_history(repo_path)
+        return history.author_infos() if history is not None else []
 
-        if name and len(name) > 1:
-            return AuthorInfo(name=name, email=email)
-
-        return None
+    def analyze_commit_activity(
+        self, repo_path: Union[Path, RepoFS]
+    ) -> Optional[CommitActivity]:
+        """从本地Git历史统计提交活跃度，不含Git历史时返回None"""
+        history = get_git_history(open_repo_fs(repo_path))
+        return history.activity() if history is not None else None
 
     def _deduplicate_authors(self, authors: List[AuthorInfo]) -> List[AuthorInfo]:
-        """去重作者信息"""
-        seen_names = set()
+        """去重作者信息，重复出现时用后续来源补全缺失的字段(如Git提交统计)"""
+        seen_names: Dict[str, AuthorInfo] = {}
         unique_authors = []
 
         for author in authors:
             # 标准化名称进行比较
             normalized_name = author.name.lower().strip()
-            if normalized_name not in seen_names and len(normalized_name) > 1:
-                seen_names.add(normalized_name)
+            existing = seen_names.get(normalized_name)
+            if existing is not None:
+                for field, value in author:
+                    if getattr(existing, field) is None and value is not None:
+                        setattr(existing, field, value)
+            elif len(normalized_name) > 1:
+                seen_names[normalized_name] = author
                 unique_authors.append(author)
 
         return unique_authors[:10]  # 最多返回10个作者
 
-    def _detect_programming_languages(self, repo_path: Path) -> List[str]:
-        """检测项目使用的编程语言"""
-        languages = set()
-
-        # 通过文件扩展名识别编程语言
-        extension_mapping = {
-            ".py": "Python",
-            ".js": "JavaScript",
-            ".ts": "TypeScript",
-            ".java": "Java",
-            ".cpp": "C++",
-            ".c": "C",
-            ".cs": "C#",
-            ".go": "Go",
-            ".rs": "Rust",
-            ".rb": "Ruby",
-            ".php": "PHP",
-            ".swift": "Swift",
-            ".kt": "Kotlin",
-            ".R": "R",
-            ".r": "R",
-            ".sql": "SQL",
-            ".sh": "Shell",
-            ".pl": "Perl",
-            ".lua": "Lua",
-            ".dart": "Dart",
-            ".scala": "Scala",
-            ".m": "Objective-C",
-            ".mm": "Objective-C++",
-            ".groovy": "Groovy",
-            ".hs": "Haskell",
-            ".clj": "Clojure",
-            ".ex": "Elixir",
-            ".exs": "Elixir",
-            ".erl": "Erlang",
-            ".fs": "F#",
-            ".ml": "OCaml",
-            ".mli": "OCaml",
-        }
-
-        # 遍历项目文件
-        for root, dirs, files in os.walk(repo_path):
-            # 跳过隐藏目录和node_modules等
-            dirs[:] = [
-                d
-                for d in dirs
-                if not d.startswith(".")
-                and d not in ["node_modules", "venv", "__pycache__"]
-            ]
-
-            for file in files:
-                _, ext = os.path.splitext(file)
-                if ext in extension_mapping:
-                    languages.add(extension_mapping[ext])
+    def _detect_programming_languages(
+        self, repo_path: RepoFS, language_stats: List[LanguageStat]
+    ) -> List[str]:
+        """检测项目使用的编程语言，按代码量从多到少排列"""
+        languages = [stat.language for stat in language_stats]
 
         # 检查特殊文件
-        if (repo_path / "Cargo.toml").exists():
-            languages.add("Rust")
-        if (repo_path / "go.mod").exists():
-            languages.add("Go")
-        if (repo_path / "package.json").exists():
-            languages.add("JavaScript")
-        if (
-            (repo_path / "requirements.txt").exists()
-            or (repo_path / "setup.py").exists()
-            or (repo_path / "pyproject.toml").exists()
-        ):
-            languages.add("Python")
+        index = get_repo_index(repo_path)
+        special_files = [
+            ("Cargo.toml", "Rust"),
+            ("go.mod", "Go"),
+            ("package.json", "JavaScript"),
+            ("requirements.txt", "Python"),
+            ("setup.py", "Python"),
+            ("pyproject.toml", "Python"),
+        ]
+        for file_name, language in special_files:
+            if index.exists(file_name) and language not in languages:
+                languages.append(language)
 
-        return list(languages)
+        return languages
 
-    def _detect_frameworks(self, repo_path: Path) -> List[str]:
-        """检测项目使用的框架和库"""
+    def _detect_frameworks(self, repo_path: RepoFS) -> List[str]:
+        """根据清单文件解析出的依赖检测项目使用的框架和库"""
+        graph = get_dependency_graph(repo_path)
         frameworks = []
 
-        # Python框架检测
-        if (repo_path / "requirements.txt").exists():
-            content = self.read_file_content(repo_path, "requirements.txt") or ""
-            python_frameworks = {
-                "django": "Django",
-                "flask": "Flask",
-                "fastapi": "FastAPI",
-                "pyramid": "Pyramid",
-                "tornado": "Tornado",
-                "dash": "Dash",
-                "streamlit": "Streamlit",
-                "numpy": "NumPy",
-                "pandas": "Pandas",
-                "scikit-learn": "Scikit-learn",
-                "tensorflow": "TensorFlow",
-                "torch": "PyTorch",
-                "keras": "Keras",
-            }
-            for package, framework in python_frameworks.items():
-                if package in content.lower():
-                    frameworks.append(framework)
-
-        if (repo_path / "setup.py").exists() or (repo_path / "pyproject.toml").exists():
-            content = (
-                self.read_file_content(repo_path, "setup.py")
-                or self.read_file_content(repo_path, "pyproject.toml")
-                or ""
-            )
-            python_frameworks = {
-                "django": "Django",
-                "flask": "Flask",
-                "fastapi": "FastAPI",
-                "pyramid": "Pyramid",
-                "tornado": "Tornado",
-                "dash": "Dash",
-                "streamlit": "Streamlit",
-            }
-            for package, framework in python_frameworks.items():
-                if package in content.lower():
-                    frameworks.append(framework)
-
-        # JavaScript/Node.js框架检测
-        if (repo_path / "package.json").exists():
-            content = self.read_file_content(repo_path, "package.json") or ""
-            js_frameworks = {
-                "react": "React",
-                "vue": "Vue.js",
-                "angular": "Angular",
-                "express": "Express",
-                "next": "Next.js",
-                "nuxt": "Nuxt.js",
-                "svelte": "Svelte",
-                "ember": "Ember.js",
-            }
-            for package, framework in js_frameworks.items():
-                if package in content.lower():
+        # Python框架：PyPI和conda包名一致
+        for name in graph.names(["pypi", "conda"]):
+            if name in PYTHON_FRAMEWORKS:
+                frameworks.append(PYTHON_FRAMEWORKS[name])
+
+        # JavaScript/Node.js框架
+        for name in graph.names(["npm"]):
+            if name in JS_FRAMEWORKS:
+                frameworks.append(JS_FRAMEWORKS[name])
+
+        # Java框架：按groupId前缀匹配
+        for name in graph.names(["maven"]):
+            group = name.split(":", 1)[0]
+            for prefix, framework in JAVA_FRAMEWORK_GROUPS.items():
+                if group == prefix or group.startswith(prefix + "."):
                     frameworks.append(framework)
 
-        # Java框架检测
-        if (repo_path / "pom.xml").exists() or (repo_path / "build.gradle").exists():
-            content = (
-                self.read_file_content(repo_path, "pom.xml")
-                or self.read_file_content(repo_path, "build.gradle")
-                or ""
-            )
-            java_frameworks = {
-                "spring": "Spring",
-                "hibernate": "Hibernate",
-                "struts": "Struts",
-                "play": "Play Framework",
-            }
-            for framework_key, framework_name in java_frameworks.items():
-                if framework_key in content.lower():
-                    frameworks.append(framework_name)
-
-        return list(set(frameworks))  # 去重
+        return list(dict.fromkeys(frameworks))  # 去重并保持检测顺序
 
-    def _analyze_directory_structure(self, repo_path: Path) -> Dict[str, str]:
+    def _analyze_directory_structure(self, repo_path: RepoFS) -> Dict[str, str]:
         """分析目录结构"""
         directory_structure = {}
+        index = get_repo_index(repo_path)
 
-        def analyze_dir(path: Path, prefix: str = ""):
-            if path.name.startswith(".") or path.name in [
+        def analyze_dir(rel_path: str, prefix: str = ""):
+            name = rel_path.rsplit("/", 1)[-1]
+            if name.startswith(".") or name in [
                 "node_modules",
                 "venv",
                 "__pycache__",
@@ -479,25 +845,28 @@ class GitHubAnalyzer:
             ]:
                 return
 
-            for item in path.iterdir():
-                if item.is_dir():
+            for item in index.list_dir(rel_path):
+                if item.name == ".git":
+                    # 无论是目录还是worktree检出中的文件都不属于项目结构
+                    continue
+                if item.is_dir:
                     # 记录目录
                     dir_path = f"{prefix}/{item.name}" if prefix else item.name
                     # 尝试识别目录用途
-                    purpose = self._identify_directory_purpose(item)
+                    purpose = self._identify_directory_purpose(item.name)
                     directory_structure[dir_path] = purpose
                     # 递归分析子目录，但限制深度
                     if prefix.count("/") < 2:  # 限制递归深度
-                        analyze_dir(item, dir_path)
-                elif item.is_file() and prefix == "":  # 根目录的文件
+                        analyze_dir(item.path, dir_path)
+                elif prefix == "":  # 根目录的文件
                     directory_structure[item.name] = "根目录文件"
 
-        analyze_dir(repo_path)
+        analyze_dir("")
         return directory_structure
 
-    def _identify_directory_purpose(self, dir_path: Path) -> str:
+    def _identify_directory_purpose(self, dir_name: str) -> str:
         """识别目录用途"""
-        dir_name = dir_path.name.lower()
+        dir_name = dir_name.lower()
 
         purpose_mapping = {
             "src": "源代码目录",
@@ -543,14 +912,15 @@ class GitHubAnalyzer:
 
         return purpose_mapping.get(dir_name, "普通目录")
 
-    def _identify_main_components(self, repo_path: Path) -> List[str]:
+    def _identify_main_components(self, repo_path: RepoFS) -> List[str]:
         """识别主要组件"""
         components = []
+        index = get_repo_index(repo_path)
 
         # 通过目录结构识别组件
-        for item in repo_path.iterdir():
+        for item in index.list_dir():
             if (
-                item.is_dir()
+                item.is_dir
                 and not item.name.startswith(".")
                 and item.name not in ["node_modules", "venv", "__pycache__", ".git"]
             ):
@@ -571,17 +941,18 @@ class GitHubAnalyzer:
         }
 
         for file_name, component in special_files.items():
-            if (repo_path / file_name).exists():
+            if index.exists(file_name):
                 components.append(component)
 
         return list(set(components))  # 去重
 
-    def _identify_entry_points(self, repo_path: Path) -> List[str]:
+    def _identify_entry_points(self, repo_path: RepoFS) -> List[str]:
         """识别项目入口点"""
         entry_points = []
+        index = get_repo_index(repo_path)
 
         # Python项目入口点
-        if (repo_path / "setup.py").exists():
+        if index.exists("setup.py"):
             content = self.read_file_content(repo_path, "setup.py") or ""
             entry_matches = re.findall(
                 r"entry_points.*?console_scripts.*?=\s*\[(.*?)\]",
@@ -592,29 +963,27 @@ class GitHubAnalyzer:
                 entry_points.append("Python CLI命令")
 
         # 查找main文件
-        for item in repo_path.iterdir():
-            if item.is_file():
+        for item in index.list_dir():
+            if not item.is_dir:
                 if item.name.startswith("main.") or "main" in item.name:
                     entry_points.append(f"主程序文件: {item.name}")
                 elif item.name == "app.py" or item.name == "application.py":
                     entry_points.append(f"应用入口: {item.name}")
 
         # 查找可执行脚本
-        scripts_dir = repo_path / "scripts"
-        if scripts_dir.exists() and scripts_dir.is_dir():
-            for script in scripts_dir.iterdir():
-                if script.is_file() and script.stat().st_mode & 0o111:  # 可执行文件
-                    entry_points.append(f"可执行脚本: {script.name}")
+        for script in index.list_dir("scripts"):
+            if not script.is_dir and script.executable:  # 可执行文件
+                entry_points.append(f"可执行脚本: {script.name}")
 
         # package.json中的scripts
-        if (repo_path / "package.json").exists():
+        if index.exists("package.json"):
             content = self.read_file_content(repo_path, "package.json") or ""
             if '"start"' in content or '"dev"' in content:
                 entry_points.append("Node.js应用入口")
 
         return entry_points
 
-    def _identify_config_files(self, repo_path: Path) -> List[str]:
+    def _identify_config_files(self, repo_path: RepoFS) -> List[str]:
         """识别配置文件"""
         config_files = []
 
@@ -639,63 +1008,116 @@ class GitHubAnalyzer:
             "docker-compose.yaml",
         ]
 
+        index = get_repo_index(repo_path)
         for config in common_configs:
-            if (repo_path / config).exists():
+            if index.exists(config):
                 config_files.append(config)
 
         # 查找配置目录中的文件
         config_dirs = ["config", "conf", "cfg"]
         for dir_name in config_dirs:
-            config_dir = repo_path / dir_name
-            if config_dir.exists() and config_dir.is_dir():
-                for config_file in config_dir.iterdir():
-                    if config_file.is_file():
-                        config_files.append(f"{dir_name}/{config_file.name}")
+            for config_file in index.list_dir(dir_name):
+                if not config_file.is_dir:
+                    config_files.append(f"{dir_name}/{config_file.name}")
 
         return config_files
 
-    def _analyze_test_structure(self, repo_path: Path) -> Dict[str, str]:
+    def _analyze_test_structure(self, repo_path: RepoFS) -> Dict[str, str]:
         """分析测试结构"""
         test_structure = {}
+        index = get_repo_index(repo_path)
 
-        # 查找测试目录
+        # 查找测试目录，分析其中的文件和子目录
         test_dirs = ["test", "tests", "spec", "specs"]
         for dir_name in test_dirs:
-            test_dir = repo_path / dir_name
-            if test_dir.exists() and test_dir.is_dir():
-                # 分析测试目录中的文件和子目录
-                for item in test_dir.iterdir():
-                    if item.is_dir():
-                        test_structure[f"{dir_name}/{item.name}"] = "测试子目录"
-                    elif item.is_file():
-                        test_structure[f"{dir_name}/{item.name}"] = "测试文件"
+            for item in index.list_dir(dir_name):
+                if item.is_dir:
+                    test_structure[f"{dir_name}/{item.name}"] = "测试子目录"
+                else:
+                    test_structure[f"{dir_name}/{item.name}"] = "测试文件"
 
         # 查找根目录的测试文件
-        for item in repo_path.iterdir():
-            if item.is_file() and "test" in item.name.lower():
+        for item in index.list_dir():
+            if not item.is_dir and "test" in item.name.lower():
                 test_structure[item.name] = "根目录测试文件"
 
         return test_structure
 
+    def _detect_lfs_files(self, repo_path: RepoFS) -> List[LFSFile]:
+        """按.gitattributes中的filter=lfs规则识别LFS指针文件"""
+        attributes = repo_path.read_text(".gitattributes") or ""
+        matchers = [
+            compile_path_pattern(fields[0].lstrip("/"))
+            for fields in (line.split() for line in attributes.splitlines())
+            if len(fields) > 1 and "filter=lfs" in fields[1:]
+        ]
+        if not matchers:
+            return []
+
+        lfs_files = []
+        for entry in get_repo_index(repo_path).files:
+            # 大小为0的是稀疏检出之外的文件，不为识别指针而触发下载
+            if not 0 < entry.size <= LFS_POINTER_MAX_SIZE or not any(
+                m.match(entry.path) for m in matchers
+            ):
+                continue
+            pointer = LFS_POINTER_PATTERN.match(repo_path.read_text(entry.path) or "")
+            if pointer:
+                lfs_files.append(
+                    LFSFile(
+                        path=entry.path,
+                        oid=pointer.group(1),
+                        size=int(pointer.group(2)),
+                    )
+                )
+        return lfs_files
+
+    def _detect_submodules(self, repo_path: RepoFS) -> List[Submodule]:
+        """解析.gitmodules，并读取gitlink记录的子模块提交"""
+        content = repo_path.read_text(".gitmodules")
+        if not content:
+            return []
+
+        sections = []
+        for line in content.splitlines():
+            line = line.strip()
+            if line.startswith("[submodule"):
+                sections.append({})
+            elif "=" in line and sections:
+                key, value = line.split("=", 1)
+                sections[-1][key.strip()] = value.strip()
+
+        return [
+            Submodule(
+                path=section["path"],
+                url=section.get("url"),
+                commit=repo_path.gitlink(section["path"]),
+            )
+            for section in sections
+            if "path" in section
+        ]
+
     def analyze_security(self, repo_path: Path) -> Optional[SecurityAnalysis]:
         """分析仓库安全性 - MVP实现"""
         print(f"🔍 开始安全分析: {repo_path.name}")
-        
+
         try:
             from .security_analyzer import SecurityAnalyzer
-            
+
             analyzer = SecurityAnalyzer(repo_path)
             security_analysis = analyzer.analyze_security()
-            
+
             if security_analysis:
-                print(f"✅ 安全分析完成: {security_analysis.total_high_risk} 高风险, "
-                      f"{security_analysis.total_medium_risk} 中风险, "
-                      f"{security_analysis.total_low_risk} 低风险")
+                print(
+                    f"✅ 安全分析完成: {security_analysis.total_high_risk} 高风险, "
+                    f"{security_analysis.total_medium_risk} 中风险, "
+                    f"{security_analysis.total_low_risk} 低风险"
+                )
             else:
                 print("⚠️ 安全分析未返回结果")
-                
+
             return security_analysis
-            
+
         except ImportError:
             print("⚠️ 安全分析模块导入失败，跳过安全检查")
             return None
@@ -0,0 +1,85 @@
+"""文件清单持久缓存 - 按Git树对象ID缓存每个目录的清单记录
+
+同一仓库再次分析时，未变化的目录(树ID相同)直接复用记录，无需再次列目录、
+stat文件和判定剪枝规则，只有变化的子树会重新遍历。
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+class IndexCache:
+    """基于SQLite的目录记录缓存，可被多个进程共享"""
+
+    def __init__(self, path: Path, max_entries: int = 500000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 超出后按最近使用时间淘汰
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, used_at REAL NOT NULL)"
+            )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(view: str, rel_path: str, tree_id: str, rules_fingerprint: str) -> str:
+        """目录记录的缓存键：路径、树ID和作用于该目录的剪枝规则共同决定记录内容
+
+        view区分文件系统类型，检出的根目录比对象库多出.git
+        """
+        return hashlib.sha1(
+            f"{view}\0{rel_path}\0{tree_id}\0{rules_fingerprint}".encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def update(self, records: Dict[str, dict], used_keys: Iterable[str] = ()) -> None:
+        """写入新记录、刷新命中记录的使用时间，并淘汰超出上限的旧记录"""
+        now = time.time()
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                        [
+                            (key, json.dumps(record, separators=(",", ":")), now)
+                            for key, record in records.items()
+                        ],
+                    )
+                    self._conn.executemany(
+                        "UPDATE entries SET used_at = ? WHERE key = ?",
+                        [(now, key) for key in used_keys],
+                    )
+                    self._conn.execute(
+                        "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+                        "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+            except sqlite3.Error as e:
+                # 缓存写入失败(如并发锁超时)不影响分析结果
+                print(f"⚠️ 文件清单缓存写入失败: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
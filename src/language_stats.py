@@ -0,0 +1,152 @@
+"""语言统计 - 基于文件清单按字节和行数计算各语言占比(类似GitHub linguist)"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .models import LanguageStat
+from .repo_fs import RepoFS
+from .repo_index import RepoIndex, get_repo_index
+
+# 通过文件扩展名识别编程语言
+LANGUAGE_EXTENSIONS = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".java": "Java",
+    ".cpp": "C++",
+    ".c": "C",
+    ".cs": "C#",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".rb": "Ruby",
+    ".php": "PHP",
+    ".swift": "Swift",
+    ".kt": "Kotlin",
+    ".R": "R",
+    ".r": "R",
+    ".sql": "SQL",
+    ".sh": "Shell",
+    ".pl": "Perl",
+    ".lua": "Lua",
+    ".dart": "Dart",
+    ".scala": "Scala",
+    ".m": "Objective-C",
+    ".mm": "Objective-C++",
+    ".groovy": "Groovy",
+    ".hs": "Haskell",
+    ".clj": "Clojure",
+    ".ex": "Elixir",
+    ".exs": "Elixir",
+    ".erl": "Erlang",
+    ".fs": "F#",
+    ".ml": "OCaml",
+    ".mli": "OCaml",
+}
+
+# 第三方代码和虚拟环境目录(按目录名匹配，不区分大小写)；隐藏目录同样排除
+VENDORED_DIRS = {
+    "vendor",
+    "vendors",
+    "third_party",
+    "third-party",
+    "thirdparty",
+    "external",
+    "extern",
+    "deps",
+    "node_modules",
+    "bower_components",
+    "venv",
+    "__pycache__",
+}
+
+# 常见的生成文件(压缩脚本、protobuf/gRPC桩代码、设计器代码等)
+GENERATED_PATTERN = re.compile(
+    r"(?:[.-]min\.js|_pb2(?:_grpc)?\.py|\.pb\.(?:go|cc|h)|\.designer\.cs"
+    r"|[._]generated\.\w+)\Z",
+    re.IGNORECASE,
+)
+
+# 超过该大小的文件只计入字节数，不读取内容统计行数
+LINE_COUNT_MAX_SIZE = 1024 * 1024
+
+
+def is_vendored_dir(name: str) -> bool:
+    """目录是否为隐藏目录或第三方代码目录"""
+    return name.startswith(".") or name.lower() in VENDORED_DIRS
+
+
+def is_generated(rel_path: str) -> bool:
+    """文件是否为常见的生成文件"""
+    return GENERATED_PATTERN.search(rel_path) is not None
+
+
+def language_bytes(index: RepoIndex) -> Dict[str, Tuple[int, int]]:
+    """按语言汇总文件数和字节数，无需读取文件内容
+
+    Returns:
+        语言 -> (文件数, 字节数)，按字节数从多到少排列
+    """
+    # 先按扩展名分组累加，再映射到语言
+    by_extension: Dict[str, List[int]] = {}
+    for item in index.iter_files(is_vendored_dir):
+        if item.extension in LANGUAGE_EXTENSIONS and not is_generated(item.path):
+            totals = by_extension.setdefault(item.extension, [0, 0])
+            totals[0] += 1
+            totals[1] += item.size
+
+    by_language: Dict[str, Tuple[int, int]] = {}
+    for extension, (files, size) in by_extension.items():
+        language = LANGUAGE_EXTENSIONS[extension]
+        previous = by_language.get(language, (0, 0))
+        by_language[language] = (previous[0] + files, previous[1] + size)
+    return dict(sorted(by_language.items(), key=lambda kv: (-kv[1][1], kv[0])))
+
+
+def dominant_language(index: RepoIndex) -> Optional[str]:
+    """字节数最多的语言，没有可识别的源代码时返回None"""
+    return next(iter(language_bytes(index)), None)
+
+
+def compute_language_stats(
+    repo_fs: RepoFS, index: Optional[RepoIndex] = None
+) -> List[LanguageStat]:
+    """计算各语言的文件数、字节数、行数及占比
+
+    行数只统计已在本地且不超过 LINE_COUNT_MAX_SIZE 的文件，不会触发下载。
+    """
+    index = index or get_repo_index(repo_fs)
+    totals = language_bytes(index)
+    if not totals:
+        return []
+
+    lines: Dict[str, int] = dict.fromkeys(totals, 0)
+    for item in index.iter_files(is_vendored_dir):
+        language = LANGUAGE_EXTENSIONS.get(item.extension)
+        if (
+            language is None
+            or item.size > LINE_COUNT_MAX_SIZE
+            or is_generated(item.path)
+            or not repo_fs.is_fetched(item.path)
+        ):
+            continue
+        try:
+            data = repo_fs.read_bytes(item.path)
+        except OSError:
+            continue
+        lines[language] += data.count(b"\n") + (
+            1 if data and not data.endswith(b"\n") else 0
+        )
+
+    total_bytes = sum(size for _, size in totals.values())
+    total_lines = sum(lines.values())
+    return [
+        LanguageStat(
+            language=language,
+            files=files,
+            bytes=size,
+            lines=lines[language],
+            byte_share=round(size / total_bytes, 4) if total_bytes else 0.0,
+            line_share=round(lines[language] / total_lines, 4) if total_lines else 0.0,
+        )
+        for language, (files, size) in totals.items()
+    ]
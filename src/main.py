@@ -71,6 +71,7 @@ def analyze(
         )
         raise typer.Exit(1)
 
+    github_analyzer = None
     try:
         with Progress(
             SpinnerColumn(),
@@ -87,14 +88,15 @@ def analyze(
             )
             progress.update(task1, completed=1)
 
-            # 2. 克隆仓库
-            task2 = progress.add_task("克隆GitHub仓库...", total=None)
-            repo_path = github_analyzer.clone_repository(repo_url)
+            # 2. 分析仓库基础信息(仓库大小用于选择克隆策略)
+            task2 = progress.add_task("分析仓库基础信息...", total=None)
+            repo_info = github_analyzer.analyze_repository_info(repo_url)
             progress.update(task2, completed=1)
 
-            # 3. 分析仓库基础信息
-            task3 = progress.add_task("分析仓库基础信息...", total=None)
-            repo_info = github_analyzer.analyze_repository_info(repo_url)
+            # 3. 克隆仓库
+            task3 = progress.add_task("克隆GitHub仓库...", total=None)
+            repo_path = github_analyzer.clone_repository(repo_url, repo_info)
+            repo_info.acquisition_strategy = github_analyzer.acquisition_strategy
             progress.update(task3, completed=1)
 
             # 4. 提取作者信息
@@ -114,6 +116,9 @@ def analyze(
             )
             # 将架构信息和其他AI分析结果添加到分析结果中
             analysis_result.architecture = architecture
+            analysis_result.activity = github_analyzer.analyze_commit_activity(
+                repo_path
+            )
             progress.update(task6, completed=1)
 
             # 7. 安全分析 (MVP新增功能)
@@ -154,6 +159,10 @@ def analyze(
     except Exception as e:
         console.print(f"[red]❌ 分析失败: {e}[/red]")
         raise typer.Exit(1)
+    finally:
+        # 释放工作区租约，其他进程仍在使用的工作区不会被回收
+        if github_analyzer is not None:
+            github_analyzer.release_workspaces()
 
 
 @app.command()
@@ -253,6 +262,12 @@ def _display_analysis_summary(analysis, reports):
     info_table.add_row("Stars", str(analysis.repository.stars))
     info_table.add_row("Forks", str(analysis.repository.forks))
     info_table.add_row("作者数量", str(len(analysis.authors)))
+    if analysis.activity:
+        info_table.add_row(
+            "提交记录",
+            f"{analysis.activity.total_commits} 次，"
+            f"{analysis.activity.first_commit} ~ {analysis.activity.last_commit}",
+        )
     info_table.add_row("发表文章", str(len(analysis.publications)))
 
     console.print(info_table)
@@ -0,0 +1,634 @@
+"""依赖清单解析 - 将各生态的清单文件解析为规范化的依赖图，每个仓库只解析一次
+
+支持的清单：
+    pyproject.toml / setup.cfg / setup.py / requirements*.txt (含 -r 引用)   PyPI
+    environment.yml (含pip小节)                                            conda / PyPI
+    package.json                                                           npm
+    DESCRIPTION                                                            CRAN
+    Cargo.toml                                                             cargo
+    pom.xml / build.gradle(.kts)                                           Maven
+
+依赖图供框架检测、安全扫描和AI分析的提示词共用。
+"""
+
+import ast
+import configparser
+import json
+import posixpath
+import re
+import tomllib
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .models import Dependency
+from .repo_fs import LocalRepoFS, RepoFS, open_repo_fs
+from .repo_index import get_repo_index
+from .repo_workspace import get_workspace, parent_dir
+
+# PEP 508 依赖声明：名称、可选extras、版本约束或URL，分号后为环境标记
+REQUIREMENT_PATTERN = re.compile(
+    r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*"
+    r"(?:@\s*(?P<url>\S+)|\(?(?P<spec>[^;()]*)\)?)\s*(?:;.*)?$"
+)
+
+# conda依赖："channel::name 版本约束"
+CONDA_PATTERN = re.compile(r"^(?:[\w.-]+::)?([A-Za-z0-9_][A-Za-z0-9._+-]*)\s*(.*)$")
+
+# build.gradle 中 配置名 "group:artifact:version" 形式的依赖
+GRADLE_PATTERN = re.compile(
+    r"\b(\w+)\s*\(?\s*[\"']([^\"':\s]+):([^\"':\s]+)(?::([^\"'\s]+))?[\"']"
+)
+
+# R DESCRIPTION 中各字段对应的依赖范围
+DESCRIPTION_FIELDS = {
+    "Depends": "runtime",
+    "Imports": "runtime",
+    "LinkingTo": "build",
+    "Suggests": "optional",
+}
+
+# 按文件名推断requirements文件的依赖范围
+REQUIREMENTS_SCOPES = (
+    ("test", "test"),
+    ("dev", "dev"),
+    ("lint", "dev"),
+    ("doc", "dev"),
+)
+
+# 防止 -r 引用链过深或成环
+MAX_INCLUDE_DEPTH = 8
+
+
+def normalize_name(name: str, ecosystem: str) -> str:
+    """按生态规范化包名：PyPI按PEP 503，其余统一小写"""
+    if ecosystem == "pypi":
+        return re.sub(r"[-_.]+", "-", name).lower()
+    return name.lower()
+
+
+def parse_requirement(
+    line: str, source: str, scope: str = "runtime"
+) -> Optional[Dependency]:
+    """解析一条PEP 508依赖声明，无法识别时返回None"""
+    match = REQUIREMENT_PATTERN.match(line)
+    if not match:
+        return None
+    spec = (match.group("spec") or "").replace(" ", "") or None
+    return Dependency(
+        name=normalize_name(match.group(1), "pypi"),
+        ecosystem="pypi",
+        spec=spec,
+        scope=scope,
+        source=source,
+    )
+
+
+def _requirements(
+    lines: Iterable, source: str, scope: str = "runtime"
+) -> List[Dependency]:
+    dependencies = []
+    for line in lines:
+        if isinstance(line, str):
+            dependency = parse_requirement(line, source, scope)
+            if dependency is not None:
+                dependencies.append(dependency)
+    return dependencies
+
+
+def parse_pyproject(content: str, source: str) -> List[Dependency]:
+    """解析pyproject.toml：PEP 621、PEP 735依赖组、Poetry和build-system"""
+    data = tomllib.loads(content)
+    project = data.get("project", {})
+    dependencies = _requirements(project.get("dependencies", []), source)
+    for extras in project.get("optional-dependencies", {}).values():
+        dependencies += _requirements(extras, source, "optional")
+    for group in data.get("dependency-groups", {}).values():
+        dependencies += _requirements(group, source, "dev")
+    dependencies += _requirements(
+        data.get("build-system", {}).get("requires", []), source, "build"
+    )
+
+    poetry = data.get("tool", {}).get("poetry", {})
+    tables = [(poetry.get("dependencies", {}), "runtime")]
+    tables.append((poetry.get("dev-dependencies", {}), "dev"))
+    for name, group in poetry.get("group", {}).items():
+        tables.append(
+            (group.get("dependencies", {}), "test" if name == "test" else "dev")
+        )
+    for table, scope in tables:
+        for name, value in table.items():
+            if name.lower() == "python":
+                continue
+            spec = _poetry_spec(value)
+            dependencies.append(
+                Dependency(
+                    name=normalize_name(name, "pypi"),
+                    ecosystem="pypi",
+                    spec=None if spec in (None, "*") else spec,
+                    scope=scope,
+                    source=source,
+                )
+            )
+    return dependencies
+
+
+def _poetry_spec(value) -> Optional[str]:
+    """Poetry依赖的版本约束；按平台或Python版本分别声明的多个约束以 || 合并"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get("version")
+    if isinstance(value, list):
+        versions = []
+        for item in value:
+            spec = _poetry_spec(item)
+            if spec and spec != "*" and spec not in versions:
+                versions.append(spec)
+        return " || ".join(versions) or None
+    return None
+
+
+def parse_setup_cfg(content: str, source: str) -> List[Dependency]:
+    """解析setup.cfg的[options]和[options.extras_require]"""
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read_string(content)
+    dependencies = []
+    if parser.has_section("options"):
+        options = parser["options"]
+        for key, scope in (
+            ("install_requires", "runtime"),
+            ("setup_requires", "build"),
+            ("tests_require", "test"),
+        ):
+            dependencies += _requirements(
+                options.get(key, "").splitlines(), source, scope
+            )
+    if parser.has_section("options.extras_require"):
+        for value in parser["options.extras_require"].values():
+            dependencies += _requirements(value.splitlines(), source, "optional")
+    return dependencies
+
+
+def parse_setup_py(content: str, source: str) -> List[Dependency]:
+    """静态解析setup.py中setup()调用的依赖参数，不执行文件
+
+    参数值为字面量、模块级字面量变量或二者的列表拼接时可解析，其余情况忽略。
+    """
+    tree = ast.parse(content)
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name):
+                try:
+                    constants[target.id] = ast.literal_eval(node.value)
+                except (ValueError, TypeError, SyntaxError):
+                    pass
+
+    def literal(node):
+        if isinstance(node, ast.Name):
+            return constants.get(node.id)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            # 常见写法：BASE_REQUIRES + ["extra"]
+            left, right = literal(node.left), literal(node.right)
+            if isinstance(left, list) and isinstance(right, list):
+                return left + right
+            return None
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError):
+            return None
+
+    dependencies = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        if name != "setup":
+            continue
+        for keyword in node.keywords:
+            value = literal(keyword.value)
+            if keyword.arg == "extras_require" and isinstance(value, dict):
+                for extras in value.values():
+                    if isinstance(extras, str):
+                        extras = extras.splitlines()
+                    dependencies += _requirements(extras, source, "optional")
+                continue
+            scope = {
+                "install_requires": "runtime",
+                "setup_requires": "build",
+                "tests_require": "test",
+            }.get(keyword.arg)
+            if scope and isinstance(value, (list, tuple)):
+                dependencies += _requirements(value, source, scope)
+            elif scope and isinstance(value, str):
+                dependencies += _requirements(value.splitlines(), source, scope)
+    return dependencies
+
+
+def requirements_scope(path: str) -> str:
+    name = path.rsplit("/", 1)[-1].lower()
+    for keyword, scope in REQUIREMENTS_SCOPES:
+        if keyword in name:
+            return scope
+    return "runtime"
+
+
+def parse_requirements(content: str, source: str) -> Tuple[List[Dependency], List[str]]:
+    """解析requirements文件
+
+    Returns:
+        (依赖, 通过 -r/--requirement 引用的其他requirements文件路径)；
+        绝对路径和指向仓库根目录之外的引用被丢弃
+    """
+    scope = requirements_scope(source)
+    dependencies, includes = [], []
+    for line in content.replace("\\\n", " ").splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        option = re.match(r"^(-r|--requirement)[=\s]*(\S+)", line)
+        if option:
+            target = option.group(2)
+            path = posixpath.normpath(posixpath.join(parent_dir(source), target))
+            if posixpath.isabs(target) or path == ".." or path.startswith("../"):
+                print(f"⚠️ 忽略指向仓库之外的requirements引用 {source}: {target}")
+            else:
+                includes.append(path)
+            continue
+        if line.startswith(("-e", "--editable")) or "://" in line:
+            # 可编辑安装或URL，仅在带 #egg= 时可知包名
+            egg = re.search(r"#egg=([A-Za-z0-9._-]+)", line)
+            if egg:
+                dependencies.append(
+                    Dependency(
+                        name=normalize_name(egg.group(1), "pypi"),
+                        ecosystem="pypi",
+                        scope=scope,
+                        source=source,
+                    )
+                )
+            continue
+        if line.startswith("-"):
+            continue
+        # 去掉行内的 --hash 等选项
+        dependency = parse_requirement(line.split(" --", 1)[0], source, scope)
+        if dependency is not None:
+            dependencies.append(dependency)
+    return dependencies, includes
+
+
+def parse_conda_environment(content: str, source: str) -> List[Dependency]:
+    """解析conda环境文件，pip小节中的依赖归入PyPI"""
+    try:
+        import yaml
+    except ImportError:
+        print(f"⚠️ 未安装PyYAML，跳过conda环境文件: {source}")
+        return []
+
+    data = yaml.safe_load(content) or {}
+    dependencies = []
+    for item in data.get("dependencies", []) or []:
+        if isinstance(item, dict):
+            dependencies += _requirements(item.get("pip", []) or [], source)
+            continue
+        match = CONDA_PATTERN.match(str(item).strip())
+        if match:
+            spec = match.group(2).replace(" ", "") or None
+            dependencies.append(
+                Dependency(
+                    name=normalize_name(match.group(1), "conda"),
+                    ecosystem="conda",
+                    spec=spec,
+                    source=source,
+                )
+            )
+    return dependencies
+
+
+def parse_package_json(content: str, source: str) -> List[Dependency]:
+    """解析package.json的各类依赖"""
+    data = json.loads(content)
+    dependencies = []
+    for key, scope in (
+        ("dependencies", "runtime"),
+        ("peerDependencies", "runtime"),
+        ("optionalDependencies", "optional"),
+        ("devDependencies", "dev"),
+    ):
+        for name, spec in (data.get(key) or {}).items():
+            dependencies.append(
+                Dependency(
+                    name=normalize_name(name, "npm"),
+                    ecosystem="npm",
+                    spec=spec if isinstance(spec, str) else None,
+                    scope=scope,
+                    source=source,
+                )
+            )
+    return dependencies
+
+
+def parse_r_description(content: str, source: str) -> List[Dependency]:
+    """解析R包的DESCRIPTION文件(DCF格式，续行以空白开头)"""
+    fields: Dict[str, str] = {}
+    current = None
+    for line in content.splitlines():
+        if line[:1].isspace() and current:
+            fields[current] += " " + line.strip()
+        elif ":" in line:
+            current, value = line.split(":", 1)
+            fields[current] = value.strip()
+
+    dependencies = []
+    for field, scope in DESCRIPTION_FIELDS.items():
+        for item in fields.get(field, "").split(","):
+            match = re.match(r"^\s*([A-Za-z][A-Za-z0-9.]*)\s*(?:\(([^)]*)\))?", item)
+            # Depends中的"R"为R版本要求而非包
+            if match and match.group(1) != "R":
+                dependencies.append(
+                    Dependency(
+                        name=normalize_name(match.group(1), "cran"),
+                        ecosystem="cran",
+                        spec=(match.group(2) or "").replace(" ", "") or None,
+                        scope=scope,
+                        source=source,
+                    )
+                )
+    return dependencies
+
+
+def parse_cargo_toml(content: str, source: str) -> List[Dependency]:
+    """解析Cargo.toml，包括按目标平台声明的依赖"""
+    data = tomllib.loads(content)
+    sections = [data] + list(data.get("target", {}).values())
+    dependencies = []
+    for section in sections:
+        for key, scope in (
+            ("dependencies", "runtime"),
+            ("build-dependencies", "build"),
+            ("dev-dependencies", "dev"),
+        ):
+            for name, value in section.get(key, {}).items():
+                spec = value if isinstance(value, str) else value.get("version")
+                dependencies.append(
+                    Dependency(
+                        name=normalize_name(
+                            (
+                                value.get("package", name)
+                                if isinstance(value, dict)
+                                else name
+                            ),
+                            "cargo",
+                        ),
+                        ecosystem="cargo",
+                        spec=spec,
+                        scope=scope,
+                        source=source,
+                    )
+                )
+    return dependencies
+
+
+def parse_pom_xml(content: str, source: str) -> List[Dependency]:
+    """解析pom.xml中项目直接声明的依赖，版本中的${属性}按<properties>展开"""
+    root = ET.fromstring(content)
+
+    def local(tag: str) -> str:
+        return tag.rsplit("}", 1)[-1]
+
+    def child(element, name: str) -> Optional[ET.Element]:
+        return next((c for c in element if local(c.tag) == name), None)
+
+    def text(element, name: str) -> str:
+        node = child(element, name)
+        return (node.text or "").strip() if node is not None else ""
+
+    properties = {}
+    node = child(root, "properties")
+    if node is not None:
+        properties = {local(p.tag): (p.text or "").strip() for p in node}
+
+    dependencies = []
+    node = child(root, "dependencies")
+    for item in node if node is not None else []:
+        group, artifact = text(item, "groupId"), text(item, "artifactId")
+        if not artifact:
+            continue
+        version = re.sub(
+            r"\$\{([^}]+)\}",
+            lambda m: properties.get(m.group(1), m.group(0)),
+            text(item, "version"),
+        )
+        scope = {"test": "test", "provided": "build"}.get(
+            text(item, "scope"), "runtime"
+        )
+        if text(item, "optional") == "true":
+            scope = "optional"
+        dependencies.append(
+            Dependency(
+                name=normalize_name(f"{group}:{artifact}", "maven"),
+                ecosystem="maven",
+                spec=version or None,
+                scope=scope,
+                source=source,
+            )
+        )
+    return dependencies
+
+
+def parse_gradle(content: str, source: str) -> List[Dependency]:
+    """按配置名解析build.gradle(.kts)中字符串形式的依赖坐标"""
+    dependencies = []
+    for configuration, group, artifact, version in GRADLE_PATTERN.findall(content):
+        lowered = configuration.lower()
+        if lowered.startswith("test"):
+            scope = "test"
+        elif lowered in ("compileonly", "annotationprocessor", "kapt"):
+            scope = "build"
+        elif lowered in ("implementation", "api", "compile", "runtimeonly", "runtime"):
+            scope = "runtime"
+        else:
+            continue
+        dependencies.append(
+            Dependency(
+                name=normalize_name(f"{group}:{artifact}", "maven"),
+                ecosystem="maven",
+                spec=version or None,
+                scope=scope,
+                source=source,
+            )
+        )
+    return dependencies
+
+
+# 根目录清单文件名(不区分大小写) -> 解析函数
+MANIFEST_PARSERS = {
+    "pyproject.toml": parse_pyproject,
+    "setup.cfg": parse_setup_cfg,
+    "setup.py": parse_setup_py,
+    "environment.yml": parse_conda_environment,
+    "environment.yaml": parse_conda_environment,
+    "package.json": parse_package_json,
+    "DESCRIPTION": parse_r_description,
+    "Cargo.toml": parse_cargo_toml,
+    "pom.xml": parse_pom_xml,
+    "build.gradle": parse_gradle,
+    "build.gradle.kts": parse_gradle,
+}
+
+
+class DependencyGraph:
+    """仓库的依赖图：清单文件 -> 依赖，以及requirements文件之间的引用"""
+
+    def __init__(
+        self,
+        dependencies: Iterable[Dependency],
+        manifests: Iterable[str],
+        includes: Optional[Dict[str, List[str]]] = None,
+    ):
+        # 同一清单中重复声明的依赖只保留第一条
+        seen: Set[Tuple[str, str, str, str]] = set()
+        unique = []
+        for dependency in dependencies:
+            key = (
+                dependency.source,
+                dependency.ecosystem,
+                dependency.name,
+                dependency.scope,
+            )
+            if key not in seen:
+                seen.add(key)
+                unique.append(dependency)
+        self.dependencies: Tuple[Dependency, ...] = tuple(unique)
+        # 成功解析的清单文件，按解析顺序
+        self.manifests: Tuple[str, ...] = tuple(manifests)
+        # requirements文件 -> 其通过 -r 引用的文件
+        self.includes: Dict[str, List[str]] = dict(includes or {})
+
+    def __len__(self) -> int:
+        return len(self.dependencies)
+
+    def select(
+        self,
+        ecosystems: Optional[Iterable[str]] = None,
+        scopes: Optional[Iterable[str]] = None,
+        source: Optional[str] = None,
+    ) -> List[Dependency]:
+        """按生态、范围和来源筛选依赖"""
+        ecosystems = set(ecosystems) if ecosystems is not None else None
+        scopes = set(scopes) if scopes is not None else None
+        return [
+            d
+            for d in self.dependencies
+            if (ecosystems is None or d.ecosystem in ecosystems)
+            and (scopes is None or d.scope in scopes)
+            and (source is None or d.source == source)
+        ]
+
+    def names(
+        self,
+        ecosystems: Optional[Iterable[str]] = None,
+        scopes: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """去重后的包名，按首次出现顺序"""
+        return list(dict.fromkeys(d.name for d in self.select(ecosystems, scopes)))
+
+    def requirement_lines(self, source: Optional[str] = None) -> List[str]:
+        """运行时PyPI依赖的requirements格式，供pip-audit等工具使用"""
+        return list(
+            dict.fromkeys(
+                d.name + (d.spec or "")
+                for d in self.select(["pypi"], ["runtime"], source)
+            )
+        )
+
+    def summary(self, max_per_ecosystem: int = 40) -> str:
+        """按生态分组的运行时依赖摘要，用于提示词"""
+        lines = []
+        for ecosystem in dict.fromkeys(d.ecosystem for d in self.dependencies):
+            names = self.names([ecosystem], ["runtime", "build"])
+            if not names:
+                continue
+            shown = ", ".join(names[:max_per_ecosystem])
+            more = len(names) - max_per_ecosystem
+            lines.append(
+                f"- {ecosystem}: {shown}" + (f" 等{len(names)}个" if more > 0 else "")
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def build(cls, repo_fs: RepoFS) -> "DependencyGraph":
+        """解析根目录的清单文件和requirements文件(含 -r 引用链)"""
+        index = get_repo_index(repo_fs)
+        dependencies: List[Dependency] = []
+        manifests: List[str] = []
+        includes: Dict[str, List[str]] = {}
+
+        def parse(path: str, parser) -> Optional[object]:
+            content = repo_fs.read_text(path)
+            if content is None:
+                return None
+            try:
+                result = parser(content, path)
+            except Exception as e:
+                # 格式错误或结构不符合预期的清单不影响其他清单
+                print(f"⚠️ 清单文件解析失败 {path}: {e}")
+                return None
+            manifests.append(path)
+            return result
+
+        for name, parser in MANIFEST_PARSERS.items():
+            item = index.find(name)
+            if item is not None and item.path not in manifests:
+                dependencies += parse(item.path, parser) or []
+
+        pending = [
+            (item.path, 0)
+            for directory in ("", "requirements")
+            for item in index.list_dir(directory)
+            if not item.is_dir
+            and item.extension.lower() in (".txt", ".in")
+            and "requirements" in item.path.lower()
+        ]
+        while pending:
+            path, depth = pending.pop(0)
+            if path in manifests or depth > MAX_INCLUDE_DEPTH:
+                continue
+            result = parse(path, parse_requirements)
+            if result is None:
+                continue
+            found, referenced = result
+            dependencies += found
+            # 只跟随索引中确实存在的仓库内文件
+            referenced = [ref for ref in referenced if index.is_file(ref)]
+            if referenced:
+                includes[path] = referenced
+                pending += [(ref, depth + 1) for ref in referenced]
+
+        graph = cls(dependencies, manifests, includes)
+        if manifests:
+            print(f"📦 从 {len(manifests)} 个清单文件解析到 {len(graph)} 项依赖")
+        return graph
+
+
+def get_dependency_graph(repo: Union[Path, str, RepoFS]) -> DependencyGraph:
+    """获取仓库依赖图；同一文件系统对象和登记过的工作区只解析一次"""
+    repo_fs = open_repo_fs(repo)
+    if repo_fs.dependency_graph is not None:
+        return repo_fs.dependency_graph
+
+    workspace = (
+        get_workspace(repo_fs.root) if isinstance(repo_fs, LocalRepoFS) else None
+    )
+    if workspace is not None and workspace.dependency_graph is not None:
+        graph = workspace.dependency_graph
+    else:
+        graph = DependencyGraph.build(repo_fs)
+        if workspace is not None:
+            workspace.dependency_graph = graph
+
+    repo_fs.dependency_graph = graph
+    return graph
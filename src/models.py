@@ -15,6 +15,10 @@ class RepositoryInfo(BaseModel):
     stars: int = 0
     forks: int = 0
     license: Optional[str] = None
+    size_kb: Optional[int] = None  # GitHub API报告的仓库大小
+    default_branch: Optional[str] = None
+    fork_network: Optional[str] = None  # fork网络的根仓库(owner/repo)
+    acquisition_strategy: Optional[str] = None  # 实际使用的仓库获取策略
 
 
 class AuthorInfo(BaseModel):
@@ -23,6 +27,25 @@ class AuthorInfo(BaseModel):
     name: str
     email: Optional[str] = None
     github_username: Optional[str] = None
+    role: Optional[str] = None  # 声明的身份：author、maintainer、contributor
+    commit_count: Optional[int] = None  # Git历史中的提交数
+    first_commit: Optional[str] = None  # 首次提交日期
+    last_commit: Optional[str] = None  # 最近提交日期
+
+
+class CommitActivity(BaseModel):
+    """提交活跃度模型 - 从Git历史统计"""
+
+    total_commits: int
+    contributors: int  # 按 .mailmap 合并后的作者数
+    first_commit: str  # 首次提交日期
+    last_commit: str  # 最近提交日期
+    active_months: int  # 有提交的月份数
+    commits_per_month: float  # 首末提交之间的月均提交数
+    median_days_between_commits: Optional[float] = None  # 相邻提交间隔的中位数
+    commits_last_year: int  # 最近一年的提交数
+    days_since_last_commit: int
+    shallow: bool = False  # 浅克隆时历史不完整
 
 
 class Publication(BaseModel):
@@ -34,6 +57,10 @@ class Publication(BaseModel):
     year: Optional[int] = None
     doi: Optional[str] = None
     pmid: Optional[str] = None
+    pmcid: Optional[str] = None
+    # high: 引用文件或README引用章节中声明的本工具文章；
+    # low: README其他位置带DOI/PMID的参考文献行，可能只是工具引用的其他工作
+    confidence: str = "high"
 
 
 class FunctionalityInfo(BaseModel):
@@ -85,16 +112,57 @@ class DataRequirements(BaseModel):
     preprocessing_steps: List[str]  # 预处理步骤
 
 
+class Dependency(BaseModel):
+    """清单文件中声明的依赖"""
+
+    name: str  # 按生态规范化的包名(PyPI按PEP 503，Maven为 groupId:artifactId)
+    ecosystem: str  # pypi, conda, npm, cran, cargo, maven
+    spec: Optional[str] = None  # 版本约束
+    scope: str = "runtime"  # runtime, optional, dev, test, build
+    source: str  # 声明该依赖的清单文件
+
+
+class LFSFile(BaseModel):
+    """Git LFS指针文件模型"""
+
+    path: str
+    oid: str
+    size: int  # 实际内容的字节数
+
+
+class Submodule(BaseModel):
+    """Git子模块模型"""
+
+    path: str
+    url: Optional[str] = None
+    commit: Optional[str] = None  # gitlink记录的子模块提交
+
+
+class LanguageStat(BaseModel):
+    """单个语言的代码量占比(排除第三方和生成文件)"""
+
+    language: str
+    files: int
+    bytes: int
+    lines: int  # 仅统计已在本地的文件
+    byte_share: float  # 0-1
+    line_share: float  # 0-1
+
+
 class ProjectArchitecture(BaseModel):
     """项目架构信息模型"""
 
-    programming_languages: List[str]
+    programming_languages: List[str]  # 按代码量从多到少排列
     frameworks: List[str]
     directory_structure: Dict[str, str]
     main_components: List[str]
     entry_points: List[str]
     config_files: List[str]
     test_structure: Dict[str, str]
+    lfs_files: List[LFSFile] = []  # 未获取内容的LFS指针
+    submodules: List[Submodule] = []  # 未检出的子模块
+    language_stats: List[LanguageStat] = []  # 按字节数从多到少排列
+    dependencies: List[Dependency] = []  # 从清单文件解析的依赖
 
 
 class CodeQualityInfo(BaseModel):
@@ -176,4 +244,5 @@ class BioToolAnalysis(BaseModel):
     testing: Optional[TestingInfo] = None  # 新增：测试信息
     data_requirements: Optional[DataRequirements] = None  # 新增：数据需求
     security: Optional[SecurityAnalysis] = None  # 新增：安全分析
+    activity: Optional[CommitActivity] = None  # 提交活跃度
     analysis_timestamp: str
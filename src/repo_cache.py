@@ -0,0 +1,484 @@
+"""仓库镜像缓存 - 跨运行复用裸仓库，克隆变为增量fetch + worktree检出"""
+
+import os
+import re
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows无fcntl，退化为不加锁
+    fcntl = None
+
+LAST_USED_FILE = "biotools-last-used"
+ROOTS_FILE = "biotools-roots"
+NETWORK_FILE = "biotools-network"
+
+# 获取和检出时不执行LFS smudge(保留指针文件)、不递归子模块，覆盖用户的git配置，
+# 避免下载参考基因组、测试数据子模块等大文件
+ISOLATED_GIT_CONFIG = [
+    "-c",
+    "filter.lfs.smudge=",
+    "-c",
+    "filter.lfs.process=",
+    "-c",
+    "filter.lfs.required=false",
+    "-c",
+    "submodule.recurse=false",
+]
+
+
+@contextmanager
+def file_lock(lock_path: Path, blocking: bool = True) -> Iterator[bool]:
+    """基于flock的跨进程文件锁，非阻塞模式下未获得锁时返回False"""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as handle:
+        if fcntl is None:
+            yield True
+            return
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(handle, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def run_git(
+    args: List[str],
+    cwd: Optional[Path] = None,
+    input_text: Optional[str] = None,
+    isolated: bool = True,
+) -> str:
+    """执行git命令并返回标准输出，失败时抛出RuntimeError
+
+    Args:
+        isolated: 禁用LFS smudge和子模块递归，显式补全LFS/子模块时传False
+    """
+    result = subprocess.run(
+        ["git", *(ISOLATED_GIT_CONFIG if isolated else []), *args],
+        cwd=str(cwd) if cwd else None,
+        input=input_text,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"git {' '.join(args[:2])} 失败: {result.stderr.strip() or result.stdout.strip()}"
+        )
+    return result.stdout
+
+
+def directory_size(path: Path) -> int:
+    """统计目录占用的字节数"""
+    total = 0
+    stack = [str(path)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+class MirrorCache:
+    """裸仓库镜像缓存，按最近使用时间(LRU)和磁盘配额淘汰"""
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int,
+        share_objects: bool = True,
+        in_use: Optional[Callable[[Path], bool]] = None,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # 新建镜像时通过alternates借用同源(共享根提交)镜像的对象库
+        self.share_objects = share_objects
+        # 判断worktree检出是否仍被租用；未提供时凡有worktree的镜像都不淘汰
+        self.in_use = in_use
+
+    def mirror_path(self, repo_url: str) -> Path:
+        """根据仓库URL计算镜像目录"""
+        key = re.sub(r"^[a-z+]+://", "", repo_url.strip().rstrip("/"))
+        key = re.sub(r"\.git$", "", key)
+        key = re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_")
+        return self.root / f"{key}.git"
+
+    def lock(self, mirror: Path, blocking: bool = True):
+        """镜像级文件锁，串行化同一镜像上的fetch、检出和淘汰"""
+        return file_lock(mirror.with_name(mirror.name + ".lock"), blocking)
+
+    def resolve(self, mirror: Path, ref: str = "HEAD") -> str:
+        """解析引用对应的提交ID"""
+        return run_git(["rev-parse", f"{ref}^{{commit}}"], cwd=mirror).strip()
+
+    def ensure_mirror(
+        self,
+        repo_url: str,
+        depth: Optional[int] = None,
+        blob_limit: Optional[str] = None,
+        network: Optional[str] = None,
+    ) -> Path:
+        """确保镜像存在并与远端同步：首次克隆裸仓库，之后仅增量fetch
+
+        Args:
+            depth: 浅克隆深度，仅在新建镜像或镜像本身为浅克隆时生效
+            blob_limit: 部分克隆的blob大小阈值(如 1m)，超出的blob延迟获取
+            network: fork网络标识(如上游仓库 owner/repo)，只与同一网络的镜像共享对象
+        """
+        mirror = self.mirror_path(repo_url)
+
+        if mirror.exists() and not self._is_valid_mirror(mirror):
+            print(f"⚠️ 镜像已损坏，重新克隆: {mirror.name}")
+            shutil.rmtree(mirror, ignore_errors=True)
+
+        if mirror.exists():
+            print(f"🔄 增量更新镜像: {mirror.name}")
+            # 新的孤立分支可能带来新的根提交
+            (mirror / ROOTS_FILE).unlink(missing_ok=True)
+            fetch_args = ["fetch", "--prune", "--quiet", "origin"]
+            # 完整镜像已包含全部历史，无需再降级为浅克隆
+            if depth and (mirror / "shallow").exists():
+                fetch_args += ["--depth", str(depth)]
+            run_git(fetch_args, cwd=mirror)
+        else:
+            print(f"📥 创建仓库镜像: {mirror.name}")
+            clone_args = ["clone", "--bare", "--quiet"]
+            if depth:
+                clone_args += ["--depth", str(depth)]
+            if blob_limit:
+                clone_args += [f"--filter=blob:limit={blob_limit}"]
+            # 只有完整克隆可以安全地依赖其他镜像的对象
+            candidates = (
+                self._alternate_candidates(mirror, network)
+                if self.share_objects and network and not depth and not blob_limit
+                else []
+            )
+            for candidate in candidates:
+                clone_args += ["--reference", str(candidate)]
+            run_git([*clone_args, repo_url, str(mirror)])
+            if candidates:
+                self._link_alternates(mirror, candidates)
+            # 裸克隆默认不带fetch refspec，显式跟踪分支和标签以支持后续增量更新
+            run_git(
+                ["config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*"],
+                cwd=mirror,
+            )
+            run_git(
+                ["config", "--add", "remote.origin.fetch", "+refs/tags/*:refs/tags/*"],
+                cwd=mirror,
+            )
+
+        if network:
+            (mirror / NETWORK_FILE).write_text(network)
+        self._touch(mirror)
+        self.evict(keep=mirror)
+        return mirror
+
+    def is_partial(self, mirror: Path) -> bool:
+        """镜像是否为部分克隆(存在延迟获取的对象)"""
+        try:
+            return (
+                run_git(
+                    ["config", "--get", "remote.origin.promisor"], cwd=mirror
+                ).strip()
+                == "true"
+            )
+        except RuntimeError:
+            return False
+
+    def checkout(self, mirror: Path, dest: Path, ref: str = "HEAD") -> Path:
+        """从镜像创建分离HEAD的worktree检出"""
+        self.remove_checkout(mirror, dest)
+        run_git(
+            ["worktree", "add", "--detach", "--force", "--quiet", str(dest), ref],
+            cwd=mirror,
+        )
+        return dest
+
+    def list_tree(self, mirror: Path, ref: str = "HEAD") -> List[Tuple[str, str]]:
+        """列出提交中的所有文件，返回 (blob对象ID, 相对路径) 列表"""
+        entries = []
+        for line in run_git(["ls-tree", "-r", "-z", ref], cwd=mirror).split("\0"):
+            if not line:
+                continue
+            meta, rel_path = line.split("\t", 1)
+            _, obj_type, oid = meta.split()
+            # 子模块(gitlink)不是本仓库的文件
+            if obj_type == "blob":
+                entries.append((oid, rel_path))
+        return entries
+
+    def missing_objects(self, mirror: Path, ref: str = "HEAD") -> Set[str]:
+        """部分克隆中提交所需、本地尚未获取的对象"""
+        return {
+            line[1:].split()[0]
+            for line in run_git(
+                ["rev-list", "--objects", "--missing=print", "--no-walk", ref],
+                cwd=mirror,
+            ).splitlines()
+            if line.startswith("?")
+        }
+
+    def blob_sizes(self, mirror: Path, oids: List[str]) -> List[int]:
+        """批量查询本地已有blob的大小；缺失的对象会触发部分克隆的按需获取，需先排除"""
+        if not oids:
+            return []
+        output = run_git(
+            ["cat-file", "--batch-check=%(objectsize)"],
+            cwd=mirror,
+            input_text="\n".join(oids) + "\n",
+        )
+        return [int(size) for size in output.split()]
+
+    def partial_checkout(
+        self, mirror: Path, dest: Path, ref: str = "HEAD"
+    ) -> List[str]:
+        """仅检出本地已有blob的文件，返回延迟获取的文件路径列表
+
+        部分克隆的普通检出会一次性拉取所有缺失blob，这里先创建空worktree，
+        再只写出对象库中已存在的文件。
+        """
+        self._add_empty_worktree(mirror, dest, ref)
+
+        missing_oids = self.missing_objects(mirror, ref)
+        present, missing = [], []
+        for oid, rel_path in self.list_tree(mirror, ref):
+            (missing if oid in missing_oids else present).append(rel_path)
+
+        if present:
+            run_git(
+                ["checkout", ref, "--pathspec-from-file=-", "--pathspec-file-nul"],
+                cwd=dest,
+                input_text="\0".join(present),
+            )
+        return missing
+
+    def sparse_checkout(
+        self, mirror: Path, dest: Path, directories: Iterable[str], ref: str = "HEAD"
+    ) -> None:
+        """以cone模式稀疏检出：根目录文件 + 指定目录"""
+        self._add_empty_worktree(mirror, dest, ref)
+        run_git(
+            ["sparse-checkout", "set", "--cone", "--stdin"],
+            cwd=dest,
+            input_text="\n".join(sorted(directories)),
+        )
+        run_git(["read-tree", "-mu", ref], cwd=dest)
+
+    def _add_empty_worktree(self, mirror: Path, dest: Path, ref: str) -> None:
+        """创建未检出任何文件的worktree"""
+        self.remove_checkout(mirror, dest)
+        run_git(
+            [
+                "worktree",
+                "add",
+                "--detach",
+                "--force",
+                "--no-checkout",
+                "--quiet",
+                str(dest),
+                ref,
+            ],
+            cwd=mirror,
+        )
+
+    def checkout_valid(self, dest: Path) -> bool:
+        """检出的 .git 文件指向的镜像worktree记录是否仍存在
+
+        镜像被淘汰后，原有worktree检出不再是有效的Git仓库。
+        """
+        git_file = dest / ".git"
+        if git_file.is_dir():
+            return True
+        try:
+            content = git_file.read_text()
+        except OSError:
+            return False
+        if not content.startswith("gitdir:"):
+            return False
+        gitdir = Path(content[len("gitdir:") :].strip())
+        if not gitdir.is_absolute():
+            gitdir = dest / gitdir
+        return gitdir.is_dir()
+
+    def worktrees(self, mirror: Path) -> List[Path]:
+        """镜像上登记的worktree检出目录(已清理失效记录)"""
+        run_git(["worktree", "prune"], cwd=mirror)
+        output = run_git(["worktree", "list", "--porcelain"], cwd=mirror)
+        paths = [
+            Path(line[len("worktree ") :])
+            for line in output.splitlines()
+            if line.startswith("worktree ")
+        ]
+        bare = mirror.resolve()
+        return [path for path in paths if path.resolve() != bare]
+
+    def _has_active_worktrees(self, mirror: Path) -> bool:
+        """镜像是否还有正在使用的worktree检出"""
+        worktrees = self.worktrees(mirror)
+        if self.in_use is None:
+            return bool(worktrees)
+        return any(self.in_use(path) for path in worktrees)
+
+    def remove_checkout(self, mirror: Path, dest: Path) -> None:
+        """删除已有检出并清理镜像中的worktree记录"""
+        if dest.exists():
+            shutil.rmtree(dest)
+        if mirror.exists():
+            run_git(["worktree", "prune"], cwd=mirror)
+
+    def evict(self, keep: Optional[Path] = None) -> List[Path]:
+        """超出磁盘配额时按LRU淘汰镜像"""
+        mirrors = [p for p in self.root.glob("*.git") if p.is_dir()]
+        sizes = {mirror: directory_size(mirror) for mirror in mirrors}
+        total = sum(sizes.values())
+
+        evicted = []
+        for mirror in sorted(mirrors, key=self._last_used):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and mirror == keep:
+                continue
+            # 其他进程正在使用的镜像、仍有租用中worktree的镜像不淘汰
+            with self.lock(mirror, blocking=False) as acquired:
+                if not acquired or self._has_active_worktrees(mirror):
+                    continue
+                if not self._dissociate_dependents(mirror):
+                    continue
+                shutil.rmtree(mirror, ignore_errors=True)
+            total -= sizes[mirror]
+            evicted.append(mirror)
+            print(f"🧹 淘汰镜像: {mirror.name} ({sizes[mirror] // (1024 * 1024)} MB)")
+
+        return evicted
+
+    def alternates(self, mirror: Path) -> List[Path]:
+        """镜像通过alternates借用的对象库目录"""
+        try:
+            lines = self._alternates_file(mirror).read_text().splitlines()
+        except OSError:
+            return []
+        return [Path(line) for line in lines if line.strip()]
+
+    def roots(self, mirror: Path) -> Set[str]:
+        """镜像中所有分支和标签的根提交，首次计算后缓存"""
+        roots_file = mirror / ROOTS_FILE
+        try:
+            return set(roots_file.read_text().split())
+        except OSError:
+            pass
+        roots = set(
+            run_git(["rev-list", "--max-parents=0", "--all"], cwd=mirror).split()
+        )
+        roots_file.write_text("\n".join(sorted(roots)))
+        return roots
+
+    def network(self, mirror: Path) -> Optional[str]:
+        """镜像所属的fork网络，未记录时返回None"""
+        try:
+            return (mirror / NETWORK_FILE).read_text().strip() or None
+        except OSError:
+            return None
+
+    def _alternate_candidates(self, mirror: Path, network: str) -> List[Path]:
+        """可作为对象来源的镜像：同一fork网络中的完整克隆，且自身不依赖其他镜像
+
+        克隆前只按记录的网络标识筛选，不对缓存中的每个镜像做git探测，
+        也不把无关镜像作为 --reference 传给git。
+        """
+        candidates = []
+        for other in sorted(self.root.glob("*.git")):
+            if (
+                other == mirror
+                or self.network(other) != network
+                or not self._is_valid_mirror(other)
+                or (other / "shallow").exists()
+                or self.is_partial(other)
+                or self.alternates(other)
+            ):
+                continue
+            candidates.append(other)
+        return candidates
+
+    def _link_alternates(self, mirror: Path, candidates: List[Path]) -> None:
+        """仅保留与新镜像共享根提交的alternates
+
+        没有共同根提交就不可能有共同提交，fetch协商时这些镜像不会让服务端省略任何对象，
+        因此移除它们是安全的。
+        """
+        mirror_roots = self.roots(mirror)
+        linked = [c for c in candidates if self.roots(c) & mirror_roots]
+        alternates_file = self._alternates_file(mirror)
+        if not linked:
+            alternates_file.unlink(missing_ok=True)
+            return
+
+        alternates_file.write_text(
+            "".join(f"{(c / 'objects').resolve()}\n" for c in linked)
+        )
+        for upstream in linked:
+            # 被依赖的镜像不得清理不可达对象，否则派生镜像可能丢失对象
+            run_git(["config", "gc.pruneExpire", "never"], cwd=upstream)
+            print(f"🔗 共享上游对象库: {mirror.name} -> {upstream.name}")
+
+    def _dissociate_dependents(self, mirror: Path) -> bool:
+        """淘汰前让依赖该镜像的派生镜像复制所需对象并解除alternates
+
+        返回是否已无依赖；依赖方正被其他进程使用时返回False，本次不淘汰该镜像。
+        """
+        objects_dir = (mirror / "objects").resolve()
+        for other in self.root.glob("*.git"):
+            if other == mirror or objects_dir not in self.alternates(other):
+                continue
+            with self.lock(other, blocking=False) as acquired:
+                if not acquired:
+                    return False
+                # 不带 -l 的完整重打包会把借用的对象复制进本地包
+                run_git(["repack", "-a", "-d", "-q"], cwd=other)
+                remaining = [p for p in self.alternates(other) if p != objects_dir]
+                alternates_file = self._alternates_file(other)
+                if remaining:
+                    alternates_file.write_text("".join(f"{p}\n" for p in remaining))
+                else:
+                    alternates_file.unlink(missing_ok=True)
+                print(f"🔓 解除对象库共享: {other.name}")
+        return True
+
+    def _alternates_file(self, mirror: Path) -> Path:
+        return mirror / "objects" / "info" / "alternates"
+
+    def _is_valid_mirror(self, mirror: Path) -> bool:
+        """检查镜像目录是否为可用的裸仓库"""
+        try:
+            run_git(["rev-parse", "--is-bare-repository"], cwd=mirror)
+            return True
+        except RuntimeError:
+            return False
+
+    def _touch(self, mirror: Path) -> None:
+        """记录镜像最近使用时间"""
+        (mirror / LAST_USED_FILE).write_text(str(time.time()))
+
+    def _last_used(self, mirror: Path) -> float:
+        """读取镜像最近使用时间"""
+        try:
+            return float((mirror / LAST_USED_FILE).read_text())
+        except (OSError, ValueError):
+            return 0.0
@@ -0,0 +1,521 @@
+"""仓库虚拟文件系统 - 分析器通过统一接口读取工作区或Git对象库中的文件
+
+路径一律为相对仓库根目录的POSIX路径，根目录为空字符串。
+"""
+
+import os
+import stat
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .repo_cache import run_git
+from .repo_workspace import (
+    compile_path_pattern,
+    ensure_local_file,
+    get_workspace,
+    parent_dir,
+    parse_size,
+)
+from .text_decoder import MAX_CHAR_BYTES, SNIFF_BYTES, decode_prefix, detect_encoding
+
+
+class RepoEntry:
+    """目录项"""
+
+    def __init__(
+        self,
+        path: str,
+        is_dir: bool,
+        size: int = 0,
+        executable: bool = False,
+        mode: int = 0,
+    ):
+        self.path = path
+        self.name = path.rsplit("/", 1)[-1]
+        self.is_dir = is_dir
+        # 文件字节数；尚未获取的文件为其大小下限
+        self.size = size
+        self.executable = executable
+        # st_mode风格的文件模式，未知时按普通文件/目录推断
+        self.mode = mode or (
+            stat.S_IFDIR | 0o755
+            if is_dir
+            else stat.S_IFREG | (0o755 if executable else 0o644)
+        )
+
+
+class RepoFS:
+    """只读仓库文件系统接口"""
+
+    name = ""
+    # 首次查询时构建的文件清单(RepoIndex)，见 repo_index.get_repo_index
+    index = None
+    # 是否只包含提交中已跟踪的文件；否则构建清单时按.gitignore过滤
+    tracked_only = False
+    # 首次查询时解析的依赖图(DependencyGraph)，见 manifests.get_dependency_graph
+    dependency_graph = None
+    # 首次查询时读取的提交历史统计(GitHistory)，见 git_history.get_git_history
+    git_history = None
+    # 按树ID复用目录记录的持久缓存(IndexCache)，None表示不使用
+    index_cache = None
+    # 同一次分析中各分析器共享的文本内容缓存(ContentCache)，None表示不使用
+    content_cache = None
+    # 内容缓存键的命名空间，区分不同工作区和版本
+    content_scope = ""
+
+    def entry(self, rel_path: str) -> Optional[RepoEntry]:
+        """查询单个路径，不存在时返回None"""
+        raise NotImplementedError
+
+    def list_dir(self, rel_path: str = "") -> List[RepoEntry]:
+        """列出目录的直接子项，按名称排序"""
+        raise NotImplementedError
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        """读取文件内容，不存在时抛出FileNotFoundError"""
+        raise NotImplementedError
+
+    def read_prefix(self, rel_path: str, size: int) -> bytes:
+        """读取文件开头最多size字节，不存在时抛出FileNotFoundError"""
+        return self.read_bytes(rel_path)[:size]
+
+    def exists(self, rel_path: str) -> bool:
+        return self.entry(rel_path) is not None
+
+    def is_file(self, rel_path: str) -> bool:
+        entry = self.entry(rel_path)
+        return entry is not None and not entry.is_dir
+
+    def is_dir(self, rel_path: str) -> bool:
+        entry = self.entry(rel_path)
+        return entry is not None and entry.is_dir
+
+    def gitlink(self, rel_path: str) -> Optional[str]:
+        """子模块路径记录的提交ID，非子模块返回None"""
+        return None
+
+    def is_fetched(self, rel_path: str) -> bool:
+        """文件内容是否已在本地，读取时不会触发下载"""
+        return self.is_file(rel_path)
+
+    def dir_fetched(self, rel_path: str) -> bool:
+        """目录的直接文件是否都已在本地(大小均为实际值而非下限)"""
+        return True
+
+    def tree_ids(self) -> Dict[str, str]:
+        """各目录对应的Git树对象ID(根目录为空字符串)，内容不与提交一致时返回空"""
+        return {}
+
+    def encoding(self, rel_path: str) -> Optional[str]:
+        """文件的文本编码，按开头字节识别一次并缓存；二进制或无法读取时返回None"""
+        if rel_path not in self._encodings:
+            try:
+                self._sniff(rel_path)
+            except OSError:
+                return None
+        return self._encodings[rel_path]
+
+    def read_text(self, rel_path: str, limit: Optional[int] = None) -> Optional[str]:
+        """读取文本文件并按识别出的编码解码；二进制文件只读取开头，返回None
+
+        开头之后出现非法UTF-8字节时回退latin-1，并更新缓存的编码。
+        设置了content_cache时，完整的解码结果在各分析器之间共享。
+
+        Args:
+            limit: 最多返回的字符数，只读取所需的开头字节
+        """
+        if self.content_cache is None:
+            return self._decode_file(rel_path, limit)
+        key = (self.content_scope, rel_path)
+        text = self.content_cache.get(key)
+        if text is not None:
+            return text if limit is None else text[:limit]
+        text = self._decode_file(rel_path, limit)
+        # 只读取了开头的内容不放入缓存
+        if text is not None and limit is None:
+            self.content_cache.put(key, text)
+        return text
+
+    def _decode_file(self, rel_path: str, limit: Optional[int]) -> Optional[str]:
+        try:
+            if rel_path in self._encodings:
+                encoding, data, complete = self._encodings[rel_path], b"", False
+            else:
+                encoding, data, complete = self._sniff(rel_path)
+            if encoding is None:
+                return None
+            if not complete and limit is None:
+                data, complete = self.read_bytes(rel_path), True
+            elif not complete:
+                # 留出BOM的字节；读满时文件可能更长，判定时读取的开头足够则直接使用
+                wanted = limit * MAX_CHAR_BYTES + MAX_CHAR_BYTES
+                if len(data) < wanted:
+                    data = self.read_prefix(rel_path, wanted)
+                    complete = len(data) < wanted
+        except OSError:
+            return None
+        try:
+            text = decode_prefix(data, encoding, complete)
+        except UnicodeDecodeError:
+            self._encodings[rel_path] = "latin-1"
+            text = data.decode("latin-1")
+        return text if limit is None else text[:limit]
+
+    def _sniff(self, rel_path: str) -> Tuple[Optional[str], bytes, bool]:
+        """识别并缓存编码
+
+        Returns:
+            (编码, 读取的开头, 开头是否即完整内容)
+        """
+        prefix = self.read_prefix(rel_path, SNIFF_BYTES + 1)
+        complete = len(prefix) <= SNIFF_BYTES
+        encoding = detect_encoding(prefix[:SNIFF_BYTES], complete=complete)
+        self._encodings[rel_path] = encoding
+        return encoding, prefix, complete
+
+    def walk(
+        self, rel_path: str = ""
+    ) -> Iterator[Tuple[str, List[RepoEntry], List[RepoEntry]]]:
+        """类似os.walk的自顶向下遍历，原地修改目录列表可剪枝"""
+        entries = self.list_dir(rel_path)
+        dirs = [entry for entry in entries if entry.is_dir]
+        files = [entry for entry in entries if not entry.is_dir]
+        yield rel_path, dirs, files
+        for directory in dirs:
+            yield from self.walk(directory.path)
+
+    def rglob(self, pattern: str) -> Iterator[RepoEntry]:
+        """递归查找匹配通配符的文件，语义同Path.rglob"""
+        matcher = compile_path_pattern(f"**/{pattern}")
+        for _, _, files in self.walk():
+            for entry in files:
+                if matcher.match(entry.path):
+                    yield entry
+
+    def close(self) -> None:
+        """释放底层资源"""
+
+
+class LocalRepoFS(RepoFS):
+    """磁盘上的工作区；延迟获取的文件同样可见，读取时按需补全"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.name = self.root.name
+        self.content_scope = str(self.root)
+        # 尚未落盘的文件及其上级目录，按父目录索引
+        self._missing: Dict[str, Dict[str, RepoEntry]] = {}
+        # 各文件识别出的文本编码，二进制文件为None
+        self._encodings: Dict[str, Optional[str]] = {}
+        workspace = get_workspace(self.root)
+        if workspace is not None:
+            self.tracked_only = workspace.tracked_only
+            self.index_cache = workspace.index_cache
+            self.content_cache = workspace.content_cache
+            for rel_path in workspace.missing_paths:
+                self._add_missing(
+                    rel_path,
+                    workspace.missing_sizes.get(rel_path, workspace.missing_size_floor),
+                )
+
+    def entry(self, rel_path: str) -> Optional[RepoEntry]:
+        path = self.root / rel_path
+        try:
+            st = path.stat()
+        except OSError:
+            return self._missing.get(parent_dir(rel_path), {}).get(
+                rel_path.rsplit("/", 1)[-1]
+            )
+        return self._make_entry(rel_path, st)
+
+    def list_dir(self, rel_path: str = "") -> List[RepoEntry]:
+        entries = dict(self._missing.get(rel_path, {}))
+        try:
+            with os.scandir(self.root / rel_path) as items:
+                for item in items:
+                    child = f"{rel_path}/{item.name}" if rel_path else item.name
+                    try:
+                        st = item.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries[item.name] = self._make_entry(child, st)
+        except OSError:
+            pass
+        return [entries[name] for name in sorted(entries)]
+
+    def gitlink(self, rel_path: str) -> Optional[str]:
+        try:
+            line = run_git(["ls-tree", "-z", "HEAD", "--", rel_path], cwd=self.root)
+        except RuntimeError:
+            return None
+        meta = line.split("\t", 1)[0].split()
+        return meta[2] if len(meta) == 3 and meta[1] == "commit" else None
+
+    def is_fetched(self, rel_path: str) -> bool:
+        return (self.root / rel_path).is_file()
+
+    def dir_fetched(self, rel_path: str) -> bool:
+        return not any(
+            not entry.is_dir for entry in self._missing.get(rel_path, {}).values()
+        )
+
+    def tree_ids(self) -> Dict[str, str]:
+        # 只有本工具创建的检出与HEAD一致；没有.git时不能向上查找外层仓库
+        if not self.tracked_only or not (self.root / ".git").exists():
+            return {}
+        try:
+            ids = {"": run_git(["rev-parse", "HEAD^{tree}"], cwd=self.root).strip()}
+            listing = run_git(["ls-tree", "-r", "-d", "-z", "HEAD"], cwd=self.root)
+        except RuntimeError:
+            return {}
+        for line in listing.split("\0"):
+            if line:
+                meta, rel_path = line.split("\t", 1)
+                ids[rel_path] = meta.split()[2]
+        return ids
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        path = self.root / rel_path
+        if not ensure_local_file(self.root, path):
+            raise FileNotFoundError(rel_path)
+        return path.read_bytes()
+
+    def read_prefix(self, rel_path: str, size: int) -> bytes:
+        path = self.root / rel_path
+        if not ensure_local_file(self.root, path):
+            raise FileNotFoundError(rel_path)
+        with open(path, "rb") as f:
+            return f.read(size)
+
+    def _make_entry(self, rel_path: str, st: os.stat_result) -> RepoEntry:
+        # 符号链接与git一致视为文件，遍历时不会跟随进入目录
+        is_dir = stat.S_ISDIR(st.st_mode)
+        return RepoEntry(
+            rel_path,
+            is_dir,
+            0 if is_dir else st.st_size,
+            not is_dir and bool(st.st_mode & 0o111),
+            st.st_mode,
+        )
+
+    def _add_missing(self, rel_path: str, size: int) -> None:
+        self._missing.setdefault(parent_dir(rel_path), {})[
+            rel_path.rsplit("/", 1)[-1]
+        ] = RepoEntry(rel_path, False, size)
+        directory = parent_dir(rel_path)
+        while directory:
+            siblings = self._missing.setdefault(parent_dir(directory), {})
+            name = directory.rsplit("/", 1)[-1]
+            if name in siblings:
+                break
+            siblings[name] = RepoEntry(directory, True)
+            directory = parent_dir(directory)
+
+
+class CatFileBatch:
+    """常驻的 git cat-file --batch 进程，逐个读取对象而无需每次启动git"""
+
+    def __init__(self, git_dir: Path):
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=str(git_dir),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._lock = threading.Lock()
+
+    def read(self, oid: str, limit: Optional[int] = None) -> bytes:
+        """读取对象内容，对象不存在时抛出FileNotFoundError
+
+        Args:
+            limit: 只返回开头的字节数，其余内容分块丢弃而不整体驻留内存
+        """
+        with self._lock:
+            self._process.stdin.write(f"{oid}\n".encode())
+            self._process.stdin.flush()
+            header = self._process.stdout.readline().decode().split()
+            if len(header) != 3:
+                raise FileNotFoundError(oid)
+            size = int(header[2])
+            data = self._process.stdout.read(
+                size if limit is None else min(size, limit)
+            )
+            remaining = size - len(data)
+            while remaining > 0:
+                chunk = self._process.stdout.read(min(remaining, 1 << 20))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+            # 每个对象内容后跟一个换行符
+            self._process.stdout.read(1)
+            return data
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+
+
+class GitObjectFS(RepoFS):
+    """直接读取对象库中某个提交的文件树，不需要检出工作区"""
+
+    tracked_only = True
+
+    def __init__(self, git_dir: Path, ref: str = "HEAD"):
+        self.git_dir = Path(git_dir)
+        self.commit = run_git(
+            ["rev-parse", f"{ref}^{{commit}}"], cwd=self.git_dir
+        ).strip()
+        self.name = self.git_dir.name.removesuffix(".git") or self.git_dir.name
+        self.content_scope = f"{self.git_dir}@{self.commit}"
+        self._entries: Dict[str, RepoEntry] = {}
+        self._children: Dict[str, List[str]] = {"": []}
+        self._oids: Dict[str, str] = {}
+        self._gitlinks: Dict[str, str] = {}
+        # 部分克隆中尚未获取的文件
+        self._unfetched: set = set()
+        self._unfetched_dirs: set = set()
+        self._encodings: Dict[str, Optional[str]] = {}
+        self._root_tree = run_git(
+            ["rev-parse", f"{self.commit}^{{tree}}"], cwd=self.git_dir
+        ).strip()
+        self._reader: Optional[CatFileBatch] = None
+        self._reader_lock = threading.Lock()
+        self._load_tree()
+
+    def entry(self, rel_path: str) -> Optional[RepoEntry]:
+        if rel_path == "":
+            return RepoEntry("", True)
+        return self._entries.get(rel_path)
+
+    def list_dir(self, rel_path: str = "") -> List[RepoEntry]:
+        return [
+            self._entries[child]
+            for child in sorted(
+                self._children.get(rel_path, []), key=lambda p: p.rsplit("/", 1)[-1]
+            )
+        ]
+
+    def gitlink(self, rel_path: str) -> Optional[str]:
+        return self._gitlinks.get(rel_path)
+
+    def is_fetched(self, rel_path: str) -> bool:
+        return self.is_file(rel_path) and rel_path not in self._unfetched
+
+    def dir_fetched(self, rel_path: str) -> bool:
+        return rel_path not in self._unfetched_dirs
+
+    def tree_ids(self) -> Dict[str, str]:
+        ids = {"": self._root_tree}
+        for rel_path, entry in self._entries.items():
+            if entry.is_dir and rel_path not in self._gitlinks:
+                ids[rel_path] = self._oids[rel_path]
+        return ids
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        entry = self._entries.get(rel_path)
+        if entry is None or entry.is_dir:
+            raise FileNotFoundError(rel_path)
+        return self._batch().read(self._oids[rel_path])
+
+    def read_prefix(self, rel_path: str, size: int) -> bytes:
+        entry = self._entries.get(rel_path)
+        if entry is None or entry.is_dir:
+            raise FileNotFoundError(rel_path)
+        return self._batch().read(self._oids[rel_path], size)
+
+    def _batch(self) -> CatFileBatch:
+        with self._reader_lock:
+            if self._reader is None:
+                self._reader = CatFileBatch(self.git_dir)
+            return self._reader
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _load_tree(self) -> None:
+        """一次性读取整棵树；部分克隆中缺失的blob不查询大小，避免触发下载"""
+        blobs = []
+        for line in run_git(
+            ["ls-tree", "-r", "-t", "-z", self.commit], cwd=self.git_dir
+        ).split("\0"):
+            if not line:
+                continue
+            meta, rel_path = line.split("\t", 1)
+            mode, obj_type, oid = meta.split()
+            # 子模块(gitlink)在检出中表现为空目录
+            is_dir = obj_type != "blob"
+            if obj_type == "commit":
+                self._gitlinks[rel_path] = oid
+            self._entries[rel_path] = RepoEntry(
+                rel_path,
+                is_dir,
+                executable=mode == "100755",
+                mode=stat.S_IFDIR | 0o755 if is_dir else int(mode, 8),
+            )
+            self._oids[rel_path] = oid
+            self._children.setdefault(parent_dir(rel_path), []).append(rel_path)
+            if is_dir:
+                self._children.setdefault(rel_path, [])
+            else:
+                blobs.append(rel_path)
+
+        missing = self._missing_oids()
+        present = [rel for rel in blobs if self._oids[rel] not in missing]
+        if present:
+            output = run_git(
+                ["cat-file", "--batch-check=%(objectsize)"],
+                cwd=self.git_dir,
+                input_text="\n".join(self._oids[rel] for rel in present) + "\n",
+            )
+            for rel_path, size in zip(present, output.split()):
+                self._entries[rel_path].size = int(size)
+
+        floor = self._missing_size_floor() if missing else 0
+        for rel_path in blobs:
+            if self._oids[rel_path] in missing:
+                self._entries[rel_path].size = floor
+                self._unfetched.add(rel_path)
+                self._unfetched_dirs.add(parent_dir(rel_path))
+
+    def _missing_oids(self) -> set:
+        """部分克隆中本地尚未获取的对象"""
+        try:
+            promisor = run_git(
+                ["config", "--get", "remote.origin.promisor"], cwd=self.git_dir
+            )
+        except RuntimeError:
+            return set()
+        if promisor.strip() != "true":
+            return set()
+        return {
+            line[1:].split()[0]
+            for line in run_git(
+                ["rev-list", "--objects", "--missing=print", "--no-walk", self.commit],
+                cwd=self.git_dir,
+            ).splitlines()
+            if line.startswith("?")
+        }
+
+    def _missing_size_floor(self) -> int:
+        """由部分克隆过滤规则(blob:limit=N)推断缺失blob的大小下限"""
+        try:
+            spec = run_git(
+                ["config", "--get", "remote.origin.partialclonefilter"],
+                cwd=self.git_dir,
+            ).strip()
+            return parse_size(spec.split("=", 1)[1])
+        except (RuntimeError, IndexError, ValueError):
+            return 0
+
+
+def open_repo_fs(repo: Union[Path, str, RepoFS]) -> RepoFS:
+    """将仓库路径或已有文件系统统一为RepoFS"""
+    if isinstance(repo, RepoFS):
+        return repo
+    return LocalRepoFS(Path(repo))
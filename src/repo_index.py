@@ -0,0 +1,450 @@
+"""仓库文件清单 - 一次遍历得到全部文件的路径、大小、模式、扩展名和深度，供各分析器查询
+
+清单构建后不可变；工作区内容按提交固定，登记过的工作区只遍历一次。
+"""
+
+import os
+import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .config import config_manager
+from .index_cache import IndexCache
+from .repo_fs import LocalRepoFS, RepoFS, open_repo_fs
+from .repo_workspace import (
+    compile_path_pattern,
+    file_extension,
+    get_workspace,
+    parent_dir,
+    translate_path_pattern,
+)
+from .walk_rules import WalkRules
+
+
+class IndexedFile(NamedTuple):
+    """清单中的文件"""
+
+    path: str
+    # 字节数；尚未获取的文件为其大小下限
+    size: int
+    # git风格的文件模式(0o100644、0o100755、0o120000)，与检出方式和umask无关
+    mode: int
+    # 含点号、保留大小写的扩展名(如 ".R")，无扩展名时为空字符串
+    extension: str
+    # 所在目录层级，根目录文件为0
+    depth: int
+
+    is_dir = False
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self) -> str:
+        return parent_dir(self.path)
+
+    @property
+    def executable(self) -> bool:
+        return bool(self.mode & 0o111)
+
+
+def git_mode(mode: int) -> int:
+    """将st_mode或git树中的模式规范化为git的文件模式"""
+    if stat.S_ISLNK(mode):
+        return 0o120000
+    return 0o100755 if mode & 0o111 else 0o100644
+
+
+class IndexedDir(NamedTuple):
+    """清单中的目录"""
+
+    path: str
+    depth: int
+
+    is_dir = True
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+
+class PatternClassifier:
+    """多模式路径分类器：全部模式编译为一个正则，一次匹配得到首个命中的模式
+
+    模式语义同 compile_path_pattern；模式均不含"/"时只需匹配文件名。
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self.by_name = all("/" not in p for p in self.patterns)
+        alternatives = [
+            translate_path_pattern(p if self.by_name or "/" in p else f"**/{p}")
+            for p in self.patterns
+        ]
+        # 正则按顺序尝试各分支，命中的捕获组序号即模式优先级
+        self._regex = re.compile("|".join(f"({a})\\Z" for a in alternatives))
+
+    def classify(self, rel_path: str) -> Optional[int]:
+        """返回首个匹配模式的序号，均不匹配时返回None"""
+        target = rel_path.rsplit("/", 1)[-1] if self.by_name else rel_path
+        match = self._regex.match(target)
+        return match.lastindex - 1 if match else None
+
+
+class RepoIndex:
+    """不可变的仓库文件清单"""
+
+    def __init__(
+        self,
+        files: Iterable[IndexedFile],
+        dirs: Iterable[IndexedDir],
+        pruned: Optional[Dict[str, str]] = None,
+        truncated: bool = False,
+    ):
+        self.files: Tuple[IndexedFile, ...] = tuple(files)
+        self.dirs: Tuple[IndexedDir, ...] = tuple(dirs)
+        # 被剪枝的目录及原因(vendored、generated、data)，其内容不在清单中
+        self.pruned: Dict[str, str] = dict(pruned or {})
+        # 是否因超出预算而提前停止遍历
+        self.truncated = truncated
+        self._files = {f.path: f for f in self.files}
+        self._dirs = {d.path: d for d in self.dirs}
+        self._dirs.setdefault("", IndexedDir("", 0))
+
+        # 文件和目录均按路径有序，同一目录下的子项只有两者混合时才需重新排序
+        subdirs: Dict[str, list] = {}
+        children: Dict[str, list] = {}
+        extensions: Dict[str, list] = {}
+        for item in self.dirs:
+            if item.path:
+                subdirs.setdefault(parent_dir(item.path), []).append(item)
+        for item in self.files:
+            slash = item.path.rfind("/")
+            children.setdefault(item.path[:slash] if slash > 0 else "", []).append(item)
+            extensions.setdefault(item.extension, []).append(item)
+        for path, items in subdirs.items():
+            entries = children.get(path)
+            children[path] = (
+                sorted(items + entries, key=lambda e: e.name) if entries else items
+            )
+        self._children = {path: tuple(items) for path, items in children.items()}
+        self._extensions = {ext: tuple(items) for ext, items in extensions.items()}
+        # 各目录中按casefold后文件名索引的文件，首次查询该目录时建立
+        self._casefolded: Dict[str, Dict[str, IndexedFile]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        repo_fs: RepoFS,
+        max_files: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        workers: int = 1,
+        cache: Optional[IndexCache] = None,
+    ) -> "RepoIndex":
+        """遍历一次仓库并按规则剪枝；.git目录本身列入清单但不进入，.git文件不列入
+
+        根目录之下的各子树在线程池中并行遍历(scandir执行期间释放GIL)，
+        结果按路径合并，与线程调度无关。被剪枝的第三方、生成和数据目录本身保留在清单中，
+        其内容不计入。超出文件数或字节数预算时，按(深度, 路径)保留较浅的文件。
+
+        提供cache且文件系统能给出Git树ID时，树ID未变的目录直接复用缓存的记录，
+        只有变化的子树会重新列目录和判定规则。
+        """
+        rules = WalkRules(honour_gitignore=not repo_fs.tracked_only)
+        tree_ids = repo_fs.tree_ids() if cache is not None else {}
+        if not tree_ids:
+            cache = None
+        root = _SubtreeWalk(repo_fs, rules, max_files, max_bytes, cache, tree_ids)
+        subtrees = root.visit("")
+
+        def walk_subtree(rel_path: str) -> _SubtreeWalk:
+            walk = _SubtreeWalk(
+                repo_fs, rules.fork(), max_files, max_bytes, cache, tree_ids
+            )
+            walk.run([rel_path])
+            return walk
+
+        if workers > 1 and len(subtrees) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(subtrees))) as pool:
+                walks = [root] + list(pool.map(walk_subtree, subtrees))
+        else:
+            walks = [root] + [walk_subtree(rel_path) for rel_path in subtrees]
+
+        files = [f for walk in walks for f in walk.files]
+        truncated = any(walk.stopped for walk in walks)
+        if (max_files is not None and len(files) > max_files) or (
+            max_bytes is not None
+            and sum(walk.total_bytes for walk in walks) > max_bytes
+        ):
+            # 各子树独立遍历完整的层级，合并后按(深度, 路径)截断即与串行遍历一致
+            candidates = sorted(files, key=lambda f: (f.depth, f.path))
+            files, total_bytes = [], 0
+            for item in candidates:
+                if (max_files is not None and len(files) >= max_files) or (
+                    max_bytes is not None and total_bytes + item.size > max_bytes
+                ):
+                    truncated = True
+                    break
+                files.append(item)
+                total_bytes += item.size
+
+        if cache is not None:
+            reused = sum(len(walk.used_keys) for walk in walks)
+            cache.update(
+                {key: rec for walk in walks for key, rec in walk.records.items()},
+                [key for walk in walks for key in walk.used_keys],
+            )
+            if reused:
+                print(f"♻️ 文件清单复用 {reused} 个未变化目录的缓存记录")
+
+        pruned = {
+            path: reason for walk in walks for path, reason in walk.pruned.items()
+        }
+        if pruned:
+            print(f"✂️ 文件清单跳过 {len(pruned)} 个第三方/生成/数据目录")
+        if truncated:
+            print(f"⚠️ 文件清单达到预算上限，仅收录 {len(files)} 个文件")
+        return cls(
+            sorted(files),
+            sorted(d for walk in walks for d in walk.dirs),
+            pruned,
+            truncated,
+        )
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def file(self, rel_path: str) -> Optional[IndexedFile]:
+        """查询单个文件，不存在或为目录时返回None"""
+        return self._files.get(rel_path)
+
+    def find(self, rel_path: str) -> Optional[IndexedFile]:
+        """不区分文件名大小写查找文件，大小写完全一致的优先
+
+        同名变体有多个时按名称排序取第一个(大写优先，如 README.md、Readme.md、readme.md)。
+        """
+        item = self._files.get(rel_path)
+        if item is not None:
+            return item
+        directory = parent_dir(rel_path)
+        names = self._casefolded.get(directory)
+        if names is None:
+            names = {}
+            for child in self._children.get(directory, ()):
+                if not child.is_dir:
+                    names.setdefault(child.name.casefold(), child)
+            self._casefolded[directory] = names
+        return names.get(rel_path.rsplit("/", 1)[-1].casefold())
+
+    def exists(self, rel_path: str) -> bool:
+        return rel_path in self._files or rel_path in self._dirs
+
+    def is_file(self, rel_path: str) -> bool:
+        return rel_path in self._files
+
+    def is_dir(self, rel_path: str) -> bool:
+        return rel_path in self._dirs
+
+    def list_dir(
+        self, rel_path: str = ""
+    ) -> Tuple[Union[IndexedFile, IndexedDir], ...]:
+        """目录的直接子项，按名称排序"""
+        return self._children.get(rel_path, ())
+
+    def by_extension(self, *extensions: str) -> List[IndexedFile]:
+        """指定扩展名的全部文件，按路径排序"""
+        matched = [f for ext in extensions for f in self._extensions.get(ext, ())]
+        return sorted(matched) if len(extensions) > 1 else matched
+
+    def iter_files(
+        self, skip_dir: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[IndexedFile]:
+        """按路径顺序遍历文件，skip_dir对目录名返回True时跳过其下全部文件"""
+        for item in self.files:
+            if skip_dir is None or not any(
+                skip_dir(name) for name in item.path.split("/")[:-1]
+            ):
+                yield item
+
+    def classify(
+        self,
+        classifier: PatternClassifier,
+        skip_dir: Optional[Callable[[str], bool]] = None,
+    ) -> Dict[str, List[IndexedFile]]:
+        """一次遍历将文件归入首个匹配的模式，各模式的候选按深度、路径排序
+
+        Returns:
+            模式 -> 候选文件列表，按模式优先级排列且包含全部模式
+        """
+        ranked: Dict[str, List[IndexedFile]] = {p: [] for p in classifier.patterns}
+        for item in self.iter_files(skip_dir):
+            position = classifier.classify(item.path)
+            if position is not None:
+                ranked[classifier.patterns[position]].append(item)
+        for candidates in ranked.values():
+            candidates.sort(key=lambda f: (f.depth, f.path))
+        return ranked
+
+    def glob(self, pattern: str) -> List[IndexedFile]:
+        """匹配通配符的文件，语义同 compile_path_pattern"""
+        matcher = compile_path_pattern(pattern)
+        return [item for item in self.files if matcher.match(item.path)]
+
+
+class _SubtreeWalk:
+    """单个子树的广度优先遍历，逐层进行，超出预算时在当前层结束后停止"""
+
+    def __init__(
+        self,
+        repo_fs: RepoFS,
+        rules: WalkRules,
+        max_files: Optional[int],
+        max_bytes: Optional[int],
+        cache: Optional[IndexCache] = None,
+        tree_ids: Optional[Dict[str, str]] = None,
+    ):
+        self.repo_fs = repo_fs
+        self.rules = rules
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.tree_ids = tree_ids or {}
+        # 本次新生成的目录记录和命中的缓存键，遍历结束后统一写回缓存
+        self.records: Dict[str, dict] = {}
+        self.used_keys: List[str] = []
+        self.files: List[IndexedFile] = []
+        self.dirs: List[IndexedDir] = []
+        self.pruned: Dict[str, str] = {}
+        self.total_bytes = 0
+        # 是否还有未遍历的目录
+        self.stopped = False
+
+    def run(self, level: List[str]) -> None:
+        while level:
+            next_level = []
+            for rel_path in level:
+                next_level.extend(self.visit(rel_path))
+            if (self.max_files is not None and len(self.files) >= self.max_files) or (
+                self.max_bytes is not None and self.total_bytes >= self.max_bytes
+            ):
+                self.stopped = bool(next_level)
+                return
+            level = next_level
+
+    def visit(self, rel_path: str) -> List[str]:
+        """记录目录的直接子项，返回需要继续遍历的子目录"""
+        key = None
+        tree_id = self.tree_ids.get(rel_path)
+        if self.cache is not None and tree_id:
+            key = IndexCache.key(
+                type(self.repo_fs).__name__,
+                rel_path,
+                tree_id,
+                self.rules.fingerprint(rel_path),
+            )
+            record = self.cache.get(key)
+            if record is not None:
+                self.used_keys.append(key)
+                return self._replay(rel_path, record)
+
+        entries = self.repo_fs.list_dir(rel_path)
+        texts = self.rules.load(
+            rel_path, [e.name for e in entries if not e.is_dir], self.repo_fs.read_text
+        )
+        entries = [e for e in entries if not self.rules.is_ignored(e.path, e.is_dir)]
+        record = {
+            "rules": texts,
+            "pruned": self.rules.classify_directory(
+                rel_path, [(e.name, e.size) for e in entries if not e.is_dir]
+            ),
+            "files": [],
+            "dirs": [],
+        }
+        if not record["pruned"]:
+            for entry in entries:
+                if entry.is_dir:
+                    record["dirs"].append(
+                        [
+                            entry.name,
+                            self.rules.excluded_reason(entry.path, True),
+                            entry.name != ".git",
+                        ]
+                    )
+                elif not self.rules.excluded_reason(entry.path, False):
+                    record["files"].append(
+                        [entry.name, entry.size, git_mode(entry.mode)]
+                    )
+        # 部分克隆中未获取文件的大小只是下限，不能缓存
+        if key is not None and self.repo_fs.dir_fetched(rel_path):
+            self.records[key] = record
+        return self._apply(rel_path, record)
+
+    def _replay(self, rel_path: str, record: dict) -> List[str]:
+        """按缓存记录重放目录的规则文件和子项"""
+        self.rules.load_texts(rel_path, record["rules"])
+        return self._apply(rel_path, record)
+
+    def _apply(self, rel_path: str, record: dict) -> List[str]:
+        if record["pruned"]:
+            self.pruned[rel_path] = record["pruned"]
+            return []
+
+        depth = rel_path.count("/") + 1 if rel_path else 0
+        prefix = f"{rel_path}/" if rel_path else ""
+        subdirs = []
+        for name, reason, descend in record["dirs"]:
+            path = prefix + name
+            self.dirs.append(IndexedDir(path, depth))
+            if reason:
+                self.pruned[path] = reason
+            elif descend:
+                subdirs.append(path)
+        for name, size, mode in record["files"]:
+            if name == ".git":
+                # worktree检出中的.git是指向镜像的文件，与.git目录一样不属于仓库内容
+                # (在应用记录时过滤，缓存中已有的旧记录同样适用)
+                continue
+            self.total_bytes += size
+            self.files.append(
+                IndexedFile(prefix + name, size, mode, file_extension(name), depth)
+            )
+        return subdirs
+
+
+def get_repo_index(repo: Union[Path, str, RepoFS]) -> RepoIndex:
+    """获取仓库文件清单；同一文件系统对象和登记过的工作区只构建一次"""
+    repo_fs = open_repo_fs(repo)
+    if repo_fs.index is not None:
+        return repo_fs.index
+
+    workspace = (
+        get_workspace(repo_fs.root) if isinstance(repo_fs, LocalRepoFS) else None
+    )
+    if workspace is not None and workspace.index is not None:
+        index = workspace.index
+    else:
+        index = RepoIndex.build(
+            repo_fs,
+            max_files=config_manager.config.index_max_files,
+            max_bytes=config_manager.config.index_max_mb * 1024 * 1024,
+            workers=config_manager.config.index_workers or min(8, os.cpu_count() or 1),
+            cache=repo_fs.index_cache,
+        )
+        if workspace is not None:
+            workspace.index = index
+
+    repo_fs.index = index
+    return index
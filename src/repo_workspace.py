@@ -0,0 +1,268 @@
+"""分析工作区 - 跟踪检出目录中尚未落盘、可按需补全的文件"""
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .repo_cache import file_lock, run_git
+
+# cone模式下列出该占位子目录，只会检出其父目录的直接文件而不递归子目录
+SPARSE_FILES_ONLY = ".biotools-files-only"
+
+
+def parse_size(value: str) -> int:
+    """解析git风格的大小表示(如 512k、1m、2g)为字节数"""
+    match = re.fullmatch(r"\s*(\d+)\s*([kmg]?)\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"无效的大小配置: {value}")
+    number, unit = match.groups()
+    return int(number) * {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}[unit]
+
+
+def compile_path_pattern(pattern: str) -> re.Pattern:
+    """编译路径通配符：不含"/"时匹配任意层级的文件名，否则从仓库根目录匹配
+
+    "*" 和 "?" 不跨越目录，"**/" 匹配任意层目录。
+    """
+    if "/" not in pattern:
+        pattern = "**/" + pattern
+    return re.compile(translate_path_pattern(pattern) + r"\Z")
+
+
+def translate_path_pattern(pattern: str) -> str:
+    """将路径通配符按原样转换为正则表达式(不含锚点)，规则同 compile_path_pattern"""
+    regex, i = "", 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+
+def parent_dir(rel_path: str) -> str:
+    """相对路径的父目录，根目录为空字符串"""
+    return rel_path.rsplit("/", 1)[0] if "/" in rel_path else ""
+
+
+def file_extension(name: str) -> str:
+    """文件扩展名，语义同 os.path.splitext(name)[1]，遍历大量文件时开销更小"""
+    head, dot, extension = name.rpartition(".")
+    # 以点号开头的文件名(如 .bashrc)没有扩展名
+    return dot + extension if head.strip(".") else ""
+
+
+def sparse_directories(
+    paths: Iterable[str], patterns: Iterable[str], max_matches: Optional[int] = None
+) -> Set[str]:
+    """根据路径模式计算稀疏检出需要的目录(仅父目录的直接文件)
+
+    Args:
+        max_matches: 每个模式最多采纳的匹配文件数，优先较浅的路径
+    """
+    paths = sorted(paths, key=lambda p: (p.count("/"), p))
+    directories = set()
+    for pattern in patterns:
+        matcher = compile_path_pattern(pattern)
+        matches = [p for p in paths if matcher.match(p)]
+        for rel_path in matches[:max_matches]:
+            if "/" in rel_path:
+                directories.add(parent_dir(rel_path))
+    return directories
+
+
+def snapshot_directory(source: Path, dest: Path) -> str:
+    """创建目录快照，优先reflink(写时复制)，其次硬链接，跨设备时回退为复制
+
+    Returns:
+        实际使用的方式: reflink、hardlink
+    """
+    result = subprocess.run(
+        ["cp", "-a", "--reflink=always", str(source), str(dest)],
+        capture_output=True,
+    )
+    if result.returncode == 0:
+        return "reflink"
+    shutil.rmtree(dest, ignore_errors=True)
+
+    def link_or_copy(src: str, dst: str) -> None:
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    # 硬链接与源文件共享inode，快照只隔离目录结构
+    shutil.copytree(source, dest, symlinks=True, copy_function=link_or_copy)
+    return "hardlink"
+
+
+class RepoWorkspace:
+    """分析工作区：检出目录 + 延迟获取的文件清单"""
+
+    def __init__(
+        self,
+        path: Path,
+        missing_paths: Iterable[str] = (),
+        missing_size_floor: int = 0,
+        missing_sizes: Optional[Dict[str, int]] = None,
+        ref: str = "HEAD",
+        sparse: bool = False,
+        hydrator: Optional[Callable[[str], None]] = None,
+        read_only: bool = False,
+        lock_path: Optional[Path] = None,
+        allow_lfs: bool = False,
+        allow_submodules: bool = False,
+        tracked_only: bool = False,
+        index_cache=None,
+        content_cache=None,
+    ):
+        self.path = Path(path)
+        self.missing_paths = set(missing_paths)
+        # 缺失文件的大小下限(部分克隆时即blob大小阈值)
+        self.missing_size_floor = missing_size_floor
+        # 已知的缺失文件大小(归档成员头、稀疏检出中本地已有的blob)，优先于下限
+        self.missing_sizes = dict(missing_sizes or {})
+        self.ref = ref
+        # 稀疏检出时缺失文件在cone之外，补全需要扩大检出范围
+        self.sparse = sparse
+        # 非git工作区(如归档解压)的自定义补全方式
+        self.hydrator = hydrator
+        # 原地分析的本地目录和跨运行复用的共享工作区，分析过程不得修改
+        # (补全缺失文件除外)
+        self.read_only = read_only
+        # 多个进程共享同一工作区时，补全文件需跨进程互斥
+        self.lock_path = lock_path
+        # LFS内容和子模块默认不获取，启用后分析器可按路径请求补全
+        self.allow_lfs = allow_lfs
+        self.allow_submodules = allow_submodules
+        # 内容来自提交的检出或归档，不含未跟踪文件，构建清单时无需按.gitignore过滤
+        self.tracked_only = tracked_only
+        # 按树ID复用目录记录的持久缓存(IndexCache)
+        self.index_cache = index_cache
+        # 同一次分析中各分析器共享的文本内容缓存(ContentCache)
+        self.content_cache = content_cache
+        # 工作区内容按提交固定，文件清单(RepoIndex)构建一次供所有分析器共享
+        self.index = None
+        # 清单文件解析得到的依赖图(DependencyGraph)，同样只解析一次
+        self.dependency_graph = None
+        # 提交历史统计(GitHistory)，作者提取和活跃度分析共用
+        self.git_history = None
+        self._lock = threading.Lock()
+
+    def relative(self, file_path: Path) -> Optional[str]:
+        """计算相对工作区根目录的POSIX路径"""
+        try:
+            return Path(file_path).resolve().relative_to(self.path.resolve()).as_posix()
+        except ValueError:
+            return None
+
+    def hydrate(self, rel_path: str) -> bool:
+        """按需从对象库补全单个文件，返回文件是否可用"""
+        with self._lock:
+            if rel_path not in self.missing_paths:
+                return (self.path / rel_path).is_file()
+            if self.lock_path is None:
+                return self._hydrate(rel_path)
+            with file_lock(self.lock_path):
+                return self._hydrate(rel_path)
+
+    def _hydrate(self, rel_path: str) -> bool:
+        # 其他进程可能已补全该文件
+        if (self.path / rel_path).is_file():
+            self.missing_paths.discard(rel_path)
+            return True
+        print(f"📥 按需获取文件: {rel_path}")
+        try:
+            if self.hydrator is not None:
+                self.hydrator(rel_path)
+            elif self.sparse:
+                self._widen_sparse_checkout(parent_dir(rel_path))
+            else:
+                run_git(["checkout", self.ref, "--", rel_path], cwd=self.path)
+        except Exception as e:
+            print(f"⚠️ 按需获取文件失败: {e}")
+            return False
+        self.missing_paths.discard(rel_path)
+        return True
+
+    def hydrate_lfs(self, rel_path: str) -> bool:
+        """将LFS指针文件替换为实际内容，需启用LFS补全并安装git-lfs"""
+        if not self.allow_lfs:
+            return False
+        print(f"📥 获取LFS文件: {rel_path}")
+        return self._run_locked(["lfs", "pull", "--include", rel_path])
+
+    def hydrate_submodule(self, rel_path: str) -> bool:
+        """浅检出单个子模块，需启用子模块补全"""
+        if not self.allow_submodules:
+            return False
+        print(f"📥 获取子模块: {rel_path}")
+        return self._run_locked(
+            ["submodule", "update", "--init", "--depth", "1", "--", rel_path]
+        )
+
+    def _run_locked(self, args: List[str]) -> bool:
+        """在工作区锁内执行不受隔离配置限制的git命令"""
+        with self._lock:
+            try:
+                if self.lock_path is None:
+                    run_git(args, cwd=self.path, isolated=False)
+                else:
+                    with file_lock(self.lock_path):
+                        run_git(args, cwd=self.path, isolated=False)
+            except RuntimeError as e:
+                print(f"⚠️ 补全失败: {e}")
+                return False
+        return True
+
+    def _widen_sparse_checkout(self, directory: str) -> None:
+        """将目录的直接文件加入稀疏检出范围"""
+        run_git(
+            ["sparse-checkout", "add", f"{directory}/{SPARSE_FILES_ONLY}"],
+            cwd=self.path,
+        )
+        self.missing_paths -= {
+            rel for rel in self.missing_paths if parent_dir(rel) == directory
+        }
+
+
+_workspaces: Dict[str, RepoWorkspace] = {}
+
+
+def _key(repo_path: Path) -> str:
+    return str(Path(repo_path).resolve())
+
+
+def register_workspace(workspace: RepoWorkspace) -> RepoWorkspace:
+    """登记工作区，供各分析器按仓库路径查找"""
+    _workspaces[_key(workspace.path)] = workspace
+    return workspace
+
+
+def get_workspace(repo_path: Path) -> Optional[RepoWorkspace]:
+    """获取仓库路径对应的工作区"""
+    return _workspaces.get(_key(repo_path))
+
+
+def ensure_local_file(repo_path: Path, file_path: Path) -> bool:
+    """确保文件已在本地，必要时按需补全；返回文件是否存在"""
+    file_path = Path(file_path)
+    if file_path.is_file():
+        return True
+    workspace = get_workspace(repo_path)
+    if workspace is None:
+        return False
+    rel_path = workspace.relative(file_path)
+    return rel_path is not None and workspace.hydrate(rel_path)
@@ -8,14 +8,41 @@ from typing import List, Optional
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from .manifests import get_dependency_graph
 from .models import SecurityAnalysis, SecurityVulnerability
+from .repo_fs import open_repo_fs
+from .repo_index import get_repo_index
+from .repo_workspace import ensure_local_file
 
 
 class SecurityAnalyzer:
     """安全分析器 - 专注最核心的安全问题"""
+
+    # 稀疏检出时需要的文件：bandit扫描全部Python代码，依赖清单位于根目录
+    CHECKOUT_PATTERNS = ["*.py"]
     
     def __init__(self, repo_path: Path):
         self.repo_path = repo_path
+        # 登记过的工作区带有各分析器共享的文件内容缓存
+        self.repo_fs = open_repo_fs(repo_path)
+        # 仓库文件清单，与架构分析共享同一次遍历
+        self.index = get_repo_index(self.repo_fs)
+        # 清单文件解析出的依赖图，与框架检测和AI分析共享
+        self.dependencies = get_dependency_graph(self.repo_fs)
+
+    def _exists(self, filename: str) -> bool:
+        """检查依赖文件是否存在，部分克隆时按需获取"""
+        return self.index.is_file(filename) and ensure_local_file(
+            self.repo_path, self.repo_path / filename
+        )
+
+    def _root_files(self, pattern: str) -> List[Path]:
+        """根目录下匹配通配符的文件，部分克隆时按需获取"""
+        return [
+            self.repo_path / f.path
+            for f in self.index.glob(pattern)
+            if f.depth == 0 and self._exists(f.path)
+        ]
         
     def analyze_security(self) -> Optional[SecurityAnalysis]:
         """执行安全分析 - MVP版本，并行优化"""
@@ -76,11 +103,11 @@ class SecurityAnalyzer:
             
             if vulnerabilities or self._has_python_dependencies():
                 # 根据实际使用的工具确定工具名
-                if (self.repo_path / "uv.lock").exists():
+                if self._exists("uv.lock"):
                     tools_used.append("uv-audit")
-                elif (self.repo_path / "poetry.lock").exists():
+                elif self._exists("poetry.lock"):
                     tools_used.append("safety")
-                elif any((self.repo_path / f).exists() for f in ["environment.yml", "environment.yaml"]):
+                elif any(self._exists(f) for f in ["environment.yml", "environment.yaml"]):
                     tools_used.append("conda-pip-audit")
                 else:
                     tools_used.append("pip-audit")
@@ -118,22 +145,24 @@ class SecurityAnalyzer:
             "requirements.txt", "requirements-dev.txt", "requirements-test.txt",
             "setup.py", "pyproject.toml", "Pipfile", "poetry.lock"
         ]
-        return any((self.repo_path / f).exists() for f in dep_files)
+        return bool(self.dependencies.select(["pypi"])) or any(
+            self._exists(f) for f in dep_files
+        )
     
     def _has_python_code(self) -> bool:
         """检查是否有Python代码"""
-        return len(list(self.repo_path.glob("**/*.py"))) > 0
+        return bool(self.index.by_extension(".py"))
     
     def _check_python_vulnerabilities(self) -> List[SecurityVulnerability]:
         """检查Python包漏洞 - 智能选择最佳工具"""
         vulnerabilities = []
         
         # 按优先级检测依赖管理工具
-        if (self.repo_path / "uv.lock").exists() and shutil.which("uv"):
+        if self._exists("uv.lock") and shutil.which("uv"):
             return self._check_with_uv()
-        elif (self.repo_path / "poetry.lock").exists() and shutil.which("poetry"):
+        elif self._exists("poetry.lock") and shutil.which("poetry"):
             return self._check_with_poetry()
-        elif any((self.repo_path / f).exists() for f in ["environment.yml", "environment.yaml"]) and shutil.which("conda"):
+        elif any(self._exists(f) for f in ["environment.yml", "environment.yaml"]) and shutil.which("conda"):
             return self._check_with_conda()
         else:
             return self._check_with_pip_audit()
@@ -178,7 +207,7 @@ class SecurityAnalyzer:
         print("🔍 检查conda环境文件")
         # conda没有内置安全检查，转换为pip格式检查
         try:
-            env_files = list(self.repo_path.glob("environment.y*ml"))
+            env_files = self._root_files("environment.y*ml")
             if env_files:
                 print(f"📋 发现conda环境文件: {env_files[0].name}")
                 # 简单的依赖提取和pip-audit检查
@@ -196,20 +225,26 @@ class SecurityAnalyzer:
             print("⚠️ pip-audit未安装，跳过依赖漏洞检查")
             return vulnerabilities
         
-        # 查找requirements文件
-        req_files = []
-        for pattern in ["*requirements*.txt", "setup.py", "pyproject.toml"]:
-            req_files.extend(list(self.repo_path.glob(pattern)))
-        
-        if not req_files:
-            print("📋 未发现Python依赖文件")
-            return vulnerabilities
-            
-        try:
+        # 查找requirements文件；没有时使用依赖图中从setup.py、pyproject.toml等解析的运行时依赖
+        req_files = self._root_files("*requirements*.txt")
+        temp_req = None
+        if req_files:
             # 选择第一个requirements文件
             req_file = req_files[0]
             print(f"🔍 使用 pip-audit 检查: {req_file.name}")
+        else:
+            requirement_lines = self.dependencies.requirement_lines()
+            if not requirement_lines:
+                print("📋 未发现Python依赖文件")
+                return vulnerabilities
+            import tempfile
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+                f.write('\n'.join(requirement_lines))
+                temp_req = f.name
+            req_file = Path(temp_req)
+            print(f"🔍 使用 pip-audit 检查清单文件中的 {len(requirement_lines)} 项Python依赖")
             
+        try:
             # 执行pip-audit命令
             cmd = ["pip-audit", "--format=json", "--requirement", str(req_file)]
             result = subprocess.run(
@@ -243,6 +278,9 @@ class SecurityAnalyzer:
             print(f"⚠️ pip-audit执行失败: {e}")
         except Exception as e:
             print(f"⚠️ pip-audit检查出错: {e}")
+        finally:
+            if temp_req:
+                Path(temp_req).unlink(missing_ok=True)
             
         return vulnerabilities
     
@@ -279,15 +317,10 @@ class SecurityAnalyzer:
         """检查conda环境文件的安全性"""
         vulnerabilities = []
         try:
-            import yaml
-            with open(env_file) as f:
-                env_data = yaml.safe_load(f)
-            
-            pip_deps = []
-            dependencies = env_data.get("dependencies", [])
-            for dep in dependencies:
-                if isinstance(dep, dict) and "pip" in dep:
-                    pip_deps.extend(dep["pip"])
+            # 环境文件pip小节中的依赖已解析到依赖图，未安装PyYAML时依赖图中没有这些依赖
+            import yaml  # noqa: F401
+
+            pip_deps = self.dependencies.requirement_lines(env_file.name)
             
             if pip_deps:
                 print(f"🔍 conda环境中发现 {len(pip_deps)} 个pip依赖")
@@ -350,7 +383,7 @@ class SecurityAnalyzer:
             return vulnerabilities
         
         # 查找Python文件
-        py_files = list(self.repo_path.glob("**/*.py"))
+        py_files = self.index.by_extension(".py")
         if not py_files:
             print("📋 未发现Python代码文件")
             return vulnerabilities
@@ -0,0 +1,68 @@
+"""文本解码 - 根据文件开头的有限字节判断二进制/文本并识别编码
+
+二进制文件只读取开头用于判定，不会被完整读取或解码。
+"""
+
+import codecs
+from typing import Optional
+
+# 判定二进制和编码时读取的文件开头字节数
+SNIFF_BYTES = 8192
+
+# 支持的编码中单个字符最多占用的字节数(UTF-8、UTF-32)，用于按字符数估算需读取的字节
+MAX_CHAR_BYTES = 4
+
+# 非文本控制字符占比超过该值时视为二进制
+BINARY_CONTROL_SHARE = 0.1
+
+# 文本中常见的控制字符：\b \t \n \f \r 和ESC(终端颜色)
+TEXT_CONTROL_BYTES = {8, 9, 10, 12, 13, 27}
+_CONTROL_BYTES = bytes(b for b in [*range(32), 127] if b not in TEXT_CONTROL_BYTES)
+
+# 带BOM的编码，按BOM长度从长到短检查(UTF-32LE的BOM以UTF-16LE的BOM开头)
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def is_binary(prefix: bytes) -> bool:
+    """根据文件开头判断是否为二进制：含NUL字节或非文本控制字符过多"""
+    if not prefix:
+        return False
+    if b"\0" in prefix:
+        return True
+    controls = len(prefix) - len(prefix.translate(None, _CONTROL_BYTES))
+    return controls > BINARY_CONTROL_SHARE * len(prefix)
+
+
+def detect_encoding(prefix: bytes, complete: bool = False) -> Optional[str]:
+    """识别文本编码，二进制文件返回None
+
+    Args:
+        prefix: 文件开头的字节，可能在多字节字符中间截断
+        complete: prefix是否为完整的文件内容
+    """
+    for bom, encoding in BOM_ENCODINGS:
+        if prefix.startswith(bom):
+            return encoding
+    if is_binary(prefix):
+        return None
+    try:
+        # 只有开头时，末尾被截断的UTF-8字符不视为错误
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=complete)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def decode_prefix(data: bytes, encoding: str, complete: bool) -> str:
+    """解码文件内容或其开头，开头末尾被截断的多字节字符被丢弃
+
+    Raises:
+        UnicodeDecodeError: 内容不符合该编码
+    """
+    return codecs.getincrementaldecoder(encoding)().decode(data, final=complete)
@@ -267,12 +267,23 @@ class DocumentVisualizer:
                         {% if author.email %}
                             <br><small>{{ author.email }}</small>
                         {% endif %}
+                        {% if author.commit_count %}
+                            <br><small>{{ author.commit_count }} 次提交（{{ author.first_commit }} ~ {{ author.last_commit }}）</small>
+                        {% endif %}
                     </div>
                     {% endfor %}
                 </div>
             {% else %}
                 <p>暂无作者信息</p>
             {% endif %}
+            {% if analysis.activity %}
+                <p style="margin-top: 15px;"><strong>提交活跃度:</strong>
+                    共 {{ analysis.activity.total_commits }} 次提交，{{ analysis.activity.contributors }} 位作者，
+                    {{ analysis.activity.first_commit }} ~ {{ analysis.activity.last_commit }}；
+                    月均 {{ analysis.activity.commits_per_month }} 次，最近一年 {{ analysis.activity.commits_last_year }} 次
+                    {% if analysis.activity.shallow %}（浅克隆，历史不完整）{% endif %}
+                </p>
+            {% endif %}
         </div>
 
         <!-- 相关发表文章 -->
@@ -292,6 +303,15 @@ class DocumentVisualizer:
                     {% if pub.doi %}
                         <p><strong>DOI:</strong> <a href="https://doi.org/{{ pub.doi }}" target="_blank">{{ pub.doi }}</a></p>
                     {% endif %}
+                    {% if pub.pmid %}
+                        <p><strong>PMID:</strong> <a href="https://pubmed.ncbi.nlm.nih.gov/{{ pub.pmid }}/" target="_blank">{{ pub.pmid }}</a></p>
+                    {% endif %}
+                    {% if pub.pmcid %}
+                        <p><strong>PMCID:</strong> <a href="https://www.ncbi.nlm.nih.gov/pmc/articles/{{ pub.pmcid }}/" target="_blank">{{ pub.pmcid }}</a></p>
+                    {% endif %}
+                    {% if pub.confidence == "low" %}
+                        <p><em>来自README正文的参考文献，可能是工具引用的其他工作</em></p>
+                    {% endif %}
                 </div>
                 {% endfor %}
             {% else %}
@@ -354,6 +374,17 @@ class DocumentVisualizer:
                 {% endfor %}
             </div>
             {% endif %}
+
+            {% if analysis.architecture.language_stats %}
+            <div class="info-item" style="margin-top: 20px;">
+                <strong>代码量占比</strong>
+                <ul class="feature-list">
+                    {% for stat in analysis.architecture.language_stats %}
+                    <li>{{ stat.language }}: {{ "%.1f"|format(stat.byte_share * 100) }}% 字节 / {{ "%.1f"|format(stat.line_share * 100) }}% 行（{{ stat.files }} 个文件，{{ stat.lines }} 行）</li>
+                    {% endfor %}
+                </ul>
+            </div>
+            {% endif %}
             
             {% if analysis.architecture.frameworks %}
             <div class="info-item" style="margin-top: 20px;">
@@ -386,6 +417,24 @@ class DocumentVisualizer:
                 {% endfor %}
             </div>
             {% endif %}
+
+            {% if analysis.architecture.lfs_files %}
+            <h3 style="margin-top: 25px; margin-bottom: 15px;">Git LFS文件（未下载）</h3>
+            <ul class="feature-list">
+                {% for lfs in analysis.architecture.lfs_files %}
+                <li><code>{{ lfs.path }}</code> ({{ lfs.size }} 字节)</li>
+                {% endfor %}
+            </ul>
+            {% endif %}
+
+            {% if analysis.architecture.submodules %}
+            <h3 style="margin-top: 25px; margin-bottom: 15px;">子模块（未检出）</h3>
+            <ul class="feature-list">
+                {% for sub in analysis.architecture.submodules %}
+                <li><code>{{ sub.path }}</code>{% if sub.url %} - {{ sub.url }}{% endif %}{% if sub.commit %} @ {{ sub.commit[:8] }}{% endif %}</li>
+                {% endfor %}
+            </ul>
+            {% endif %}
         </div>
         {% endif %}
 
@@ -685,8 +734,12 @@ class DocumentVisualizer:
 ## 👥 作者信息
 
 {% for author in analysis.authors %}
-- **{{ author.name }}**{% if author.email %} ({{ author.email }}){% endif %}
+- **{{ author.name }}**{% if author.email %} ({{ author.email }}){% endif %}{% if author.commit_count %} - {{ author.commit_count }} 次提交（{{ author.first_commit }} ~ {{ author.last_commit }}）{% endif %}
 {% endfor %}
+{% if analysis.activity %}
+
+**提交活跃度**: 共 {{ analysis.activity.total_commits }} 次提交，{{ analysis.activity.contributors }} 位作者，{{ analysis.activity.first_commit }} ~ {{ analysis.activity.last_commit }}；月均 {{ analysis.activity.commits_per_month }} 次，最近一年 {{ analysis.activity.commits_last_year }} 次{% if analysis.activity.shallow %}（浅克隆，历史不完整）{% endif %}
+{% endif %}
 
 ## 📚 相关发表文章
 
@@ -698,6 +751,9 @@ class DocumentVisualizer:
 {% if pub.journal %}- **期刊**: {{ pub.journal }}{% endif %}
 {% if pub.year %}- **年份**: {{ pub.year }}{% endif %}
 {% if pub.doi %}- **DOI**: [{{ pub.doi }}](https://doi.org/{{ pub.doi }}){% endif %}
+{% if pub.pmid %}- **PMID**: [{{ pub.pmid }}](https://pubmed.ncbi.nlm.nih.gov/{{ pub.pmid }}/){% endif %}
+{% if pub.pmcid %}- **PMCID**: [{{ pub.pmcid }}](https://www.ncbi.nlm.nih.gov/pmc/articles/{{ pub.pmcid }}/){% endif %}
+{% if pub.confidence == "low" %}- *来自README正文的参考文献，可能是工具引用的其他工作*{% endif %}
 
 {% endfor %}
 {% else %}
@@ -732,6 +788,14 @@ class DocumentVisualizer:
 {% for lang in analysis.architecture.programming_languages %}
 - `{{ lang }}`
 {% endfor %}
+{% if analysis.architecture.language_stats %}
+### 代码量占比
+| 语言 | 文件数 | 字节占比 | 行数 | 行数占比 |
+|------|--------|----------|------|----------|
+{% for stat in analysis.architecture.language_stats -%}
+| {{ stat.language }} | {{ stat.files }} | {{ "%.1f"|format(stat.byte_share * 100) }}% | {{ stat.lines }} | {{ "%.1f"|format(stat.line_share * 100) }}% |
+{% endfor %}
+{% endif %}
 
 ### 框架/库
 {% for framework in analysis.architecture.frameworks %}
@@ -747,6 +811,20 @@ class DocumentVisualizer:
 {% for path, purpose in analysis.architecture.directory_structure.items() %}
 - **{{ path }}**: {{ purpose }}
 {% endfor %}
+{% if analysis.architecture.lfs_files %}
+
+### Git LFS文件（未下载）
+{% for lfs in analysis.architecture.lfs_files %}
+- `{{ lfs.path }}` ({{ lfs.size }} 字节)
+{% endfor %}
+{% endif %}
+{% if analysis.architecture.submodules %}
+
+### 子模块（未检出）
+{% for sub in analysis.architecture.submodules %}
+- `{{ sub.path }}`{% if sub.url %} - {{ sub.url }}{% endif %}{% if sub.commit %} @ {{ sub.commit[:8] }}{% endif %}
+{% endfor %}
+{% endif %}
 {% endif %}
 
 ## 💻 代码质量
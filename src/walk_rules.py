@@ -0,0 +1,290 @@
+"""遍历剪枝规则 - 构建文件清单时跳过忽略文件、第三方代码、生成文件和数据目录
+
+规则来源：
+    .gitignore          各层目录的忽略规则，被忽略的文件和目录不计入清单
+    .gitattributes      linguist-vendored / linguist-generated 标记的路径
+    目录内容            捆绑的第三方源码(自带许可证和构建脚本)、以数据文件为主的目录
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .repo_workspace import file_extension, translate_path_pattern
+
+# 常见的生物信息学数据和归档文件扩展名(压缩文件取最后一级扩展名)
+DATA_EXTENSIONS = {
+    ".fa",
+    ".fasta",
+    ".fna",
+    ".faa",
+    ".fq",
+    ".fastq",
+    ".sam",
+    ".bam",
+    ".cram",
+    ".bai",
+    ".crai",
+    ".vcf",
+    ".bcf",
+    ".tbi",
+    ".csi",
+    ".bed",
+    ".bw",
+    ".bigwig",
+    ".bedgraph",
+    ".gff",
+    ".gff3",
+    ".gtf",
+    ".gb",
+    ".gbk",
+    ".embl",
+    ".pdb",
+    ".h5",
+    ".hdf5",
+    ".h5ad",
+    ".loom",
+    ".mtx",
+    ".npy",
+    ".npz",
+    ".csv",
+    ".tsv",
+    ".parquet",
+    ".rds",
+    ".rdata",
+    ".pkl",
+    ".2bit",
+    ".sra",
+    ".fast5",
+    ".pod5",
+    ".mzml",
+    ".mgf",
+    ".nwk",
+    ".phy",
+    ".aln",
+    ".gz",
+    ".bgz",
+    ".bz2",
+    ".xz",
+    ".zip",
+    ".tar",
+}
+
+# 遍历时逐层读入的规则文件
+RULE_FILES = (".gitignore", ".gitattributes")
+
+# 数据目录判定：直接文件中数据文件的占比下限，以及数量或总大小下限
+DATA_DIR_MIN_SHARE = 0.8
+DATA_DIR_MIN_FILES = 50
+DATA_DIR_MIN_BYTES = 16 * 1024 * 1024
+
+# 捆绑的第三方源码通常自带许可证和独立的构建脚本
+LICENSE_FILES = {"license", "license.txt", "license.md", "copying", "copying.txt"}
+BUNDLED_BUILD_FILES = {
+    "configure",
+    "configure.ac",
+    "makefile.in",
+    "cmakelists.txt",
+    "meson.build",
+}
+
+
+class PathRule:
+    """一条作用于某个目录(base)之下的路径规则"""
+
+    def __init__(self, base: str, pattern: str, value: bool, dir_only: bool = False):
+        self.base = base
+        self.value = value
+        self.dir_only = dir_only
+        # 不含"/"的模式匹配任意层级的名称，否则相对base匹配
+        if "/" not in pattern:
+            pattern = "**/" + pattern
+        self._regex = re.compile(translate_path_pattern(pattern.lstrip("/")) + r"\Z")
+
+    def match(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1 :]
+        return self._regex.match(rel_path) is not None
+
+
+def parse_gitignore(base: str, content: str) -> List[PathRule]:
+    """解析.gitignore，支持注释、"!"取反、末尾"/"仅匹配目录"""
+    rules = []
+    for line in content.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        pattern, dir_only = _split_pattern(line)
+        if pattern:
+            rules.append(PathRule(base, pattern, not negate, dir_only))
+    return rules
+
+
+def parse_linguist_attributes(
+    base: str, content: str
+) -> Tuple[List[PathRule], List[PathRule]]:
+    """解析.gitattributes中的linguist-vendored和linguist-generated标记
+
+    Returns:
+        (vendored规则, generated规则)
+    """
+    vendored, generated = [], []
+    for line in content.splitlines():
+        fields = line.split()
+        if len(fields) < 2 or fields[0].startswith("#"):
+            continue
+        pattern, dir_only = _split_pattern(fields[0])
+        if not pattern:
+            continue
+        for attr in fields[1:]:
+            for name, rules in (
+                ("linguist-vendored", vendored),
+                ("linguist-generated", generated),
+            ):
+                if attr in (name, f"{name}=true"):
+                    rules.append(PathRule(base, pattern, True, dir_only))
+                elif attr in (f"-{name}", f"!{name}", f"{name}=false"):
+                    rules.append(PathRule(base, pattern, False, dir_only))
+    return vendored, generated
+
+
+def _split_pattern(pattern: str) -> Tuple[str, bool]:
+    """规范化gitignore风格的模式
+
+    以"/"开头或中间含"/"的模式相对所在目录匹配，统一改写为以"/"开头。
+
+    Returns:
+        (模式, 是否仅匹配目录)
+    """
+    anchored = "/" in pattern.rstrip("/") and not pattern.startswith("**/")
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    # "dir/**" 匹配目录下的全部内容，等价于剪枝该目录
+    if pattern.endswith("/**"):
+        pattern, dir_only = pattern[:-3], True
+    pattern = pattern.strip("/")
+    if anchored and pattern:
+        pattern = "/" + pattern
+    return pattern, dir_only
+
+
+def last_match(rules: Iterable[PathRule], rel_path: str, is_dir: bool) -> bool:
+    """按规则顺序取最后一条匹配的结果，均不匹配时为False"""
+    result = False
+    for rule in rules:
+        if rule.match(rel_path, is_dir):
+            result = rule.value
+    return result
+
+
+class WalkRules:
+    """构建清单时的剪枝规则，遍历过程中逐层读入各目录的.gitignore和.gitattributes"""
+
+    def __init__(self, honour_gitignore: bool = True):
+        # 检出和对象库中只有已跟踪文件，.gitignore不适用(被强制添加的文件同样属于仓库)
+        self.honour_gitignore = honour_gitignore
+        self.ignore: List[PathRule] = []
+        self.vendored: List[PathRule] = []
+        self.generated: List[PathRule] = []
+        # 已读入的规则文件 (所在目录, 文件名, 内容摘要)，用于计算规则指纹
+        self.sources: List[Tuple[str, str, str]] = []
+
+    def fork(self) -> "WalkRules":
+        """复制当前规则，供并行遍历的子树各自追加下层规则"""
+        rules = WalkRules(self.honour_gitignore)
+        rules.ignore = list(self.ignore)
+        rules.vendored = list(self.vendored)
+        rules.generated = list(self.generated)
+        rules.sources = list(self.sources)
+        return rules
+
+    def load(self, directory: str, names: Iterable[str], read_text) -> Dict[str, str]:
+        """读入目录中的规则文件，read_text(rel_path) 返回文件内容或None
+
+        Returns:
+            读入的规则文件名 -> 内容，可交给 load_texts 重放
+        """
+        names = set(names)
+        prefix = f"{directory}/" if directory else ""
+        texts = {
+            name: read_text(prefix + name) or ""
+            for name in RULE_FILES
+            if name in names and (self.honour_gitignore or name != ".gitignore")
+        }
+        self.load_texts(directory, texts)
+        return texts
+
+    def load_texts(self, directory: str, texts: Dict[str, str]) -> None:
+        """按文件内容追加目录的规则"""
+        for name in RULE_FILES:
+            if name not in texts:
+                continue
+            content = texts[name]
+            self.sources.append(
+                (directory, name, hashlib.sha1(content.encode()).hexdigest())
+            )
+            if name == ".gitignore":
+                if self.honour_gitignore:
+                    self.ignore.extend(parse_gitignore(directory, content))
+            else:
+                vendored, generated = parse_linguist_attributes(directory, content)
+                self.vendored.extend(vendored)
+                self.generated.extend(generated)
+
+    def fingerprint(self, rel_path: str) -> str:
+        """作用于该目录的规则指纹：只包含其自身及上级目录读入的规则文件"""
+        digest = hashlib.sha1(str(self.honour_gitignore).encode())
+        for directory, name, content_hash in self.sources:
+            if (
+                not directory
+                or rel_path == directory
+                or rel_path.startswith(directory + "/")
+            ):
+                digest.update(f"{directory}\0{name}\0{content_hash}\n".encode())
+        return digest.hexdigest()
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        return bool(self.ignore) and last_match(self.ignore, rel_path, is_dir)
+
+    def excluded_reason(self, rel_path: str, is_dir: bool) -> Optional[str]:
+        """路径被标记为第三方或生成内容时返回原因"""
+        if not self.vendored and not self.generated:
+            return None
+        if last_match(self.vendored, rel_path, is_dir):
+            return "vendored"
+        if last_match(self.generated, rel_path, is_dir):
+            return "generated"
+        return None
+
+    def classify_directory(
+        self, rel_path: str, files: List[Tuple[str, int]]
+    ) -> Optional[str]:
+        """根据目录的直接文件(名称, 大小)判断是否为捆绑源码或数据目录"""
+        if not rel_path or not files:
+            return None
+        names = {name.lower() for name, _ in files}
+        if names & LICENSE_FILES and names & BUNDLED_BUILD_FILES:
+            return "vendored"
+
+        if (
+            len(files) < DATA_DIR_MIN_FILES
+            and sum(size for _, size in files) < DATA_DIR_MIN_BYTES
+        ):
+            return None
+        data = [
+            size
+            for name, size in files
+            if file_extension(name).lower() in DATA_EXTENSIONS
+        ]
+        if len(data) >= DATA_DIR_MIN_SHARE * len(files) and (
+            len(data) >= DATA_DIR_MIN_FILES or sum(data) >= DATA_DIR_MIN_BYTES
+        ):
+            return "data"
+        return None
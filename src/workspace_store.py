@@ -0,0 +1,183 @@
+"""内容寻址工作区存储 - 按 (owner, repo, commit) 存放检出，支持多进程并发分析
+
+目录布局(以 root/<owner>/<repo>/<key> 为例)：
+    <key>/             检出内容
+    <key>.lock         创建/回收时的文件锁
+    <key>.ready        检出完成标记，内容为工作区元数据(JSON)
+    <key>.leases/      租约文件，每个使用中的分析进程一个
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .repo_cache import file_lock
+
+
+class WorkspaceLease:
+    """工作区租约：持有期间工作区不会被回收"""
+
+    def __init__(self, path: Path, lease_file: Path, metadata: dict):
+        self.path = path
+        self.lease_file = lease_file
+        # 检出时记录的元数据(缺失文件、是否稀疏等)，复用工作区时据此恢复
+        self.metadata = metadata
+
+
+class WorkspaceStore:
+    """按提交寻址的工作区存储，租约引用计数 + 后台回收"""
+
+    def __init__(self, root: Path, keep_unused: int = 20):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        # 保留的未被引用工作区数量，超出后按最近使用时间回收
+        self.keep_unused = keep_unused
+        self.trash = self.root / ".trash"
+
+    def workspace_path(
+        self, owner: str, repo: str, commit_sha: str, variant: str = ""
+    ) -> Path:
+        """计算工作区目录，variant区分同一提交的不同检出方式(稀疏、部分等)"""
+        key = f"{commit_sha}-{variant}" if variant else commit_sha
+        parts = [re.sub(r"[^A-Za-z0-9._-]+", "_", p) for p in (owner, repo, key)]
+        return self.root.joinpath(*parts)
+
+    def acquire(
+        self,
+        owner: str,
+        repo: str,
+        commit_sha: str,
+        populate: Callable[[Path], dict],
+        variant: str = "",
+        validate: Optional[Callable[[Path], bool]] = None,
+    ) -> WorkspaceLease:
+        """获取工作区租约；工作区不存在时调用 populate 创建，已存在则直接复用
+
+        Args:
+            populate: 在给定目录中生成检出内容，返回需持久化的元数据
+            validate: 复用前检查已有工作区是否仍可用，不可用时重新创建
+        """
+        path = self.workspace_path(owner, repo, commit_sha, variant)
+        ready_file = self._sidecar(path, ".ready")
+
+        with file_lock(self._sidecar(path, ".lock")):
+            if ready_file.exists() and validate is not None and not validate(path):
+                # 如worktree所属的镜像已被淘汰，检出中的.git指向已不存在的目录
+                print(f"⚠️ 已有工作区失效，重新创建: {path}")
+                ready_file.unlink()
+            if ready_file.exists():
+                print(f"♻️ 复用已有工作区: {path}")
+            else:
+                if path.exists():
+                    shutil.rmtree(path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    metadata = populate(path) or {}
+                except Exception:
+                    shutil.rmtree(path, ignore_errors=True)
+                    raise
+                ready_file.write_text(json.dumps(metadata))
+
+            lease_dir = self._sidecar(path, ".leases")
+            lease_dir.mkdir(exist_ok=True)
+            lease_file = lease_dir / f"{os.getpid()}-{uuid.uuid4().hex}"
+            lease_file.touch()
+            metadata = json.loads(ready_file.read_text() or "{}")
+
+        return WorkspaceLease(path, lease_file, metadata)
+
+    def release(self, lease: WorkspaceLease, background: bool = True) -> None:
+        """释放租约并回收多余的未引用工作区，实际删除在后台线程进行"""
+        lease.lease_file.unlink(missing_ok=True)
+        ready_file = self._sidecar(lease.path, ".ready")
+        if ready_file.exists():
+            os.utime(ready_file)
+
+        self.reclaim()
+        if background:
+            threading.Thread(target=self._empty_trash, daemon=True).start()
+        else:
+            self._empty_trash()
+
+    def in_use(self, path: Path) -> bool:
+        """工作区是否仍有有效租约"""
+        return self._live_leases(Path(path)) > 0
+
+    def lock_path(self, path: Path) -> Path:
+        """工作区对应的锁文件"""
+        return self._sidecar(path, ".lock")
+
+    def reclaim(self) -> List[Path]:
+        """回收超出保留数量的未引用工作区：原子重命名到回收站，稍后再删除"""
+        unused = [path for path in self._workspaces() if self._live_leases(path) == 0]
+        unused.sort(key=lambda p: self._last_used(p), reverse=True)
+
+        reclaimed = []
+        for path in unused[self.keep_unused :]:
+            with file_lock(self._sidecar(path, ".lock"), blocking=False) as acquired:
+                # 加锁后再次确认，避免与正在获取租约的进程竞争
+                if not acquired or self._live_leases(path) > 0:
+                    continue
+                self._sidecar(path, ".ready").unlink(missing_ok=True)
+                if path.exists():
+                    self.trash.mkdir(exist_ok=True)
+                    path.rename(self.trash / uuid.uuid4().hex)
+                shutil.rmtree(self._sidecar(path, ".leases"), ignore_errors=True)
+            reclaimed.append(path)
+            print(f"🧹 回收工作区: {path}")
+
+        return reclaimed
+
+    def _workspaces(self) -> List[Path]:
+        """列出所有已完成检出的工作区"""
+        return [
+            ready.with_name(ready.name[: -len(".ready")])
+            for ready in self.root.glob("*/*/*.ready")
+        ]
+
+    def _live_leases(self, path: Path) -> int:
+        """统计有效租约数，持有进程已退出的租约视为失效并清理"""
+        lease_dir = self._sidecar(path, ".leases")
+        if not lease_dir.exists():
+            return 0
+        live = 0
+        for lease_file in lease_dir.iterdir():
+            pid = int(lease_file.name.split("-", 1)[0])
+            if self._pid_alive(pid):
+                live += 1
+            else:
+                lease_file.unlink(missing_ok=True)
+        return live
+
+    def _pid_alive(self, pid: int) -> bool:
+        """检查租约持有进程是否仍在运行"""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _last_used(self, path: Path) -> float:
+        """工作区最近一次释放租约的时间"""
+        try:
+            return self._sidecar(path, ".ready").stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def _empty_trash(self) -> None:
+        """删除回收站内容，中途退出时由下次回收继续"""
+        if not self.trash.exists():
+            return
+        for item in self.trash.iterdir():
+            shutil.rmtree(item, ignore_errors=True)
+
+    def _sidecar(self, path: Path, suffix: str) -> Path:
+        """工作区旁路文件(锁、完成标记、租约目录)"""
+        return path.with_name(path.name + suffix)
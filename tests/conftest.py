@@ -0,0 +1,39 @@
+"""测试公共夹具"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+def git(repo: Path, *args: str) -> str:
+    """在测试仓库中执行git命令"""
+    return subprocess.run(
+        ["git", "-c", "user.name=Tester", "-c", "user.email=tester@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture
+def make_git_repo(tmp_path):
+    """创建带初始提交的本地git仓库"""
+
+    def _make(name: str = "upstream", files: dict = None) -> Path:
+        repo = tmp_path / name
+        repo.mkdir()
+        git(repo, "init", "-q", "-b", "main")
+        for rel_path, content in (files or {"README.md": "# demo\n"}).items():
+            file_path = repo / rel_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                file_path.write_bytes(content)
+            else:
+                file_path.write_text(content)
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", "init")
+        return repo
+
+    return _make
@@ -0,0 +1,112 @@
+"""归档获取测试 - 使用本地HTTP服务模拟codeload"""
+
+import io
+import tarfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.archive_fetcher import ArchiveFetcher
+from src.repo_fs import LocalRepoFS
+from src.repo_workspace import RepoWorkspace, ensure_local_file, register_workspace
+
+COMMIT_SHA = "0123456789abcdef0123456789abcdef01234567"
+FILES = {
+    "README.md": b"# demo\n",
+    "scripts/run.sh": b"#!/bin/sh\n",
+    "src/align.c": b"int main(void) { return 0; }\n",
+    "test_data/reads.fastq": b"@r1\nACGT\n+\nIIII\n" * 1000,
+}
+
+
+def _build_tarball() -> bytes:
+    """构造与GitHub归档结构一致的tar.gz：pax全局头 + <repo>-<sha>/ 顶层目录"""
+    buffer = io.BytesIO()
+    with tarfile.open(
+        fileobj=buffer,
+        mode="w:gz",
+        format=tarfile.PAX_FORMAT,
+        pax_headers={"comment": COMMIT_SHA},
+    ) as archive:
+        for rel_path, content in FILES.items():
+            info = tarfile.TarInfo(f"demo-{COMMIT_SHA}/{rel_path}")
+            info.size = len(content)
+            info.mode = 0o755 if rel_path.endswith(".sh") else 0o644
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def codeload_server(tmp_path):
+    """本地HTTP替身：同时提供归档和单文件下载"""
+    root = tmp_path / "www"
+    archive_path = root / "owner" / "demo" / "tar.gz" / "HEAD"
+    archive_path.parent.mkdir(parents=True)
+    archive_path.write_bytes(_build_tarball())
+    for rel_path, content in FILES.items():
+        raw_path = root / "owner" / "demo" / COMMIT_SHA / rel_path
+        raw_path.parent.mkdir(parents=True, exist_ok=True)
+        raw_path.write_bytes(content)
+
+    handler = partial(SimpleHTTPRequestHandler, directory=str(root))
+    handler.log_message = lambda *args: None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_fetch_extracts_archive_in_one_pass(tmp_path, codeload_server):
+    """测试流式解压并从pax头中获取提交ID"""
+    fetcher = ArchiveFetcher(codeload_url=codeload_server, raw_url=codeload_server)
+    dest = tmp_path / "demo"
+
+    result = fetcher.fetch("owner", "demo", dest)
+
+    assert result.commit_sha == COMMIT_SHA
+    assert result.skipped_paths == []
+    assert not (dest / ".git").exists()
+    assert (dest / "src" / "align.c").read_bytes() == FILES["src/align.c"]
+    assert (dest / "scripts" / "run.sh").stat().st_mode & 0o111
+
+
+def test_fetch_filters_and_hydrates_skipped(tmp_path, codeload_server):
+    """测试按路径模式和大小过滤，跳过的文件可按需下载"""
+    fetcher = ArchiveFetcher(codeload_url=codeload_server, raw_url=codeload_server)
+    dest = tmp_path / "demo"
+
+    result = fetcher.fetch(
+        "owner",
+        "demo",
+        dest,
+        include_patterns=["*.c", "test_data/*"],
+        max_file_bytes=4096,
+    )
+
+    assert sorted(result.skipped_paths) == ["scripts/run.sh", "test_data/reads.fastq"]
+    assert result.skipped_sizes == {
+        rel: len(FILES[rel]) for rel in result.skipped_paths
+    }
+    assert (dest / "README.md").exists()
+    assert (dest / "src" / "align.c").exists()
+
+    register_workspace(
+        RepoWorkspace(
+            dest,
+            missing_paths=result.skipped_paths,
+            missing_sizes=result.skipped_sizes,
+            hydrator=lambda rel: fetcher.fetch_file(
+                "owner", "demo", result.commit_sha, rel, dest
+            ),
+        )
+    )
+    # 未解压的大文件按真实大小列出，不会被当作空文件读取
+    reads = LocalRepoFS(dest).entry("test_data/reads.fastq")
+    assert reads.size == len(FILES["test_data/reads.fastq"])
+    assert not (dest / "test_data" / "reads.fastq").exists()
+
+    assert ensure_local_file(dest, dest / "scripts" / "run.sh")
+    assert (dest / "scripts" / "run.sh").read_bytes() == FILES["scripts/run.sh"]
@@ -0,0 +1,69 @@
+"""作者信息提取测试"""
+
+from src.authors import (
+    AUTHOR_MENTION_PATTERN,
+    iter_author_mentions,
+    pyproject_authors,
+    readme_authors,
+)
+from src.github_analyzer import GitHubAnalyzer
+from src.repo_fs import LocalRepoFS
+
+from .test_repo_index import _write
+
+
+def test_readme_mentions_are_typed_and_match_full_scan():
+    """测试单次扫描按身份分类，结果与完整模式逐一匹配一致"""
+    readme = (
+        "# tool\n\n"
+        "Authors: Jane Doe <jane@example.org>\n"
+        "Set the Authorization header before upload.\n"
+        "Coauthored notes are not authors.\n"
+        "│   ├── authors.py    # 作者提取\n"
+        "Set author_name or contributors.json in the config.\n"
+        "MAINTAINER: **John Smith**\n"
+        "## Contributors\n\n- Alice Zhang\n"
+        "Developed by the Genome Lab\n"
+    )
+    assert [(a.name, a.email, a.role) for a in readme_authors(readme)] == [
+        ("Jane Doe", "jane@example.org", "author"),
+        ("John Smith", None, "maintainer"),
+        ("Alice Zhang", None, "contributor"),
+        ("the Genome Lab", None, "author"),
+    ]
+
+    # 含小写后长度改变的字符(İ)时退回完整模式扫描，两条路径结果一致
+    for text in (readme, readme + "İstanbul authors: Ayşe Kaya\n"):
+        expected = [
+            m.group("text").strip() for m in AUTHOR_MENTION_PATTERN.finditer(text)
+        ]
+        assert [mention for _, mention in iter_author_mentions(text)] == [
+            e for e in expected if len(e) < 100
+        ]
+
+
+def test_pyproject_authors_table_replaces_name_keys(tmp_path):
+    """测试只从 [project].authors/maintainers 提取作者，而非所有 name 键"""
+    content = (
+        "[project]\n"
+        'name = "tool"\n'
+        'authors = [{name = "Jane Doe", email = "jane@example.org"},'
+        ' {email = "lab@example.org"}]\n'
+        'maintainers = [{name = "John Smith"}]\n'
+        "[[tool.mypy.overrides]]\n"
+        'name = "not-an-author"\n'
+    )
+    assert [(a.name, a.email, a.role) for a in pyproject_authors(content)] == [
+        ("Jane Doe", "jane@example.org", "author"),
+        ("lab@example.org", "lab@example.org", "author"),
+        ("John Smith", None, "maintainer"),
+    ]
+
+    _write(tmp_path, {"pyproject.toml": content})
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+    names = [
+        a.name
+        for a in analyzer._extract_authors_from_setup_files(LocalRepoFS(tmp_path))
+    ]
+    assert "tool" not in names and "not-an-author" not in names
+    assert names == ["Jane Doe", "lab@example.org", "John Smith"]
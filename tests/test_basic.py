@@ -30,15 +30,16 @@ def test_author_info_creation():
     assert author.email == "zhangsan@example.com"
 
 
-def test_github_analyzer_init():
-    """测试GitHub分析器初始化"""
-    analyzer = GitHubAnalyzer()
+def test_github_analyzer_init(tmp_path):
+    """测试GitHub分析器初始化，缓存目录在首次使用时才创建"""
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
     assert analyzer.tmp_dir.exists()
+    assert not any(analyzer.tmp_dir.iterdir())
 
 
-def test_extract_repo_name():
+def test_extract_repo_name(tmp_path):
     """测试仓库名称提取"""
-    analyzer = GitHubAnalyzer()
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path))
     
     # 测试不同格式的URL
     urls = [
@@ -52,9 +53,9 @@ def test_extract_repo_name():
         assert name == "repo"
 
 
-def test_parse_github_url():
+def test_parse_github_url(tmp_path):
     """测试GitHub URL解析"""
-    analyzer = GitHubAnalyzer()
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path))
     
     url = "https://github.com/samtools/samtools"
     owner, repo = analyzer._parse_github_url(url)
@@ -0,0 +1,169 @@
+"""引用提取测试"""
+
+from src.citations import (
+    _merge,
+    extract_publications,
+    parse_bibtex,
+    parse_citation_cff,
+    readme_publications,
+)
+from src.models import Publication
+from src.repo_fs import LocalRepoFS
+
+from .test_repo_index import _write
+
+CFF = """\
+cff-version: 1.2.0
+title: seqtool
+type: software
+preferred-citation:
+  type: article
+  title: "seqtool: fast alignment of long reads"
+  authors:
+    - family-names: Doe
+      given-names: Jane
+    - name: Genome Lab
+  journal: Bioinformatics
+  year: 2021
+  doi: https://doi.org/10.1093/bioinformatics/btab001
+references:
+  - type: software
+    title: htslib
+  - type: article
+    title: The Sequence Alignment/Map format and SAMtools
+    authors:
+      - family-names: Li
+        given-names: Heng
+    date-published: 2009-06-08
+    identifiers:
+      - type: doi
+        value: 10.1093/bioinformatics/btp352
+    pmid: 19505943
+"""
+
+BIBTEX = """\
+@comment{generated}
+@article{doe2021,
+  title = {{seqtool}: fast alignment of long reads},
+  author = {Doe, Jane and Smith, Jos{\\'e}},
+  journal = "Bioinformatics",
+  year = 2021,
+  doi = {10.1093/bioinformatics/btab001},
+}
+@software{seqtool,
+  title = {seqtool},
+}
+"""
+
+README = """\
+# seqtool
+
+[![DOI](https://zenodo.org/badge/DOI/10.5281/zenodo.123456.svg)](https://doi.org/10.5281/zenodo.123456)
+
+Archived at 10.5281/zenodo.123456 with some text in prose.
+
+## Citation
+
+If you use seqtool, please cite:
+
+```bibtex
+@article{doe2021,
+  title = {seqtool: fast alignment of long reads},
+  author = {Doe, Jane},
+  year = {2021},
+}
+```
+
+- Danecek P, Bonfield JK, Liddle J. Twelve years of SAMtools and BCFtools. GigaScience. 2021;10(2). PMID: 33590861 PMCID: PMC7931819
+- Smith, J. (2019). Variant calling in polyploid genomes. Genome Research. doi:10.1101/gr.1234.119
+
+## Usage
+
+Run `seqtool align` (see also 10.1000/not-a-reference).
+
+## References
+
+1. Li H, Durbin R. Fast and accurate short read alignment with Burrows-Wheeler transform. Bioinformatics. 2009;25(14). doi:10.1093/bioinformatics/btp324
+2. Langmead B, Salzberg SL. Fast gapped-read alignment with Bowtie 2. Nat Methods. 2012.
+"""
+
+
+def test_parses_cff_and_bibtex():
+    """测试CITATION.cff只取 preferred-citation、BibTeX去除LaTeX标记"""
+    cff = parse_citation_cff(CFF)
+    assert [(p.title, p.year, p.doi) for p in cff] == [
+        (
+            "seqtool: fast alignment of long reads",
+            2021,
+            "10.1093/bioinformatics/btab001",
+        ),
+    ]
+    assert cff[0].authors == ["Jane Doe", "Genome Lab"]
+    assert cff[0].journal == "Bioinformatics"
+
+    bib = parse_bibtex(BIBTEX)
+    assert len(bib) == 1
+    assert bib[0].title == "seqtool: fast alignment of long reads"
+    assert bib[0].authors == ["Jane Doe", "Jose Smith"]
+    assert (bib[0].journal, bib[0].year) == ("Bioinformatics", 2021)
+
+
+def test_readme_citation_section_and_identifiers():
+    """测试README引用章节中的BibTeX代码块和参考文献列表，跳过徽章和正文中的DOI
+
+    References章节不是引用方式，其中带标识符的条目只作为低可信度结果。
+    """
+    publications = readme_publications(README)
+    assert [(p.title, p.confidence) for p in publications] == [
+        ("seqtool: fast alignment of long reads", "high"),
+        ("Twelve years of SAMtools and BCFtools", "high"),
+        ("Variant calling in polyploid genomes", "high"),
+        (
+            "Fast and accurate short read alignment with Burrows-Wheeler transform",
+            "low",
+        ),
+    ]
+    danecek = publications[1]
+    assert danecek.authors[0] == "Danecek P"
+    assert (danecek.year, danecek.pmid, danecek.pmcid) == (
+        2021,
+        "33590861",
+        "PMC7931819",
+    )
+    assert publications[2].doi == "10.1101/gr.1234.119"
+
+
+def test_merge_and_extract_from_repo(tmp_path):
+    """测试按DOI合并多个来源的同一篇文章并补全缺失字段"""
+    merged = _merge(
+        [
+            Publication(
+                title="seqtool", authors=[], doi="10.1093/BIOINFORMATICS/btab001"
+            ),
+            Publication(title="Seqtool.", authors=[], pmid="123", year=2021),
+            Publication(
+                title="Other", authors=[], doi="10.1093/bioinformatics/btab001"
+            ),
+            Publication(title="Archive", authors=[], doi="10.5281/zenodo.1"),
+        ]
+    )
+    assert [(p.title, p.pmid, p.year) for p in merged] == [("seqtool", "123", 2021)]
+
+    _write(
+        tmp_path,
+        {
+            "CITATION.cff": CFF,
+            "docs/citation.bib": BIBTEX,
+            "paper.bib": "@article{x, title={Unrelated paper}}\n",
+            "README.md": README,
+        },
+    )
+    publications = extract_publications(LocalRepoFS(tmp_path))
+    assert [p.title for p in publications] == [
+        "seqtool: fast alignment of long reads",
+        "Twelve years of SAMtools and BCFtools",
+        "Variant calling in polyploid genomes",
+        "Fast and accurate short read alignment with Burrows-Wheeler transform",
+    ]
+    # 同一篇文章以CFF中的条目为准，BibTeX只补全缺失字段
+    assert publications[0].authors == ["Jane Doe", "Genome Lab"]
@@ -0,0 +1,63 @@
+"""文件内容缓存测试"""
+
+import sys
+
+from src.content_cache import ContentCache
+from src.github_analyzer import GitHubAnalyzer
+from src.repo_fs import LocalRepoFS
+from src.security_analyzer import SecurityAnalyzer
+
+from .test_repo_index import _write
+
+
+def test_cache_evicts_least_recently_used_within_budget():
+    """测试超出内存预算时淘汰最久未使用的条目，并统计命中"""
+    text = "x" * 1000
+    cache = ContentCache(max_bytes=sys.getsizeof(text) * 2)
+
+    cache.put("a", text)
+    cache.put("b", text)
+    assert cache.get("a") == text
+    cache.put("c", text)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == text and cache.get("c") == text
+    assert (len(cache), cache.hits, cache.misses, cache.evictions) == (2, 3, 1, 1)
+    assert cache.size <= cache.max_bytes
+    cache.put("huge", "y" * 10000)
+    assert cache.get("huge") is None
+
+
+def test_analyzers_share_file_reads(tmp_path, monkeypatch):
+    """测试作者提取、框架检测、入口识别和安全分析对同一文件只读取一次"""
+    repo = tmp_path / "repo"
+    _write(
+        repo,
+        {
+            "README.md": "# tool\n\nAuthor: Jane Doe\n",
+            "setup.py": "setup(name='tool', author='Jane Doe', entry_points={})\n",
+            "pyproject.toml": "[project]\nname = 'tool'\n",
+            "environment.yml": "dependencies:\n  - python\n",
+        },
+    )
+    reads = []
+    original = LocalRepoFS.read_prefix
+
+    def counting_read_prefix(self, rel_path, size):
+        reads.append(rel_path)
+        return original(self, rel_path, size)
+
+    monkeypatch.setattr(LocalRepoFS, "read_prefix", counting_read_prefix)
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+    repo_path = analyzer.clone_repository(repo.as_uri())
+
+    analyzer.extract_authors_from_repo(repo_path)
+    analyzer.analyze_project_architecture(repo_path)
+    security = SecurityAnalyzer(repo_path)
+    security._check_conda_environment(repo_path / "environment.yml")
+    security._check_conda_environment(repo_path / "environment.yml")
+
+    assert sorted(reads) == sorted(set(reads))
+    assert {"README.md", "setup.py", "environment.yml"} <= set(reads)
+    assert analyzer.content_cache.hits > 0
+    analyzer.release_workspaces()
@@ -0,0 +1,136 @@
+"""部署信息静态检测测试"""
+
+from src.deployment_detector import (
+    MAX_FILES_PER_KIND,
+    detect_deployment,
+    merge_deployment,
+)
+from src.models import DeploymentInfo
+from src.repo_fs import LocalRepoFS
+
+from .test_repo_index import _write
+
+
+def test_detects_nextflow_pipeline_and_packaging(tmp_path):
+    """测试从Nextflow配置、Galaxy工具、conda配方和Dockerfile检测部署字段"""
+    _write(
+        tmp_path,
+        {
+            "main.nf": "process ALIGN {\n    container 'biocontainers/bwa:0.7.17'\n}\n",
+            "nextflow.config": (
+                "manifest {\n    nextflowVersion = '!>=23.04.0'\n}\n"
+                'includeConfig "${projectDir}/conf/base.config"\n'
+                "profiles {\n"
+                "    docker { docker.enabled = true }\n"
+                "    singularity { singularity.enabled = true }\n"
+                "    conda { conda.enabled = true }\n"
+                "}\n"
+            ),
+            "galaxy/align.xml": (
+                '<tool id="align" name="Align" version="1.0">\n'
+                '  <requirements><container type="docker">img</container>'
+                "</requirements>\n</tool>\n"
+            ),
+            "tests/data/sample.xml": "<reads><read id='r1'/></reads>\n",
+            "recipe/meta.yaml": (
+                "{% set version = '1.0' %}\npackage:\n  name: tool\n"
+                "build:\n  skip: True  # [osx]\n"
+                "requirements:\n  run:\n    - python >=3.9\n"
+            ),
+            "docker/Dockerfile": "FROM ubuntu:22.04\n",
+            "pyproject.toml": "[project]\nname = 'tool'\nrequires-python = '>=3.9'\n",
+        },
+    )
+    deployment = detect_deployment(LocalRepoFS(tmp_path))
+
+    assert deployment.system_requirements == [
+        "Nextflow >=23.04.0",
+        "Python >=3.9",
+        "Linux",
+    ]
+    assert deployment.container_support == ["Docker", "Singularity"]
+    assert deployment.installation_methods == ["docker", "Galaxy", "conda", "pip"]
+    assert deployment.configuration_files == ["nextflow.config", "conf/base.config"]
+    assert deployment.cloud_deployment == []
+
+
+def test_detects_snakemake_and_merges_with_llm_result(tmp_path):
+    """测试Snakemake工作流检测，合并时静态检测的值在前、LLM补充的值追加"""
+    _write(
+        tmp_path,
+        {
+            "workflow/Snakefile": (
+                'from snakemake.utils import min_version\nmin_version("7.0")\n'
+                'configfile: "config/config.yaml"\n'
+                "rule align:\n    conda: 'envs/bwa.yaml'\n"
+                "    container: 'docker://biocontainers/bwa'\n"
+            ),
+            "node_modules/pkg/Dockerfile": "FROM node\n",
+        },
+    )
+    detected = detect_deployment(tmp_path)
+    assert detected.system_requirements == ["Snakemake >= 7.0"]
+    assert detected.configuration_files == ["config/config.yaml"]
+    # 第三方目录中的Dockerfile不计入
+    assert detected.container_support == ["Singularity"]
+
+    analyzed = DeploymentInfo(
+        installation_methods=["Conda", "bioconda"],
+        system_requirements=["Linux"],
+        container_support=[],
+        cloud_deployment=["AWS"],
+        configuration_files=[],
+    )
+    merged = merge_deployment(detected, analyzed)
+    assert merged.installation_methods == ["conda", "bioconda"]
+    assert merged.system_requirements == ["Snakemake >= 7.0", "Linux"]
+    assert merged.cloud_deployment == ["AWS"]
+    (tmp_path / "empty").mkdir()
+    assert merge_deployment(detect_deployment(tmp_path / "empty"), None) is None
+
+
+def test_data_xml_does_not_crowd_out_galaxy_tools(tmp_path):
+    """测试排在前面的大量数据XML不占用Galaxy工具的检查名额"""
+    files = {
+        f"data/sample{i:03}.xml": "<reads><read id='r1'/></reads>\n"
+        for i in range(MAX_FILES_PER_KIND + 8)
+    }
+    files["tools/align.xml"] = (
+        '<tool id="align" name="Align" version="1.0">\n'
+        '  <requirements><container type="singularity">img</container>'
+        "</requirements>\n</tool>\n"
+    )
+    _write(tmp_path, files)
+    deployment = detect_deployment(LocalRepoFS(tmp_path))
+
+    assert deployment.installation_methods == ["Galaxy"]
+    assert deployment.container_support == ["Singularity"]
+
+
+def test_install_methods_need_publishable_package(tmp_path):
+    """测试只有依赖声明的清单文件不计为安装方式"""
+    _write(
+        tmp_path / "tool",
+        {
+            "package.json": '{"private": true, "devDependencies": {"jest": "29"}}',
+            "pyproject.toml": "[tool.black]\nline-length = 88\n",
+            "setup.cfg": "[flake8]\nmax-line-length = 88\n",
+            "Cargo.toml": '[workspace]\nmembers = ["cli"]\n',
+            "requirements.txt": "numpy\n",
+        },
+    )
+    assert detect_deployment(tmp_path / "tool").installation_methods == []
+
+    _write(
+        tmp_path / "lib",
+        {
+            "package.json": '{"name": "seqviz", "dependencies": {"react": "18"}}',
+            "pyproject.toml": "[tool.poetry]\nname = 'seqviz'\n",
+            "Cargo.toml": '[package]\nname = "seqviz"\n',
+        },
+    )
+    assert detect_deployment(tmp_path / "lib").installation_methods == [
+        "pip",
+        "npm",
+        "cargo",
+    ]
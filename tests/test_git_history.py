@@ -0,0 +1,89 @@
+"""Git提交历史统计测试"""
+
+from src.git_history import get_git_history
+from src.github_analyzer import GitHubAnalyzer
+from src.repo_cache import MirrorCache
+from src.repo_fs import GitObjectFS, LocalRepoFS
+
+from .conftest import git
+
+DAY = 86400
+# 2024-01-01T00:00:00Z
+START = 1704067200
+
+
+def _commit(repo, author, day, message="update"):
+    (repo / "CHANGES").open("a").write(f"{message}\n")
+    git(repo, "add", "-A")
+    git(
+        repo,
+        "commit",
+        "-q",
+        "-m",
+        message,
+        f"--author={author}",
+        f"--date=@{START + day * DAY}",
+    )
+
+
+def test_history_counts_authors_with_mailmap(make_git_repo):
+    """测试按 .mailmap 合并作者身份，统计提交数、首末提交和活跃度"""
+    repo = make_git_repo()
+    # 夹具的初始提交改到前一天
+    git(repo, "commit", "-q", "--amend", "--no-edit", f"--date=@{START - DAY}")
+    _commit(repo, "J. Doe <jdoe@old.org>", 0)
+    _commit(repo, "John Smith <john@example.org>", 10)
+    _commit(repo, "Jane Doe <jane@example.org>", 40)
+    _commit(repo, "jane doe <jane@example.org>", 70)
+    (repo / ".mailmap").write_text("Jane Doe <jane@example.org> <jdoe@old.org>\n")
+    _commit(repo, "Jane Doe <jane@example.org>", 100, "mailmap")
+
+    history = get_git_history(LocalRepoFS(repo))
+    authors = [
+        (a.name, a.email, a.commit_count, a.first_commit, a.last_commit)
+        for a in history.author_infos()
+    ]
+    assert authors[0] == ("Jane Doe", "jane@example.org", 4, "2024-01-01", "2024-04-10")
+    # 提交数相同时先出现的作者在前
+    assert [a[0] for a in authors[1:]] == ["Tester", "John Smith"]
+    assert authors[2][3:] == ("2024-01-11", "2024-01-11")
+
+    activity = history.activity(now=START + 400 * DAY)
+    assert (activity.total_commits, activity.contributors) == (6, 3)
+    assert (activity.first_commit, activity.last_commit) == ("2023-12-31", "2024-04-10")
+    assert (activity.active_months, activity.commits_per_month) == (5, 1.2)
+    assert activity.median_days_between_commits == 30.0
+    assert (activity.commits_last_year, activity.days_since_last_commit) == (3, 300)
+    assert not activity.shallow
+
+
+def test_history_of_revision_uses_its_mailmap(tmp_path, make_git_repo):
+    """测试读取裸仓库中指定提交的历史，使用该提交中的 .mailmap"""
+    repo = make_git_repo()
+    (repo / ".mailmap").write_text("Jane Doe <jane@example.org> <jdoe@old.org>\n")
+    _commit(repo, "J. Doe <jdoe@old.org>", 0)
+    _commit(repo, "Jane Doe <jane@example.org>", 30)
+    old = git(repo, "rev-parse", "HEAD").strip()
+    (repo / ".mailmap").unlink()
+    _commit(repo, "J. Doe <jdoe@old.org>", 60)
+    mirror = MirrorCache(tmp_path / "mirrors", 1 << 30).ensure_mirror(str(repo))
+
+    history = get_git_history(GitObjectFS(mirror, old))
+    assert [(a.name, a.commits) for a in history.authors] == [
+        ("Jane Doe", 2),
+        ("Tester", 1),
+    ]
+    latest = get_git_history(GitObjectFS(mirror))
+    assert sorted(a.name for a in latest.authors) == ["J. Doe", "Jane Doe", "Tester"]
+
+
+def test_readme_authors_gain_commit_stats(tmp_path, make_git_repo):
+    """测试README中的作者与Git历史中的同名作者合并提交统计"""
+    repo = make_git_repo(files={"README.md": "# tool\n\nAuthor: Jane Doe\n"})
+    _commit(repo, "Jane Doe <jane@example.org>", 0)
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    authors = analyzer.extract_authors_from_repo(LocalRepoFS(repo))
+    assert (authors[0].name, authors[0].role) == ("Jane Doe", "author")
+    assert (authors[0].email, authors[0].commit_count) == ("jane@example.org", 1)
+    assert analyzer.analyze_commit_activity(tmp_path / "work") is None
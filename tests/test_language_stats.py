@@ -0,0 +1,39 @@
+"""语言占比统计测试"""
+
+from src.github_analyzer import GitHubAnalyzer
+from src.language_stats import compute_language_stats
+from src.repo_fs import LocalRepoFS
+
+from .test_repo_index import _write
+
+
+def test_language_share_is_weighted_by_bytes(tmp_path):
+    """测试语言按字节加权排序，第三方和生成文件不计入"""
+    _write(
+        tmp_path,
+        {
+            "src/aligner.c": "int x;\n" * 1000,
+            "src/aligner.h": "",
+            "scripts/run.sh": "#!/bin/sh\necho hi\n",
+            "htslib/vendor/bgzf.c": "int y;\n" * 5000,
+            "third_party/zlib/inflate.c": "int z;\n" * 5000,
+            "python/msg_pb2.py": "x = 1\n" * 5000,
+            "setup.py": "setup()",
+        },
+    )
+
+    stats = compute_language_stats(LocalRepoFS(tmp_path))
+
+    assert [(s.language, s.files, s.bytes, s.lines) for s in stats] == [
+        ("C", 1, 7000, 1000),
+        ("Shell", 1, 18, 2),
+        ("Python", 1, 7, 1),
+    ]
+    assert stats[0].byte_share == round(7000 / 7025, 4)
+    assert stats[0].line_share == round(1000 / 1003, 4)
+
+    architecture = GitHubAnalyzer(
+        tmp_dir=str(tmp_path / ".work")
+    ).analyze_project_architecture(tmp_path)
+    assert architecture.programming_languages == ["C", "Shell", "Python"]
+    assert architecture.language_stats == stats
@@ -0,0 +1,172 @@
+"""依赖清单解析测试"""
+
+import sys
+
+from src.github_analyzer import GitHubAnalyzer
+from src.manifests import (
+    get_dependency_graph,
+    parse_package_json,
+    parse_pom_xml,
+    parse_pyproject,
+    parse_r_description,
+    parse_setup_py,
+)
+from src.repo_fs import LocalRepoFS
+from src.security_analyzer import SecurityAnalyzer
+
+from .test_repo_index import _write
+
+
+def test_parsers_extract_names_specs_and_scopes():
+    """测试各生态清单文件解析出规范化包名、版本约束和依赖范围"""
+    pyproject = parse_pyproject(
+        "[project]\n"
+        'dependencies = ["NumPy>=1.20", "scikit_learn"]\n'
+        "[project.optional-dependencies]\n"
+        'test = ["pytest"]\n'
+        "[build-system]\n"
+        'requires = ["setuptools"]\n',
+        "pyproject.toml",
+    )
+    assert [(d.name, d.spec, d.scope) for d in pyproject] == [
+        ("numpy", ">=1.20", "runtime"),
+        ("scikit-learn", None, "runtime"),
+        ("pytest", None, "optional"),
+        ("setuptools", None, "build"),
+    ]
+
+    # Poetry按Python版本分别声明的多个约束合并为一条依赖
+    poetry = parse_pyproject(
+        "[tool.poetry.dependencies]\n"
+        'python = "^3.9"\n'
+        "pandas = [\n"
+        '  {version = "<2", python = "<3.9"},\n'
+        '  {version = ">=2", python = ">=3.9"},\n'
+        "]\n"
+        'pysam = {version = "^0.22", optional = true}\n',
+        "pyproject.toml",
+    )
+    assert [(d.name, d.spec) for d in poetry] == [
+        ("pandas", "<2 || >=2"),
+        ("pysam", "^0.22"),
+    ]
+
+    # setup.py 只做静态解析，不会执行其中的代码
+    setup_py = parse_setup_py(
+        "import os\nREQS = ['pysam']\n"
+        "os.system('exit 1')\n"
+        "setup(name='tool', install_requires=REQS + ['biopython>=1.79'])\n",
+        "setup.py",
+    )
+    assert [d.name for d in setup_py] == ["pysam", "biopython"]
+
+    package_json = parse_package_json(
+        '{"dependencies": {"react": "^18"}, "devDependencies": {"jest": "29"}}',
+        "package.json",
+    )
+    assert [(d.name, d.scope) for d in package_json] == [
+        ("react", "runtime"),
+        ("jest", "dev"),
+    ]
+
+    description = parse_r_description(
+        "Package: tool\nImports: Rcpp (>= 1.0),\n    ggplot2\nSuggests: testthat\n",
+        "DESCRIPTION",
+    )
+    assert [(d.name, d.scope) for d in description] == [
+        ("rcpp", "runtime"),
+        ("ggplot2", "runtime"),
+        ("testthat", "optional"),
+    ]
+
+    pom = parse_pom_xml(
+        '<project xmlns="http://maven.apache.org/POM/4.0.0">'
+        "<properties><spring.version>6.1</spring.version></properties>"
+        "<dependencies><dependency><groupId>org.springframework</groupId>"
+        "<artifactId>spring-core</artifactId><version>${spring.version}</version>"
+        "</dependency></dependencies></project>",
+        "pom.xml",
+    )
+    assert [(d.name, d.spec) for d in pom] == [
+        ("org.springframework:spring-core", "6.1")
+    ]
+
+
+def test_requirements_includes_and_framework_detection(tmp_path):
+    """测试 -r 引用链和框架检测不再因文件中的子串误判"""
+    _write(
+        tmp_path,
+        {
+            "requirements.txt": "-r requirements/base.txt\nflask==3.0  # web\n",
+            "requirements/base.txt": "-r ../requirements.txt\nnumpy\n",
+            "requirements-dev.txt": "pytest\n",
+            # 仅在脚本名和描述中出现的 dashboard / next 不应被识别为框架
+            "package.json": '{"name": "dashboard", "scripts": {"next": "node x"}}',
+            "setup.cfg": "[metadata]\nname = dashboard\n",
+        },
+    )
+    repo_fs = LocalRepoFS(tmp_path)
+    graph = get_dependency_graph(repo_fs)
+
+    assert get_dependency_graph(repo_fs) is graph
+    assert graph.includes["requirements.txt"] == ["requirements/base.txt"]
+    assert graph.requirement_lines() == ["flask==3.0", "numpy"]
+    assert [d.name for d in graph.select(scopes=["dev"])] == ["pytest"]
+
+    frameworks = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))._detect_frameworks(
+        repo_fs
+    )
+    assert frameworks == ["Flask", "NumPy"]
+
+
+def test_requirements_includes_stay_inside_repo(tmp_path):
+    """测试 -r 引用不跟随绝对路径、仓库之外和不存在的文件"""
+    (tmp_path / "outside.txt").write_text("leaked-package\n")
+    repo = tmp_path / "repo"
+    _write(
+        repo,
+        {
+            "requirements.txt": (
+                "-r ../outside.txt\n"
+                f"-r {tmp_path / 'outside.txt'}\n"
+                "--requirement=docs/../../outside.txt\n"
+                "-r missing.txt\n"
+                "numpy\n"
+            ),
+        },
+    )
+    graph = get_dependency_graph(LocalRepoFS(repo))
+
+    assert graph.includes == {}
+    assert graph.requirement_lines() == ["numpy"]
+
+
+def test_security_uses_parsed_dependencies(tmp_path):
+    """测试安全分析从conda环境和setup.py解析Python依赖"""
+    _write(
+        tmp_path,
+        {
+            "environment.yml": (
+                "dependencies:\n  - python=3.11\n  - pip\n"
+                "  - pip:\n    - requests>=2.0\n"
+            ),
+            "setup.py": "setup(install_requires=['pyyaml'])\n",
+        },
+    )
+    security = SecurityAnalyzer(tmp_path)
+
+    assert security._has_python_dependencies()
+    assert security.dependencies.requirement_lines("environment.yml") == [
+        "requests>=2.0"
+    ]
+    assert "pyyaml" in security.dependencies.requirement_lines()
+
+
+def test_conda_check_warns_without_pyyaml(tmp_path, monkeypatch, capsys):
+    """测试未安装PyYAML时conda检查给出提示，而不是报告没有pip依赖"""
+    _write(tmp_path, {"environment.yml": "dependencies:\n  - pip:\n    - requests\n"})
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    security = SecurityAnalyzer(tmp_path)
+
+    assert security._check_conda_environment(tmp_path / "environment.yml") == []
+    assert "PyYAML未安装" in capsys.readouterr().out
@@ -0,0 +1,284 @@
+"""仓库镜像缓存测试"""
+
+from src.config import config_manager
+from src.github_analyzer import GitHubAnalyzer
+from src.models import RepositoryInfo
+from src.repo_cache import MirrorCache, run_git
+from src.repo_fs import LocalRepoFS
+from src.repo_workspace import (
+    SPARSE_FILES_ONLY,
+    RepoWorkspace,
+    compile_path_pattern,
+    ensure_local_file,
+    get_workspace,
+    parent_dir,
+    parse_size,
+    register_workspace,
+    sparse_directories,
+)
+
+from .conftest import git
+
+
+def test_mirror_reused_with_incremental_fetch(tmp_path, make_git_repo):
+    """测试镜像首次克隆后仅增量更新"""
+    upstream = make_git_repo(files={"README.md": "v1\n"})
+    cache = MirrorCache(tmp_path / "mirrors", max_bytes=1 << 30)
+
+    mirror = cache.ensure_mirror(str(upstream))
+    checkout = cache.checkout(mirror, tmp_path / "wt")
+    assert (checkout / "README.md").read_text() == "v1\n"
+
+    (upstream / "README.md").write_text("v2\n")
+    git(upstream, "commit", "-qam", "update")
+
+    assert cache.ensure_mirror(str(upstream)) == mirror
+    checkout = cache.checkout(mirror, tmp_path / "wt")
+    assert (checkout / "README.md").read_text() == "v2\n"
+    assert run_git(["rev-parse", "HEAD"], cwd=checkout) == run_git(
+        ["rev-parse", "HEAD"], cwd=upstream
+    )
+
+
+def test_mirror_eviction_keeps_recent(tmp_path, make_git_repo):
+    """测试超出配额时淘汰最久未使用的镜像"""
+    first = make_git_repo("first")
+    second = make_git_repo("second")
+    cache = MirrorCache(tmp_path / "mirrors", max_bytes=1 << 30)
+
+    old_mirror = cache.ensure_mirror(str(first))
+    cache.max_bytes = 1
+    new_mirror = cache.ensure_mirror(str(second))
+
+    assert new_mirror.exists()
+    assert not old_mirror.exists()
+
+
+def test_partial_checkout_hydrates_on_demand(tmp_path, make_git_repo):
+    """测试部分克隆只检出小文件，大文件在读取时按需获取"""
+    upstream = make_git_repo(
+        files={"README.md": "# demo\n", "data/genome.fa": "A" * 200_000}
+    )
+    git(upstream, "config", "uploadpack.allowFilter", "true")
+    cache = MirrorCache(tmp_path / "mirrors", max_bytes=1 << 30)
+
+    mirror = cache.ensure_mirror(upstream.as_uri(), blob_limit="10k")
+    assert cache.is_partial(mirror)
+
+    checkout = tmp_path / "wt"
+    missing = cache.partial_checkout(mirror, checkout)
+    assert missing == ["data/genome.fa"]
+    assert (checkout / "README.md").exists()
+    assert not (checkout / "data" / "genome.fa").exists()
+
+    register_workspace(RepoWorkspace(checkout, missing, parse_size("10k")))
+    assert ensure_local_file(checkout, checkout / "data" / "genome.fa")
+    assert (checkout / "data" / "genome.fa").stat().st_size == 200_000
+    assert not ensure_local_file(checkout, checkout / "absent.txt")
+
+
+def test_sparse_checkout_widens_on_demand(tmp_path, make_git_repo):
+    """测试稀疏检出只包含声明的目录，其他文件读取时扩大检出范围"""
+    upstream = make_git_repo(
+        files={
+            "README.md": "# demo\n",
+            "tests/test_core.py": "def test(): pass\n",
+            "tests/data/reads.bam": "BAM",
+            "src/deep/nested/align.c": "int main;\n",
+        }
+    )
+    cache = MirrorCache(tmp_path / "mirrors", max_bytes=1 << 30)
+    mirror = cache.ensure_mirror(str(upstream))
+    tree_paths = [rel for _, rel in cache.list_tree(mirror)]
+
+    directories = sparse_directories(tree_paths, ["tests/*"])
+    assert directories == {"tests"}
+
+    checkout = tmp_path / "wt"
+    cache.sparse_checkout(
+        mirror, checkout, [f"{d}/{SPARSE_FILES_ONLY}" for d in directories]
+    )
+    assert (checkout / "README.md").exists()
+    assert (checkout / "tests" / "test_core.py").exists()
+    assert not (checkout / "tests" / "data").exists()
+    assert not (checkout / "src").exists()
+
+    missing = [p for p in tree_paths if "/" in p and parent_dir(p) not in directories]
+    register_workspace(RepoWorkspace(checkout, missing, sparse=True))
+    assert ensure_local_file(checkout, checkout / "src/deep/nested/align.c")
+    assert not (checkout / "tests" / "data").exists()
+
+
+def test_compile_path_pattern():
+    """测试路径通配符不跨越目录"""
+    assert compile_path_pattern("*align*").match("src/deep/bwa_align.c")
+    assert compile_path_pattern("tests/*").match("tests/test_a.py")
+    assert not compile_path_pattern("tests/*").match("tests/data/x.bam")
+    assert not compile_path_pattern("tests/*").match("lib/tests/x.py")
+
+
+def test_clone_repository_sparse_keeps_directory_skeleton(
+    tmp_path, make_git_repo, monkeypatch
+):
+    """测试稀疏克隆保留前三层目录骨架，未检出的文件按真实大小列出"""
+    upstream = make_git_repo(
+        files={
+            "README.md": "# demo\n",
+            "a/b/c/d/deep.txt": "x" * 5000,
+            "scripts/run.sh": "x",
+        }
+    )
+    monkeypatch.setattr(config_manager.config, "clone_sparse", True)
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    clone_path = analyzer.clone_repository(str(upstream))
+
+    assert (clone_path / "scripts" / "run.sh").exists()
+    assert (clone_path / "a" / "b" / "c").is_dir()
+    assert not (clone_path / "a" / "b" / "c" / "d").exists()
+    assert get_workspace(clone_path).missing_paths == {"a/b/c/d/deep.txt"}
+    assert LocalRepoFS(clone_path).entry("a/b/c/d/deep.txt").size == 5000
+
+
+def test_local_repository_analyzed_in_place(tmp_path, make_git_repo, monkeypatch):
+    """测试file://本地仓库默认原地只读分析，不复制"""
+    local = make_git_repo("pipeline")
+    monkeypatch.setattr(config_manager.config, "local_ingest_mode", "inplace")
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    repo_path = analyzer.clone_repository(local.as_uri())
+
+    assert repo_path == local
+    assert not (tmp_path / "work" / "pipeline").exists()
+    assert get_workspace(repo_path).read_only
+
+
+def test_local_repository_snapshot(tmp_path, make_git_repo, monkeypatch):
+    """测试快照模式与源目录共享文件内容"""
+    local = make_git_repo("pipeline", files={"main.nf": "workflow {}\n"})
+    monkeypatch.setattr(config_manager.config, "local_ingest_mode", "snapshot")
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    repo_path = analyzer.clone_repository(local.as_uri())
+
+    assert repo_path.parent == tmp_path / "work" / "local"
+    assert (repo_path / "main.nf").read_text() == "workflow {}\n"
+    assert (repo_path / ".git").is_dir()
+
+    analyzer.release_workspaces()
+    assert not repo_path.exists()
+    assert (local / "main.nf").exists()
+
+
+def test_plan_acquisition_by_repository_size(tmp_path, monkeypatch):
+    """测试按仓库大小和时间预算自动选择获取策略"""
+    settings = config_manager.config
+    monkeypatch.setattr(settings, "clone_strategy", "auto")
+    monkeypatch.setattr(settings, "auto_full_max_mb", 100)
+    monkeypatch.setattr(settings, "auto_partial_max_mb", 500)
+    monkeypatch.setattr(settings, "repo_hard_limit_mb", 2000)
+    monkeypatch.setattr(settings, "clone_time_budget", 60)
+    monkeypatch.setattr(settings, "clone_bandwidth_mb_s", 1.0)
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    def plan(size_mb):
+        info = RepositoryInfo(
+            name="demo", url="https://github.com/o/demo", size_kb=size_mb * 1024
+        )
+        return analyzer.plan_acquisition(info)
+
+    assert analyzer.plan_acquisition(None) == "full"
+    assert plan(50) == "full"
+    # 未超过完整克隆大小上限，但预计耗时超出时间预算
+    assert plan(80) == "partial"
+    assert plan(400) == "partial"
+    assert plan(1500) == "shallow-partial"
+    assert plan(3000) == "metadata"
+
+    monkeypatch.setattr(settings, "clone_strategy", "archive")
+    assert plan(3000) == "archive"
+
+
+def test_shallow_partial_mirror_skips_history_and_large_blobs(
+    tmp_path, make_git_repo, monkeypatch
+):
+    """测试最大一档仓库只获取最新提交，且大文件延迟获取"""
+    upstream = make_git_repo(files={"README.md": "v1\n"})
+    (upstream / "data.bin").write_text("A" * 200_000)
+    git(upstream, "add", "-A")
+    git(upstream, "commit", "-qm", "add data")
+    git(upstream, "config", "uploadpack.allowFilter", "true")
+    monkeypatch.setattr(config_manager.config, "clone_blob_limit", "10k")
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    depth, blob_limit = analyzer._clone_options("shallow-partial")
+    assert (depth, blob_limit) == (1, "10k")
+    cache = MirrorCache(tmp_path / "mirrors", max_bytes=1 << 30)
+    mirror = cache.ensure_mirror(upstream.as_uri(), depth=depth, blob_limit=blob_limit)
+
+    assert cache.is_partial(mirror) and (mirror / "shallow").exists()
+    assert run_git(["rev-list", "--count", "HEAD"], cwd=mirror).strip() == "1"
+    assert cache.partial_checkout(mirror, tmp_path / "wt") == ["data.bin"]
+
+
+def _fork(tmp_path, upstream, name):
+    """基于上游创建带独有提交的fork"""
+    fork = tmp_path / name
+    git(tmp_path, "clone", "-q", str(upstream), str(fork))
+    (fork / "patch.txt").write_text(f"{name}\n")
+    git(fork, "add", "-A")
+    git(fork, "commit", "-q", "-m", "fork change")
+    return fork
+
+
+def _local_object_count(mirror):
+    """统计镜像本地(不含alternates)的对象数"""
+    stats = dict(
+        line.split(": ")
+        for line in run_git(["count-objects", "-v"], cwd=mirror).splitlines()
+    )
+    return int(stats["count"]) + int(stats["in-pack"])
+
+
+def test_fork_mirror_shares_upstream_objects(tmp_path, make_git_repo):
+    """测试fork镜像通过alternates复用上游对象，无关仓库不共享"""
+    upstream = make_git_repo(files={f"src/mod{i}.py": f"x = {i}\n" for i in range(20)})
+    fork = _fork(tmp_path, upstream, "fork")
+    unrelated = make_git_repo("other", files={"README.md": "other\n"})
+    cache = MirrorCache(tmp_path / "mirrors", max_bytes=1 << 30)
+
+    upstream_mirror = cache.ensure_mirror(upstream.as_uri(), network="lab/upstream")
+    other_mirror = cache.ensure_mirror(unrelated.as_uri(), network="lab/other")
+    # 克隆前只按fork网络选择候选镜像
+    fork_mirror = cache.mirror_path(fork.as_uri())
+    assert cache._alternate_candidates(fork_mirror, "lab/upstream") == [upstream_mirror]
+    cache.ensure_mirror(fork.as_uri(), network="lab/upstream")
+
+    assert cache.alternates(fork_mirror) == [(upstream_mirror / "objects").resolve()]
+    assert cache.alternates(other_mirror) == []
+    # fork本地只保存独有的提交、根目录树和新文件blob
+    assert _local_object_count(fork_mirror) == 3
+    assert _local_object_count(upstream_mirror) > 20
+    checkout = cache.checkout(fork_mirror, tmp_path / "wt")
+    assert (checkout / "src" / "mod3.py").read_text() == "x = 3\n"
+    assert (checkout / "patch.txt").read_text() == "fork\n"
+
+
+def test_evicting_upstream_dissociates_forks(tmp_path, make_git_repo):
+    """测试淘汰上游镜像前fork复制所需对象并解除共享"""
+    upstream = make_git_repo(files={"README.md": "upstream\n"})
+    fork = _fork(tmp_path, upstream, "fork")
+    cache = MirrorCache(tmp_path / "mirrors", max_bytes=1 << 30)
+    upstream_mirror = cache.ensure_mirror(upstream.as_uri(), network="lab/upstream")
+    fork_mirror = cache.ensure_mirror(fork.as_uri(), network="lab/upstream")
+    assert cache.alternates(fork_mirror)
+
+    cache._touch(fork_mirror)
+    cache.max_bytes = 1
+    cache.evict(keep=fork_mirror)
+
+    assert not upstream_mirror.exists()
+    assert cache.alternates(fork_mirror) == []
+    run_git(["fsck", "--connectivity-only"], cwd=fork_mirror)
+    checkout = cache.checkout(fork_mirror, tmp_path / "wt")
+    assert (checkout / "README.md").read_text() == "upstream\n"
@@ -0,0 +1,175 @@
+"""仓库虚拟文件系统测试"""
+
+import os
+
+from src.github_analyzer import GitHubAnalyzer
+from src.repo_cache import MirrorCache
+from src.repo_fs import GitObjectFS, LocalRepoFS
+from src.repo_workspace import RepoWorkspace, get_workspace, register_workspace
+
+from .conftest import git
+
+FILES = {
+    "README.md": "# demo\n\nAuthor: Jane Doe\n",
+    "setup.py": "setup(name='demo', author='Jane Doe')\n",
+    "src/core.py": "def align():\n    pass\n",
+    "scripts/run.sh": "#!/bin/sh\n",
+    "tests/test_core.py": "def test_align():\n    pass\n",
+    "config/default.yaml": "threads: 4\n",
+}
+
+
+def test_git_object_fs_reads_without_checkout(tmp_path, make_git_repo):
+    """测试直接从裸仓库读取文件树和内容"""
+    upstream = make_git_repo(files=FILES)
+    os.chmod(upstream / "scripts" / "run.sh", 0o755)
+    git(upstream, "add", "-A")
+    git(upstream, "commit", "-q", "-m", "chmod")
+    mirror = MirrorCache(tmp_path / "mirrors", 1 << 30).ensure_mirror(str(upstream))
+
+    repo_fs = GitObjectFS(mirror)
+
+    assert [e.name for e in repo_fs.list_dir()] == [
+        "README.md",
+        "config",
+        "scripts",
+        "setup.py",
+        "src",
+        "tests",
+    ]
+    assert repo_fs.is_dir("src") and repo_fs.is_file("src/core.py")
+    assert repo_fs.entry("src/core.py").size == len(FILES["src/core.py"])
+    assert repo_fs.entry("scripts/run.sh").executable
+    assert repo_fs.read_text("README.md") == FILES["README.md"]
+    assert repo_fs.read_text("missing.txt") is None
+    assert [e.path for e in repo_fs.rglob("*.py")] == [
+        "setup.py",
+        "src/core.py",
+        "tests/test_core.py",
+    ]
+    repo_fs.close()
+
+
+def test_architecture_matches_between_checkout_and_objects(tmp_path, make_git_repo):
+    """测试对象库文件系统与检出目录得到相同的架构分析结果"""
+    upstream = make_git_repo(files=FILES)
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    from_checkout = analyzer.analyze_project_architecture(upstream)
+    repo_fs = analyzer.open_revision(str(upstream))
+    from_objects = analyzer.analyze_project_architecture(repo_fs)
+
+    # 检出中的.git不计入目录结构，两者结果应一致
+    assert from_objects.directory_structure == from_checkout.directory_structure
+    for field in ("programming_languages", "main_components", "config_files"):
+        assert sorted(getattr(from_objects, field)) == sorted(
+            getattr(from_checkout, field)
+        )
+    assert from_objects.test_structure == from_checkout.test_structure
+    assert analyzer.read_file_content(repo_fs, "README") == FILES["README.md"]
+    repo_fs.close()
+
+
+def test_multiple_revisions_open_side_by_side(tmp_path, make_git_repo):
+    """测试同时打开同一仓库的多个版本"""
+    upstream = make_git_repo(files={"VERSION": "1\n"})
+    git(upstream, "tag", "v1")
+    (upstream / "VERSION").write_text("2\n")
+    git(upstream, "commit", "-q", "-am", "bump")
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    old = analyzer.open_revision(str(upstream), "v1")
+    new = analyzer.open_revision(str(upstream))
+
+    assert old.read_text("VERSION") == "1\n"
+    assert new.read_text("VERSION") == "2\n"
+    assert old.commit != new.commit
+    old.close()
+    new.close()
+
+
+def test_local_fs_lists_and_hydrates_missing_files(tmp_path):
+    """测试本地工作区中延迟获取的文件可被遍历并在读取时补全"""
+    root = tmp_path / "ws"
+    root.mkdir()
+    (root / "README.md").write_text("hi")
+
+    def hydrator(rel_path):
+        target = root / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("fetched")
+
+    register_workspace(
+        RepoWorkspace(
+            root,
+            missing_paths=["data/big/ref.fa"],
+            missing_size_floor=1 << 20,
+            hydrator=hydrator,
+        )
+    )
+
+    repo_fs = LocalRepoFS(root)
+    walked = [e.path for _, _, files in repo_fs.walk() for e in files]
+
+    assert walked == ["README.md", "data/big/ref.fa"]
+    assert repo_fs.entry("data/big/ref.fa").size == 1 << 20
+    assert repo_fs.read_text("data/big/ref.fa") == "fetched"
+
+
+LFS_POINTER = (
+    "version https://git-lfs.github.com/spec/v1\n"
+    f"oid sha256:{'a' * 64}\n"
+    "size 3000000000\n"
+)
+
+
+def test_lfs_pointers_and_submodules_recorded(tmp_path, make_git_repo, monkeypatch):
+    """测试LFS指针和子模块被记录而不是获取"""
+    sub = make_git_repo("htslib", files={"hts.c": "int main;\n"})
+    upstream = make_git_repo(
+        files={
+            ".gitattributes": "*.fa filter=lfs diff=lfs merge=lfs -text\n",
+            "ref/hg38.fa": LFS_POINTER,
+            "ref/notes.fa": ">chr1\nACGT\n",
+        }
+    )
+    git(
+        upstream,
+        "-c",
+        "protocol.file.allow=always",
+        "submodule",
+        "add",
+        "-q",
+        sub.as_uri(),
+        "third_party/htslib",
+    )
+    git(upstream, "commit", "-q", "-m", "add submodule")
+    # 用户全局配置要求LFS且开启子模块递归，获取时应被覆盖
+    global_config = tmp_path / "gitconfig"
+    global_config.write_text(
+        '[filter "lfs"]\n\tsmudge = false\n\trequired = true\n'
+        "[submodule]\n\trecurse = true\n"
+    )
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(global_config))
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    repo_path = analyzer.clone_repository(str(upstream))
+    architecture = analyzer.analyze_project_architecture(repo_path)
+
+    assert (repo_path / "ref" / "hg38.fa").read_text() == LFS_POINTER
+    assert not any((repo_path / "third_party" / "htslib").iterdir())
+    assert [(f.path, f.size) for f in architecture.lfs_files] == [
+        ("ref/hg38.fa", 3000000000)
+    ]
+    [submodule] = architecture.submodules
+    assert submodule.path == "third_party/htslib"
+    assert submodule.url == sub.as_uri()
+    assert submodule.commit == git(sub, "rev-parse", "HEAD").strip()
+    # 未启用补全时分析器请求子模块不会触发下载
+    assert not get_workspace(repo_path).hydrate_submodule("third_party/htslib")
+
+    from_objects = analyzer.analyze_project_architecture(
+        analyzer.open_revision(str(upstream))
+    )
+    assert from_objects.lfs_files == architecture.lfs_files
+    assert from_objects.submodules == architecture.submodules
@@ -0,0 +1,288 @@
+"""仓库文件清单测试"""
+
+import os
+
+import pytest
+
+from src.github_analyzer import GitHubAnalyzer
+from src.repo_fs import GitObjectFS, LocalRepoFS
+from src.repo_index import PatternClassifier, RepoIndex, get_repo_index
+from src.repo_workspace import RepoWorkspace, register_workspace
+from src.security_analyzer import SecurityAnalyzer
+
+from .conftest import git
+
+
+def _write(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_index_records_size_mode_extension_and_depth(tmp_path):
+    """测试清单记录文件元数据，且不进入.git目录"""
+    _write(
+        tmp_path,
+        {
+            "README.md": "hello",
+            "scripts/run.sh": "#!/bin/sh\n",
+            "src/pkg/stats.R": "x <- 1\n",
+            ".git/HEAD": "ref: refs/heads/main\n",
+        },
+    )
+    os.chmod(tmp_path / "scripts" / "run.sh", 0o755)
+
+    index = RepoIndex.build(LocalRepoFS(tmp_path))
+
+    assert [f.path for f in index.files] == [
+        "README.md",
+        "scripts/run.sh",
+        "src/pkg/stats.R",
+    ]
+    readme = index.file("README.md")
+    assert (readme.size, readme.extension, readme.depth) == (5, ".md", 0)
+    assert index.file("scripts/run.sh").executable
+    assert not readme.executable
+    assert index.file("src/pkg/stats.R").depth == 2
+    assert [f.path for f in index.by_extension(".R")] == ["src/pkg/stats.R"]
+    assert [e.name for e in index.list_dir()] == [".git", "README.md", "scripts", "src"]
+    assert index.is_dir("src/pkg") and not index.exists(".git/HEAD")
+
+
+def test_worktree_git_file_is_not_indexed(tmp_path):
+    """测试worktree检出中的.git文件不计入清单和目录结构"""
+    repo = tmp_path / "repo"
+    _write(repo, {".git": "gitdir: /mirrors/demo.git/worktrees/abc\n", "main.py": ""})
+    repo_fs = LocalRepoFS(repo)
+
+    assert [e.name for e in get_repo_index(repo_fs).list_dir()] == ["main.py"]
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+    assert analyzer._analyze_directory_structure(repo_fs) == {"main.py": "根目录文件"}
+
+    # .git目录同样不列入目录结构
+    _write(
+        tmp_path / "checkout", {".git/HEAD": "ref: refs/heads/main\n", "src/a.py": ""}
+    )
+    assert analyzer._analyze_directory_structure(
+        LocalRepoFS(tmp_path / "checkout")
+    ) == {"src": "源代码目录"}
+
+
+def test_registered_workspace_is_walked_once(tmp_path, monkeypatch):
+    """测试登记过的工作区只遍历一次，架构分析和安全分析共享同一清单"""
+    _write(
+        tmp_path,
+        {
+            "setup.py": "setup(name='demo')\n",
+            "src/core.py": "def align():\n    pass\n",
+            "tests/test_core.py": "def test_align():\n    pass\n",
+        },
+    )
+    register_workspace(RepoWorkspace(tmp_path))
+    listed = []
+    original = LocalRepoFS.list_dir
+
+    def counting_list_dir(self, rel_path=""):
+        listed.append(rel_path)
+        return original(self, rel_path)
+
+    monkeypatch.setattr(LocalRepoFS, "list_dir", counting_list_dir)
+
+    architecture = GitHubAnalyzer(
+        tmp_dir=str(tmp_path / ".work")
+    ).analyze_project_architecture(tmp_path)
+    security = SecurityAnalyzer(tmp_path)
+
+    assert "Python" in architecture.programming_languages
+    assert architecture.test_structure == {"tests/test_core.py": "测试文件"}
+    assert security._has_python_code()
+    assert security.index is get_repo_index(tmp_path)
+    assert sorted(listed) == sorted(set(listed))
+
+
+def test_classify_assigns_each_file_to_first_matching_pattern(tmp_path):
+    """测试多模式分类：首个匹配模式优先，候选按深度排序，按目录名跳过"""
+    _write(
+        tmp_path,
+        {
+            "docker-compose.yml": "services: {}\n",
+            "main.py": "print()\n",
+            "lib/deep/core_utils.py": "",
+            "src/core.py": "",
+            "src/parse_document.py": "",
+            "docs/core.py": "",
+            "Examples/demo.py": "",
+        },
+    )
+    index = RepoIndex.build(LocalRepoFS(tmp_path))
+    classifier = PatternClassifier(
+        ["main.py", "*core*", "docker-compose.yml", "*.py", "*.R"]
+    )
+
+    ranked = index.classify(
+        classifier, lambda name: name.lower() in {"docs", "examples"}
+    )
+
+    assert {p: [f.path for f in files] for p, files in ranked.items()} == {
+        "main.py": ["main.py"],
+        "*core*": ["src/core.py", "lib/deep/core_utils.py"],
+        "docker-compose.yml": ["docker-compose.yml"],
+        "*.py": ["src/parse_document.py"],
+        "*.R": [],
+    }
+    assert classifier.classify("a/b/stats.R") == 4
+    assert classifier.classify("README.md") is None
+
+
+def test_case_insensitive_lookup_uses_directory_name_map(tmp_path, monkeypatch):
+    """测试read_file_content按casefold文件名表查找，不逐个探测文件系统"""
+    _write(
+        tmp_path,
+        {
+            "Readme.rst": "Aligner\n=======\n",
+            "readme.md": "# aligner\n",
+            "Setup.py": "setup(name='aligner')\n",
+            "docs/PYPROJECT.TOML": "",
+        },
+    )
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / ".work"))
+    index = get_repo_index(tmp_path)
+    monkeypatch.setattr(
+        LocalRepoFS, "entry", lambda self, rel_path: pytest.fail(rel_path)
+    )
+
+    assert index.find("README.RST").path == "Readme.rst"
+    assert index.find("docs/pyproject.toml").path == "docs/PYPROJECT.TOML"
+    assert index.find("pyproject.toml") is None
+    assert analyzer.read_file_content(tmp_path, "README") == "# aligner\n"
+    assert analyzer.read_file_content(tmp_path, "setup.py").startswith("setup(")
+    assert analyzer.read_file_content(tmp_path, "pom.xml") is None
+
+
+def test_walker_prunes_ignored_vendored_and_data_paths(tmp_path):
+    """测试遍历时遵循.gitignore和linguist标记，跳过捆绑源码和数据目录"""
+    files = {
+        ".gitignore": "build/\n*.log\n!keep.log\n",
+        ".gitattributes": "external/** linguist-vendored\n*.min.js linguist-generated\n",
+        "src/main.c": "int main;\n",
+        "src/app.min.js": "x",
+        "build/out.o": "",
+        "run.log": "",
+        "keep.log": "",
+        "external/zlib/inflate.c": "",
+        "htslib/LICENSE": "",
+        "htslib/configure.ac": "",
+        "htslib/bgzf.c": "",
+        "test_data/notes.md": "",
+    }
+    files.update({f"test_data/sample{i}.fq.gz": "" for i in range(60)})
+    _write(tmp_path, files)
+
+    index = RepoIndex.build(LocalRepoFS(tmp_path))
+
+    assert [f.path for f in index.files] == [
+        ".gitattributes",
+        ".gitignore",
+        "keep.log",
+        "src/main.c",
+    ]
+    assert index.pruned == {
+        "external": "vendored",
+        "htslib": "vendored",
+        "test_data": "data",
+    }
+    assert index.is_dir("test_data") and not index.exists("build")
+    assert not index.truncated
+
+
+def test_walker_stops_at_budget_keeping_shallow_files(tmp_path):
+    """测试超出文件数预算时停止遍历，较浅的文件优先保留"""
+    _write(
+        tmp_path,
+        {"a.py": "", "b.py": "", "pkg/deep/c.py": "", "pkg/d.py": ""},
+    )
+    registered = tmp_path / "tracked"
+    _write(registered, {".gitignore": "*.py\n", "forced.py": ""})
+    register_workspace(RepoWorkspace(registered, tracked_only=True))
+
+    index = RepoIndex.build(LocalRepoFS(tmp_path), max_files=3)
+
+    assert [f.path for f in index.files] == ["a.py", "b.py", "pkg/d.py"]
+    assert index.truncated
+    # 检出中已跟踪的文件不受.gitignore影响
+    assert get_repo_index(registered).is_file("forced.py")
+
+
+def test_parallel_walk_matches_serial_walk(tmp_path):
+    """测试并行遍历子树与串行遍历结果一致，并遵循相同的剪枝规则和预算"""
+    files = {".gitignore": "*.tmp\n", "README.md": "hi"}
+    for top in range(6):
+        files[f"pkg{top}/.gitignore"] = "cache/\n"
+        files[f"pkg{top}/cache/x.py"] = ""
+        files[f"pkg{top}/scratch.tmp"] = ""
+        for sub in range(3):
+            for i in range(4):
+                files[f"pkg{top}/sub{sub}/mod{i}.py"] = "x" * i
+    files.update({f"pkg2/reads/r{i}.fastq": "" for i in range(60)})
+    _write(tmp_path, files)
+
+    for budget in (None, 40):
+        serial = RepoIndex.build(LocalRepoFS(tmp_path), max_files=budget)
+        parallel = RepoIndex.build(LocalRepoFS(tmp_path), max_files=budget, workers=4)
+
+        assert parallel.files == serial.files
+        assert parallel.dirs == serial.dirs
+        assert parallel.pruned == serial.pruned == {"pkg2/reads": "data"}
+        assert parallel.truncated == serial.truncated == (budget is not None)
+    assert len(serial.files) == 40
+    assert not any(f.path.endswith(".tmp") or "/cache/" in f.path for f in serial.files)
+
+
+def test_tree_cache_rewalks_only_changed_subtrees(tmp_path, make_git_repo, monkeypatch):
+    """测试按树ID缓存的目录记录跨版本复用，只重新列出变化的目录"""
+    upstream = make_git_repo(
+        files={
+            ".gitattributes": "gen/** linguist-generated\n",
+            "README.md": "hi",
+            "gen/api.py": "",
+            "pkg0/sub/a.py": "a = 1\n",
+            "pkg1/sub/b.py": "b = 1\n",
+            "pkg1/c.py": "",
+        }
+    )
+    analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+    listed = []
+    original = GitObjectFS.list_dir
+
+    def counting_list_dir(self, rel_path=""):
+        listed.append(rel_path)
+        return original(self, rel_path)
+
+    monkeypatch.setattr(GitObjectFS, "list_dir", counting_list_dir)
+
+    first = get_repo_index(analyzer.open_revision(str(upstream)))
+    assert sorted(listed) == ["", "pkg0", "pkg0/sub", "pkg1", "pkg1/sub"]
+    assert "gen" in first.pruned and not first.exists("gen/api.py")
+
+    listed.clear()
+    second = get_repo_index(analyzer.open_revision(str(upstream)))
+    assert listed == []
+    assert (second.files, second.dirs, second.pruned) == (
+        first.files,
+        first.dirs,
+        first.pruned,
+    )
+
+    (upstream / "pkg1" / "sub" / "b.py").write_text("b = 2\n")
+    git(upstream, "commit", "-q", "-am", "bump")
+    listed.clear()
+    changed = get_repo_index(analyzer.open_revision(str(upstream)))
+    assert sorted(listed) == ["", "pkg1", "pkg1/sub"]
+    fresh = RepoIndex.build(analyzer.open_revision(str(upstream)))
+    assert (changed.files, changed.dirs, changed.pruned) == (
+        fresh.files,
+        fresh.dirs,
+        fresh.pruned,
+    )
+    assert changed.file("pkg1/sub/b.py").mode == 0o100644
@@ -0,0 +1,78 @@
+"""文本解码测试"""
+
+import codecs
+
+import pytest
+
+from src.repo_fs import LocalRepoFS
+from src.text_decoder import SNIFF_BYTES, detect_encoding, is_binary
+
+
+def test_detect_encoding_from_prefix():
+    """测试按开头字节区分二进制、UTF-8、带BOM的编码和latin-1"""
+    assert detect_encoding(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR") is None
+    assert is_binary(bytes(range(1, 8)) * 10)
+    assert not is_binary(b"\x1b[31mred\x1b[0m\n")
+    # 截断在多字节字符中间的开头仍视为UTF-8
+    assert detect_encoding("比对".encode("utf-8")[:-1]) == "utf-8"
+    assert detect_encoding(codecs.BOM_UTF8 + b"# title") == "utf-8-sig"
+    assert detect_encoding("# título".encode("utf-16")) == "utf-16"
+    assert detect_encoding("café".encode("latin-1"), complete=True) == "latin-1"
+
+
+def test_read_text_sniffs_once_and_skips_binary(tmp_path, monkeypatch):
+    """测试二进制文件只读取开头，编码判定按文件缓存"""
+    (tmp_path / "model.bin").write_bytes(b"\0" * (SNIFF_BYTES * 4))
+    (tmp_path / "README.md").write_text("# 工具\n")
+    # 开头为UTF-8，之后出现latin-1字节
+    (tmp_path / "notes.txt").write_bytes(b"a" * SNIFF_BYTES + "é".encode("latin-1"))
+    repo_fs = LocalRepoFS(tmp_path)
+    prefix_reads = []
+    original = LocalRepoFS.read_prefix
+
+    def counting_read_prefix(self, rel_path, size):
+        prefix_reads.append(rel_path)
+        return original(self, rel_path, size)
+
+    def no_full_read(self, rel_path):
+        raise AssertionError(f"完整读取了 {rel_path}")
+
+    monkeypatch.setattr(LocalRepoFS, "read_prefix", counting_read_prefix)
+    monkeypatch.setattr(LocalRepoFS, "read_bytes", no_full_read)
+
+    assert repo_fs.read_text("model.bin") is None
+    assert repo_fs.read_text("model.bin") is None
+    assert repo_fs.encoding("model.bin") is None
+    # 小文件的开头即完整内容，不需要再次读取
+    assert repo_fs.read_text("README.md") == "# 工具\n"
+    assert repo_fs.read_text("missing.md") is None
+    assert prefix_reads == ["model.bin", "README.md", "missing.md"]
+
+    monkeypatch.undo()
+    assert repo_fs.read_text("notes.txt").endswith("é")
+    assert repo_fs.encoding("notes.txt") == "latin-1"
+
+
+def test_read_text_with_limit_reads_only_needed_prefix(tmp_path, monkeypatch):
+    """测试按字符数限制读取时只读取所需的开头字节，且不截断多字节字符"""
+    (tmp_path / "README.md").write_text("比对工具" * 100000)
+    repo_fs = LocalRepoFS(tmp_path)
+    requested = []
+    original = LocalRepoFS.read_prefix
+
+    def recording_read_prefix(self, rel_path, size):
+        requested.append(size)
+        return original(self, rel_path, size)
+
+    monkeypatch.setattr(LocalRepoFS, "read_prefix", recording_read_prefix)
+    monkeypatch.setattr(
+        LocalRepoFS, "read_bytes", lambda self, rel_path: pytest.fail(rel_path)
+    )
+
+    assert repo_fs.read_text("README.md", limit=1001) == ("比对工具" * 251)[:1001]
+    # 判定编码时读取的开头已足够，无需再次读取
+    assert requested == [SNIFF_BYTES + 1]
+    assert repo_fs.read_text("README.md", limit=10) == "比对工具比对工具比对"
+    assert requested[1] == 44
+    assert len(repo_fs.read_text("README.md", limit=5000)) == 5000
+    assert requested[2] < 5000 * 4 + 8
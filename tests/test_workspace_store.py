@@ -0,0 +1,143 @@
+"""内容寻址工作区存储测试"""
+
+import subprocess
+import sys
+import threading
+import time
+
+from src.config import config_manager
+from src.github_analyzer import GitHubAnalyzer
+from src.repo_workspace import get_workspace
+from src.workspace_store import WorkspaceStore
+
+
+def _populate_counter(calls):
+    def populate(dest):
+        calls.append(dest)
+        time.sleep(0.05)
+        dest.mkdir(parents=True)
+        (dest / "README.md").write_text("hello")
+        return {"missing_paths": ["big.bin"]}
+
+    return populate
+
+
+def test_concurrent_acquire_populates_once(tmp_path):
+    store = WorkspaceStore(tmp_path / "ws")
+    calls, leases = [], []
+    populate = _populate_counter(calls)
+
+    threads = [
+        threading.Thread(
+            target=lambda: leases.append(
+                store.acquire("owner", "demo", "a" * 40, populate)
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({lease.path for lease in leases}) == 1
+    assert all(lease.metadata == {"missing_paths": ["big.bin"]} for lease in leases)
+
+
+def test_workspaces_are_keyed_by_owner_and_variant(tmp_path):
+    store = WorkspaceStore(tmp_path / "ws")
+    populate = _populate_counter([])
+    sha = "b" * 40
+
+    paths = {
+        store.acquire("alice", "demo", sha, populate).path,
+        store.acquire("bob", "demo", sha, populate).path,
+        store.acquire("alice", "demo", sha, populate, variant="sparse").path,
+    }
+
+    assert len(paths) == 3
+
+
+def test_release_reclaims_only_unreferenced(tmp_path):
+    store = WorkspaceStore(tmp_path / "ws", keep_unused=0)
+    populate = _populate_counter([])
+    first = store.acquire("owner", "demo", "c" * 40, populate)
+    second = store.acquire("owner", "demo", "c" * 40, populate)
+
+    store.release(first, background=False)
+    assert (first.path / "README.md").exists()
+
+    store.release(second, background=False)
+    assert not first.path.exists()
+    assert not store.trash.exists() or not any(store.trash.iterdir())
+
+
+def test_stale_lease_from_dead_process_is_ignored(tmp_path):
+    store = WorkspaceStore(tmp_path / "ws", keep_unused=0)
+    lease = store.acquire("owner", "demo", "d" * 40, _populate_counter([]))
+
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    lease.lease_file.rename(lease.lease_file.with_name(f"{dead.pid}-stale"))
+
+    assert store.reclaim() == [lease.path]
+
+
+def test_clone_reuses_workspace_for_same_commit(tmp_path, make_git_repo):
+    upstream = make_git_repo(files={"README.md": "hello"})
+    first = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+    second = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+
+    path_a = first.clone_repository(str(upstream))
+    path_b = second.clone_repository(str(upstream))
+
+    assert path_a == path_b
+    assert (path_a / "README.md").read_text() == "hello"
+
+    first.release_workspaces()
+    second.release_workspaces()
+    assert not any(path_a.with_name(path_a.name + ".leases").iterdir())
+
+
+def test_workspace_rebuilt_after_mirror_eviction(tmp_path, make_git_repo, monkeypatch):
+    """测试镜像被淘汰后，复用的worktree工作区重新检出，且共享工作区为只读"""
+    monkeypatch.setattr(config_manager.config, "mirror_cache_max_mb", 0)
+    repo_a = make_git_repo(name="a", files={"README.md": "a"})
+    repo_b = make_git_repo(name="b", files={"README.md": "b"})
+
+    for url in (repo_a, repo_b, repo_a):
+        analyzer = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+        path = analyzer.clone_repository(str(url))
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=path, capture_output=True, text=True
+        )
+        assert head.returncode == 0, head.stderr
+        assert get_workspace(path).read_only
+        analyzer.release_workspaces()
+
+
+def test_leased_workspace_keeps_its_mirror(tmp_path, make_git_repo, monkeypatch):
+    """测试仍有租约的worktree工作区所在镜像不会被淘汰"""
+    monkeypatch.setattr(config_manager.config, "mirror_cache_max_mb", 0)
+    repo_a = make_git_repo(name="a", files={"README.md": "a"})
+    repo_b = make_git_repo(name="b", files={"README.md": "b"})
+
+    holder = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+    path_a = holder.clone_repository(str(repo_a))
+    mirror_a = holder.mirror_cache.mirror_path(str(repo_a))
+
+    other = GitHubAnalyzer(tmp_dir=str(tmp_path / "work"))
+    other.clone_repository(str(repo_b))
+    other.release_workspaces()
+
+    assert mirror_a.exists()
+    head = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=path_a, capture_output=True, text=True
+    )
+    assert head.returncode == 0, head.stderr
+
+    holder.release_workspaces()
+    other.clone_repository(str(repo_b))
+    assert not mirror_a.exists()
+    other.release_workspaces()